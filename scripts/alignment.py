@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
+
+try:
+    from scripts.descriptive_analysis import wall_clock_nanoseconds
+    from scripts.sentiment_analysis import SCORE_COLUMNS
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    from descriptive_analysis import wall_clock_nanoseconds
+    from sentiment_analysis import SCORE_COLUMNS
+
+NS_PER_DAY = 86_400_000_000_000
+MARKET_CLOSE = '16:00'
+MARKET_TZ = 'America/New_York'
+
+
+def market_days(times: pd.Series, tz: str = MARKET_TZ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Day number (from 1970-01-01) and time of day in nanoseconds, in market local time.
+
+    Timezone-aware timestamps are converted to `tz`; naive ones are taken to be
+    market local time already.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(times):
+        raise ValueError("Timestamps must be in datetime format.")
+    if times.dt.tz is not None:
+        times = times.dt.tz_convert(tz)
+    nanoseconds = wall_clock_nanoseconds(times)
+    days, time_of_day = np.divmod(nanoseconds, NS_PER_DAY)
+    missing = nanoseconds == np.iinfo(np.int64).min
+    days[missing] = np.iinfo(np.int64).min
+    return days, time_of_day
+
+
+def calendar_days(dates: pd.Series) -> np.ndarray:
+    """
+    Day number (from 1970-01-01) of bar dates taken as calendar dates.
+
+    Bars are labelled by their session date, so timezone-aware dates (such as the
+    UTC midnights of `load_data`) keep their own date instead of being converted
+    to market time, which would move them to the previous day.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        raise ValueError("Dates must be in datetime format.")
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    days, _ = market_days(dates)
+    return days
+
+
+def session_positions(news_times: pd.Series, news_symbols: pd.Series, bar_dates: pd.Series,
+                      bar_symbols: pd.Series, cutoff: str = MARKET_CLOSE, tz: str = MARKET_TZ) -> np.ndarray:
+    """
+    Match every headline to the first trading session of its symbol that can react to it.
+
+    A headline published before the cutoff belongs to that day's session and one
+    published at or after it to the next day's; either way it is carried forward to
+    the next day with a bar for the symbol (so weekend and holiday news lands on the
+    following session). All symbols are joined at once with a single searchsorted
+    over (symbol, day) keys.
+
+    Parameters:
+    - news_times (pd.Series): Publication timestamps.
+    - news_symbols (pd.Series): Symbol of every headline.
+    - bar_dates (pd.Series): Session date of every price bar; timezone-aware dates
+      are read as calendar dates, not converted to `tz`.
+    - bar_symbols (pd.Series): Symbol of every price bar.
+    - cutoff (str): Market close as 'HH:MM' in market local time.
+    - tz (str): Market timezone, used for timezone-aware timestamps.
+
+    Returns:
+    - np.ndarray: Position of the matched bar for every headline, -1 when the symbol
+      has no session on or after the headline (or the timestamp is missing).
+    """
+    days, time_of_day = market_days(news_times, tz)
+    timed = days != np.iinfo(np.int64).min
+    days = np.where(timed, days + (time_of_day >= pd.Timedelta(f'{cutoff}:00').value), days)
+    bar_days = calendar_days(bar_dates)
+
+    codes, symbols = pd.factorize(pd.concat([pd.Series(bar_symbols, dtype=object),
+                                             pd.Series(news_symbols, dtype=object)], ignore_index=True))
+    bar_codes, news_codes = codes[:len(bar_days)], codes[len(bar_days):]
+    valid_bars = (bar_days != np.iinfo(np.int64).min) & (bar_codes >= 0)
+    valid_news = timed & (news_codes >= 0)
+    if not valid_bars.any():
+        return np.full(len(days), -1, dtype=np.int64)
+
+    # Symbols take disjoint ranges of one sorted int64 key, so one search covers all of them
+    first_day = min(bar_days[valid_bars].min(), days[valid_news].min() if valid_news.any() else 0)
+    span = max(bar_days[valid_bars].max(), days[valid_news].max() if valid_news.any() else 0) - first_day + 2
+    bar_keys = np.where(valid_bars, bar_codes * span + (bar_days - first_day), np.iinfo(np.int64).max)
+    order = np.argsort(bar_keys, kind='stable')
+    sorted_keys = bar_keys[order]
+    news_keys = news_codes * span + (days - first_day)
+
+    found = np.searchsorted(sorted_keys, news_keys[valid_news], side='left')
+    found = np.minimum(found, len(order) - 1)
+    same_symbol = (sorted_keys[found] != np.iinfo(np.int64).max) & (sorted_keys[found] // span == news_codes[valid_news])
+    positions = np.full(len(days), -1, dtype=np.int64)
+    positions[np.flatnonzero(valid_news)[same_symbol]] = order[found[same_symbol]]
+    return positions
+
+
+def price_columns(prices: pd.DataFrame, date_col: str, symbol_col: str) -> Tuple[pd.Series, pd.Series]:
+    """
+    Bar dates and symbols of a price frame, with the date either a column or the index.
+    """
+    dates = prices[date_col] if date_col in prices.columns else prices.index.to_series()
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates)
+    return dates.reset_index(drop=True), prices[symbol_col].reset_index(drop=True)
+
+
+def align_news(news: pd.DataFrame, prices: pd.DataFrame, cutoff: str = MARKET_CLOSE, tz: str = MARKET_TZ,
+               time_col: str = 'date', symbol_col: str = 'stock', date_col: str = 'Date') -> pd.DataFrame:
+    """
+    Attach every headline to the trading session it can move, with that session's bar.
+
+    Parameters:
+    - news (pd.DataFrame): Headlines with a publication timestamp and a symbol column.
+    - prices (pd.DataFrame): Daily bars with a date (column or index) and a symbol column.
+    - cutoff (str): Market close as 'HH:MM' in market local time.
+    - tz (str): Market timezone.
+    - time_col (str): Publication timestamp column of `news`.
+    - symbol_col (str): Symbol column of both frames.
+    - date_col (str): Date column (or index name) of `prices`.
+
+    Returns:
+    - pd.DataFrame: The matched headlines with the session `date_col` and the bar's
+      other columns. Headlines after the last bar of their symbol are dropped.
+    """
+    dates, symbols = price_columns(prices, date_col, symbol_col)
+    positions = session_positions(news[time_col], news[symbol_col], dates, symbols, cutoff, tz)
+    matched = positions >= 0
+    bars = prices.reset_index(drop=date_col in prices.columns).iloc[positions[matched]]
+    bars = bars.drop(columns=[column for column in bars.columns if column in news.columns and column != date_col])
+    aligned = news.iloc[np.flatnonzero(matched)].reset_index(drop=True)
+    for column in bars.columns:
+        aligned[column] = bars[column].to_numpy()
+    aligned[date_col] = dates.to_numpy()[positions[matched]]
+    return aligned
+
+
+def daily_sentiment(news: pd.DataFrame, prices: pd.DataFrame, columns: List[str] = SCORE_COLUMNS,
+                    cutoff: str = MARKET_CLOSE, tz: str = MARKET_TZ, time_col: str = 'date',
+                    symbol_col: str = 'stock', date_col: str = 'Date') -> pd.DataFrame:
+    """
+    Average sentiment per symbol and trading session.
+
+    Headlines are matched to sessions with `session_positions` and averaged in one
+    grouped pass (weighted bincounts over the matched bar positions).
+
+    Parameters:
+    - news (pd.DataFrame): Scored headlines with timestamp, symbol and score columns.
+    - prices (pd.DataFrame): Daily bars with a date (column or index) and a symbol column.
+    - columns (List[str]): Score columns to average.
+    - cutoff (str): Market close as 'HH:MM' in market local time.
+    - tz (str): Market timezone.
+    - time_col (str): Publication timestamp column of `news`.
+    - symbol_col (str): Symbol column of both frames.
+    - date_col (str): Date column (or index name) of `prices`.
+
+    Returns:
+    - pd.DataFrame: `date_col`, `symbol_col`, the mean of every score column and the
+      number of 'articles', one row per session with news, ordered by symbol and date.
+    """
+    dates, symbols = price_columns(prices, date_col, symbol_col)
+    positions = session_positions(news[time_col], news[symbol_col], dates, symbols, cutoff, tz)
+    matched = positions >= 0
+    counts = np.bincount(positions[matched], minlength=len(dates))
+    sessions = np.flatnonzero(counts)
+    result = pd.DataFrame({date_col: dates.to_numpy()[sessions], symbol_col: symbols.to_numpy()[sessions]})
+    for column in columns:
+        sums = np.bincount(positions[matched], weights=news[column].to_numpy(dtype=np.float64)[matched],
+                           minlength=len(dates))
+        result[column] = sums[sessions] / counts[sessions]
+    result['articles'] = counts[sessions]
+    return result.sort_values([symbol_col, date_col], kind='stable').reset_index(drop=True)
@@ -0,0 +1,314 @@
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    from scripts.alignment import price_columns
+    from scripts.correlation import panel
+    from scripts.indicators import ema_step, rsi_from_averages, wilder_step, window_sum
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    from alignment import price_columns
+    from correlation import panel
+    from indicators import ema_step, rsi_from_averages, wilder_step, window_sum
+
+TRADING_DAYS = 252
+METRICS = ['total_return', 'annual_return', 'max_drawdown', 'turnover', 'exposure']
+# Positions x symbols x dates evaluated at once; bounds the memory of a sweep.
+CHUNK_ELEMENTS = 1 << 24
+
+
+class PricePanel:
+    """
+    Closing prices and close-to-close returns of many symbols on one date grid.
+    """
+
+    def __init__(self, data: pd.DataFrame, date_col: str = 'Date', symbol_col: str = 'stock',
+                 close_col: str = 'Close'):
+        dates, symbols = price_columns(data, date_col, symbol_col)
+        self.dates = pd.DatetimeIndex(dates.dropna().unique()).sort_values()
+        self.symbols = pd.Index(pd.unique(symbols.dropna()))
+        self.close = panel(data, close_col, self.symbols, self.dates, date_col, symbol_col)
+        self.returns = np.zeros_like(self.close)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.returns[:, 1:] = self.close[:, 1:] / self.close[:, :-1] - 1
+        self.returns[~np.isfinite(self.returns)] = 0.0
+
+    def align(self, data: pd.DataFrame, value_col: str, date_col: str = 'Date',
+              symbol_col: str = 'stock') -> np.ndarray:
+        """Another long-format column on this panel's grid (NaN where missing)."""
+        return panel(data, value_col, self.symbols, self.dates, date_col, symbol_col)
+
+
+def left_packed(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Valid prices of every symbol moved to the front of its column, time-major.
+
+    These are exactly the rows `compute_indicators` sees for each symbol (gaps in
+    the panel are skipped), so row t of the result is each symbol's t-th bar.
+
+    Returns:
+    - Tuple[np.ndarray, np.ndarray, np.ndarray]: Packed prices of shape (bars, symbols),
+      NaN after each symbol's last bar; the number of bars per symbol; the bar number
+      of every valid panel entry.
+    """
+    valid = ~np.isnan(close)
+    lengths = valid.sum(axis=1)
+    bar = np.cumsum(valid, axis=1) - 1
+    packed = np.full((int(lengths.max(initial=0)), len(close)), np.nan)
+    symbols, _ = np.nonzero(valid)
+    packed[bar[valid], symbols] = close[valid]
+    return packed, lengths, bar
+
+
+def unpack(values: np.ndarray, close: np.ndarray, bar: np.ndarray, copies: int) -> np.ndarray:
+    """
+    Time-major packed values of `copies` parameter sets (copy-major columns) back on
+    the panel grid: shape (copies, symbols, time), NaN where there is no bar.
+    """
+    valid = ~np.isnan(close)
+    symbols, _ = np.nonzero(valid)
+    grid = np.full((copies,) + close.shape, np.nan)
+    grid[:, valid] = values.reshape(len(values), copies, len(close))[bar[valid], :, symbols].T
+    return grid
+
+
+def smooth_columns(values: np.ndarray, lengths: np.ndarray, period: np.ndarray, offset: np.ndarray,
+                   wilder: bool = False) -> np.ndarray:
+    """
+    `indicators.smoothed` for many columns at once, each with its own period and offset.
+
+    Column c is seeded at row `offset + period - 1` with the mean of the `period`
+    rows before it (`window_sum`, same summation order) and advanced with the same
+    `ema_step`/`wilder_step`, so every value equals the per-symbol kernel's. Each
+    time step updates one contiguous row across all columns.
+
+    Parameters:
+    - values (np.ndarray): Time-major values of shape (bars, columns).
+    - lengths (np.ndarray): Number of bars of every column.
+    - period (np.ndarray): Smoothing period of every column.
+    - offset (np.ndarray): First row of every column's seed window.
+    - wilder (bool): Wilder's smoothing (RSI) instead of the EMA.
+
+    Returns:
+    - np.ndarray: Smoothed values, NaN before each column's seed.
+    """
+    rows = len(values)
+    seed = offset + period - 1
+    out = np.full(values.shape, np.nan)
+    seeded = np.flatnonzero(seed < lengths)
+    if not len(seeded):
+        return out
+    # Only the rows up to the last seed are needed to seed, laid out column by column
+    head = int(seed[seeded].max()) + 1
+    by_column = np.ascontiguousarray(values[:head].T).ravel()
+    ends = seeded * head + seed[seeded]
+    out[seed[seeded], seeded] = window_sum(by_column, ends, period[seeded]) / period[seeded]
+    step = wilder_step(period) if wilder else ema_step(period)
+    every = slice(None)
+    for t in range(int(seed[seeded].min()) + 1, rows):
+        out[t] = np.where(t > seed, step(out[t - 1], values[t], every), out[t])
+    return out
+
+
+def rsi_grid(close: np.ndarray, periods: Iterable[int]) -> np.ndarray:
+    """
+    RSI of every symbol for several periods, equal to `compute_indicators`' 'rsi' kernel.
+
+    Average gains and losses of every period are smoothed side by side in one pass over time.
+
+    Returns:
+    - np.ndarray: Shape (len(periods), symbols, time).
+    """
+    periods = np.asarray(list(periods), dtype=np.int64)
+    packed, lengths, bar = left_packed(close)
+    diff = np.full(packed.shape, np.nan)
+    diff[1:] = packed[1:] - packed[:-1]
+    gain = np.tile(np.where(diff > 0, diff, 0.0), (1, 2 * len(periods)))
+    gain[:, len(periods) * len(close):] = np.tile(np.where(diff < 0, -diff, 0.0), (1, len(periods)))
+    columns = np.tile(np.repeat(periods, len(close)), 2)
+    averages = smooth_columns(gain, np.tile(lengths, 2 * len(periods)), columns, np.ones_like(columns), wilder=True)
+    avg_gain, avg_loss = np.split(averages, 2, axis=1)
+    return unpack(rsi_from_averages(avg_gain, avg_loss), close, bar, len(periods))
+
+
+def macd_grid(close: np.ndarray, combos: List[Tuple[int, int, int]]) -> np.ndarray:
+    """
+    MACD histogram (MACD line minus signal line) for several (fast, slow, signal)
+    periods, equal to `compute_indicators`' 'macd' kernel.
+
+    Every distinct EMA is smoothed once and shared between the combinations that
+    use it: slow EMAs by period, fast EMAs by (fast, slow) since TA-Lib seeds the
+    fast EMA on the slow one's first row. All EMAs run in one pass over time and
+    all signal lines in a second one.
+
+    Returns:
+    - np.ndarray: Shape (len(combos), symbols, time).
+    """
+    combos = np.asarray(combos, dtype=np.int64).reshape(-1, 3)
+    fast, slow, signal = combos.T
+    if np.any(fast >= slow):
+        raise ValueError("The fast MACD period must be shorter than the slow period.")
+    packed, lengths, bar = left_packed(close)
+    symbols = len(close)
+    # Distinct (period, offset) EMAs: fast ones are seeded on the slow EMA's first row
+    emas, index = np.unique(np.r_[np.c_[fast, slow - fast], np.c_[slow, np.zeros_like(slow)]],
+                            axis=0, return_inverse=True)
+    index = index.reshape(2, -1)
+    smoothed = smooth_columns(np.tile(packed, (1, len(emas))), np.tile(lengths, len(emas)),
+                              np.repeat(emas[:, 0], symbols), np.repeat(emas[:, 1], symbols))
+    smoothed = smoothed.reshape(len(packed), len(emas), symbols)
+    line = (smoothed[:, index[0]] - smoothed[:, index[1]]).reshape(len(packed), -1)
+    signal_line = smooth_columns(line, np.tile(lengths, len(combos)), np.repeat(signal, symbols),
+                                 np.repeat(slow - 1, symbols))
+    macd = np.where(np.arange(len(packed))[:, None] >= np.repeat(slow + signal - 2, symbols), line, np.nan)
+    return unpack(macd - signal_line, close, bar, len(combos))
+
+
+def band_positions(enter: np.ndarray, exit: np.ndarray) -> np.ndarray:
+    """
+    Long/flat positions of a two-threshold rule: go long on `enter`, flat on `exit`,
+    otherwise keep the previous position (flat before the first signal).
+    """
+    events = np.where(enter, 1, np.where(exit, 0, -1)).astype(np.int8)
+    steps = np.arange(events.shape[-1])
+    latest = np.maximum.accumulate(np.where(events >= 0, steps, 0), axis=-1)
+    positions = np.take_along_axis(events, latest, axis=-1)
+    return (positions > 0).astype(np.float64)
+
+
+def performance(positions: np.ndarray, returns: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Metrics of long/flat positions, traded at the close after each signal.
+
+    Parameters:
+    - positions (np.ndarray): Positions of shape (rules, symbols, time), 1 long and 0 flat.
+    - returns (np.ndarray): Close-to-close returns of shape (symbols, time).
+
+    Returns:
+    - Dict[str, np.ndarray]: Every metric in METRICS with shape (rules, symbols):
+      total and annualized return, maximum drawdown (negative), turnover (position
+      changes per year) and exposure (share of days invested).
+    """
+    held = np.zeros_like(positions)
+    held[..., 1:] = positions[..., :-1]
+    log_equity = np.cumsum(np.log1p(held * returns[None]), axis=-1)
+    drawdown = np.expm1(log_equity - np.maximum.accumulate(log_equity, axis=-1)).min(axis=-1)
+    total = np.expm1(log_equity[..., -1])
+    years = max(positions.shape[-1] / TRADING_DAYS, 1e-9)
+    changes = np.abs(np.diff(held, axis=-1)).sum(axis=-1)
+    return {
+        'total_return': total,
+        'annual_return': np.expm1(log_equity[..., -1] / years),
+        'max_drawdown': np.minimum(drawdown, 0.0),
+        'turnover': changes / years,
+        'exposure': held.mean(axis=-1),
+    }
+
+
+def results_frame(params: pd.DataFrame, symbols: pd.Index, metrics: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    One row per (parameter combination, symbol) with the parameters and metrics.
+    """
+    rows = len(params) * len(symbols)
+    result = params.loc[params.index.repeat(len(symbols))].reset_index(drop=True)
+    result['stock'] = np.tile(np.asarray(symbols, dtype=object), len(params))
+    for name in METRICS:
+        result[name] = metrics[name].reshape(rows)
+    return result
+
+
+def sweep(params: pd.DataFrame, returns: np.ndarray, positions_for) -> Dict[str, np.ndarray]:
+    """
+    Evaluate rules in chunks of parameter rows, so memory stays bounded.
+    """
+    chunk = max(1, CHUNK_ELEMENTS // max(returns.size, 1))
+    parts = [performance(positions_for(params.iloc[start:start + chunk]), returns)
+             for start in range(0, len(params), chunk)]
+    return {name: np.concatenate([part[name] for part in parts]) for name in METRICS}
+
+
+def grid(**values) -> pd.DataFrame:
+    """
+    Every combination of the given parameter values, one column per parameter.
+    """
+    names = list(values)
+    return pd.DataFrame(list(itertools.product(*(list(values[name]) for name in names))), columns=names)
+
+
+def backtest_rsi(prices: PricePanel, periods: Iterable[int] = (14,), lowers: Iterable[float] = (30,),
+                 uppers: Iterable[float] = (70,)) -> pd.DataFrame:
+    """
+    Backtest RSI mean reversion: buy when RSI falls below `lower`, sell when it rises above `upper`.
+
+    Parameters:
+    - prices (PricePanel): Prices of the symbols to test.
+    - periods (Iterable[int]): RSI periods.
+    - lowers (Iterable[float]): Oversold thresholds.
+    - uppers (Iterable[float]): Overbought thresholds.
+
+    Returns:
+    - pd.DataFrame: 'period', 'lower', 'upper', 'stock' and the METRICS columns for
+      every combination with lower < upper and every symbol.
+    """
+    params = grid(period=periods, lower=lowers, upper=uppers)
+    params = params[params['lower'] < params['upper']].reset_index(drop=True)
+
+    def positions_for(rows):
+        # Each chunk computes the RSI of its distinct periods once, in one pass
+        distinct, index = np.unique(rows['period'].to_numpy(), return_inverse=True)
+        values = rsi_grid(prices.close, distinct)[index]
+        lower = rows['lower'].to_numpy(dtype=np.float64)[:, None, None]
+        upper = rows['upper'].to_numpy(dtype=np.float64)[:, None, None]
+        return band_positions(values < lower, values > upper)
+
+    return results_frame(params, prices.symbols, sweep(params, prices.returns, positions_for))
+
+
+def backtest_macd(prices: PricePanel, fasts: Iterable[int] = (12,), slows: Iterable[int] = (26,),
+                  signals: Iterable[int] = (9,)) -> pd.DataFrame:
+    """
+    Backtest MACD crossovers: long while the MACD line is above its signal line.
+
+    Parameters:
+    - prices (PricePanel): Prices of the symbols to test.
+    - fasts (Iterable[int]): Fast EMA periods.
+    - slows (Iterable[int]): Slow EMA periods.
+    - signals (Iterable[int]): Signal EMA periods.
+
+    Returns:
+    - pd.DataFrame: 'fast', 'slow', 'signal', 'stock' and the METRICS columns for
+      every combination with fast < slow and every symbol.
+    """
+    params = grid(fast=fasts, slow=slows, signal=signals)
+    params = params[params['fast'] < params['slow']].reset_index(drop=True)
+
+    def positions_for(rows):
+        return (macd_grid(prices.close, list(rows.itertuples(index=False, name=None))) > 0).astype(np.float64)
+
+    return results_frame(params, prices.symbols, sweep(params, prices.returns, positions_for))
+
+
+def backtest_sentiment(prices: PricePanel, sentiment: np.ndarray,
+                       thresholds: Iterable[float] = (0.05,)) -> pd.DataFrame:
+    """
+    Backtest news sentiment: buy after a 'Positive' day (compound >= threshold) and
+    sell after a 'Negative' one (compound <= -threshold), as in `categorize_sentiment`.
+    Days without news keep the previous position.
+
+    Parameters:
+    - prices (PricePanel): Prices of the symbols to test.
+    - sentiment (np.ndarray): Daily compound sentiment on the panel's grid, e.g.
+      `prices.align(alignment.daily_sentiment(news, data), 'compound')`.
+    - thresholds (Iterable[float]): Sentiment thresholds.
+
+    Returns:
+    - pd.DataFrame: 'threshold', 'stock' and the METRICS columns.
+    """
+    params = grid(threshold=thresholds)
+
+    def positions_for(rows):
+        threshold = rows['threshold'].to_numpy(dtype=np.float64)[:, None, None]
+        return band_positions(sentiment[None] >= threshold, sentiment[None] <= -threshold)
+
+    return results_frame(params, prices.symbols, sweep(params, prices.returns, positions_for))
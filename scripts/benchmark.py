@@ -0,0 +1,368 @@
+import os
+import sys
+import json
+import time
+import zipfile
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List
+
+try:
+    from scripts import data_processing, descriptive_analysis, publication_analysis, stock_analysis
+    from scripts.backtest import PricePanel, macd_grid, rsi_grid
+    from scripts.indicators import compute_indicators
+    from scripts.sentiment_analysis import SentimentAnalyzer
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    import data_processing, descriptive_analysis, publication_analysis, stock_analysis
+    from backtest import PricePanel, macd_grid, rsi_grid
+    from indicators import compute_indicators
+    from sentiment_analysis import SentimentAnalyzer
+
+NEWS_FILENAME = 'raw_analyst_ratings.csv'
+SIZES = {'10k': 10_000, '1M': 1_000_000, '10M': 10_000_000}
+# Rows per symbol in the synthetic price data (about 40 years of trading days)
+ROWS_PER_SYMBOL = 10_000
+# Runs faster than this are noise; only slowdowns beyond it count as regressions.
+MIN_REGRESSION_SECONDS = 0.005
+
+WORDS = np.array(['stocks', 'shares', 'earnings', 'beat', 'miss', 'rally', 'slump', 'guidance', 'raises',
+                  'cuts', 'upgrade', 'downgrade', 'analyst', 'price', 'target', 'quarter', 'revenue',
+                  'growth', 'record', 'loss', 'profit', 'dividend', 'buyback', 'merger', 'deal', 'lawsuit',
+                  'strong', 'weak', 'surge', 'plunge', 'outlook', 'market', 'investors', 'sales', 'new',
+                  'high', 'low', 'trading', 'session', 'report'])
+# Parameter grids of the backtest benchmarks
+RSI_PERIODS = list(range(6, 30, 2))
+MACD_COMBOS = [(fast, slow, signal) for fast in (8, 12) for slow in (21, 26, 30) for signal in (5, 9)]
+
+
+def synthetic_news(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    News data with the schema of the analyst-ratings CSV: headline, url, publisher, date, stock.
+
+    Headlines and publishers are drawn from fixed pools (with repeats, as in the
+    real data); dates are strings with a UTC offset, as published.
+    """
+    rng = np.random.default_rng(seed)
+    pool = np.array([' '.join(words) for words in rng.choice(WORDS, (min(rows, 50_000), 8))], dtype=object)
+    publishers = np.array([f'analyst{i}@firm{i % 40}.com' if i % 4 == 0 else f'Publisher {i}'
+                           for i in range(1000)], dtype=object)
+    symbols = np.array([f'S{i:04d}' for i in range(max(1, rows // 1000))], dtype=object)
+    seconds = rng.integers(pd.Timestamp('2010-01-01').value // 10**9, pd.Timestamp('2020-06-01').value // 10**9, rows)
+    dates = np.char.add(np.char.replace(seconds.astype('datetime64[s]').astype(str), 'T', ' '), '-04:00')
+    headlines = pool[rng.integers(0, len(pool), rows)]
+    return pd.DataFrame({
+        'headline': headlines,
+        'url': 'https://www.example.com/news/' + pd.Series(np.arange(rows)).astype(str),
+        'publisher': publishers[rng.integers(0, len(publishers), rows)],
+        'date': dates,
+        'stock': symbols[rng.integers(0, len(symbols), rows)],
+    })
+
+
+def synthetic_ohlcv(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Daily bars with the schema of data/raw/yfinance_data plus a 'stock' column,
+    split into symbols of at most ROWS_PER_SYMBOL rows.
+    """
+    rng = np.random.default_rng(seed)
+    per_symbol = min(rows, ROWS_PER_SYMBOL)
+    symbols = -(-rows // per_symbol)
+    dates = pd.bdate_range('1980-12-12', periods=per_symbol)
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, (symbols, per_symbol)), axis=1)).ravel()[:rows]
+    spread = np.abs(rng.normal(0, 0.01, rows)) * close
+    return pd.DataFrame({
+        'Date': np.tile(dates, symbols)[:rows],
+        'Open': close + rng.normal(0, 0.5, rows) * spread,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Adj Close': close * 0.98,
+        'Volume': rng.integers(1_000_000, 500_000_000, rows),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+        'stock': np.repeat([f'S{i:04d}' for i in range(symbols)], per_symbol)[:rows],
+    })
+
+
+class Datasets:
+    """
+    Synthetic inputs of one size, built lazily and written to a temporary directory.
+    """
+
+    def __init__(self, rows: int, directory: str, seed: int = 0):
+        self.rows = rows
+        self.directory = directory
+        self.seed = seed
+        self._cache = {}
+
+    def _get(self, name: str, build: Callable[[], object]) -> object:
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    def raw_news(self) -> pd.DataFrame:
+        return self._get('raw_news', lambda: synthetic_news(self.rows, self.seed))
+
+    def news(self) -> pd.DataFrame:
+        """News with parsed dates, as returned by `data_processing.load_data`."""
+        return self._get('news', lambda: data_processing.standardize_dates(self.raw_news().copy()))
+
+    def news_zip(self) -> str:
+        def build():
+            path = os.path.join(self.directory, f'news_{self.rows}.zip')
+            with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr(NEWS_FILENAME, self.raw_news().to_csv())
+            return path
+        return self._get('news_zip', build)
+
+    def prices(self) -> pd.DataFrame:
+        """Bars with indicators, in the stock_data.csv schema."""
+        return self._get('prices', lambda: compute_indicators(synthetic_ohlcv(self.rows, self.seed)).set_index('Date'))
+
+    def prices_csv(self) -> str:
+        def build():
+            path = os.path.join(self.directory, f'stock_data_{self.rows}.csv')
+            self.prices().to_csv(path)
+            return path
+        return self._get('prices_csv', build)
+
+    def price_panel(self) -> PricePanel:
+        """The prices as a backtest panel (symbols x dates)."""
+        return self._get('price_panel', lambda: PricePanel(self.prices()))
+
+    def symbol_prices(self) -> pd.DataFrame:
+        """The first symbol's bars (the longest history a chart draws)."""
+        prices = self.prices()
+        return prices[prices['stock'] == prices['stock'].iloc[0]]
+
+
+def load_news(datasets: Datasets):
+    path = datasets.news_zip()
+    cache_path = f'{path}.{NEWS_FILENAME}.dates.npz'
+    if os.path.exists(cache_path):
+        os.remove(cache_path)  # time a cold load
+    return data_processing.load_data(path, NEWS_FILENAME)
+
+
+def rsi_per_period(datasets: Datasets):
+    """One `compute_indicators` run per RSI period, the reference for `rsi_grid`."""
+    prices = datasets.prices()
+    for period in RSI_PERIODS:
+        compute_indicators(prices, [{'kind': 'rsi', 'source': 'Close', 'period': period, 'outputs': ['RSI']}])
+
+
+def macd_per_combo(datasets: Datasets):
+    """One `compute_indicators` run per MACD combination, the reference for `macd_grid`."""
+    prices = datasets.prices()
+    for fast, slow, signal in MACD_COMBOS:
+        compute_indicators(prices, [{'kind': 'macd', 'source': 'Close', 'fast': fast, 'slow': slow,
+                                     'signal': signal, 'outputs': ['MACD', 'MACD_Signal', 'MACD_Hist']}])
+
+
+def plot(function: Callable) -> Callable[[Datasets], bytes]:
+    def run(datasets: Datasets) -> bytes:
+        data = datasets.symbol_prices()
+        return stock_analysis.render_png(function(data['stock'].iloc[0], data))
+    return run
+
+
+# Benchmark name -> function timed on the prepared datasets
+BENCHMARKS: Dict[str, Callable[[Datasets], object]] = {
+    'load_data': load_news,
+    'load_stock_data': lambda d: stock_analysis.load_data(d.prices_csv()),
+    'headline_length_stats': lambda d: descriptive_analysis.headline_length_stats(d.news()),
+    'articles_per_publisher': lambda d: descriptive_analysis.articles_per_publisher(d.news()),
+    'articles_by_day_of_week': lambda d: descriptive_analysis.articles_by_day_of_week(d.news()),
+    'articles_by_time': lambda d: descriptive_analysis.articles_by_time(d.news()),
+    'identify_unique_domains': lambda d: descriptive_analysis.identify_unique_domains(d.news()),
+    'descriptive_report': lambda d: descriptive_analysis.descriptive_report(d.news()),
+    'analyze_sentiment': lambda d: SentimentAnalyzer.analyze_sentiment(d.news()['headline']),
+    'analyze_sentiment_table': lambda d: SentimentAnalyzer.analyze_sentiment(d.news()['headline'], backend='table'),
+    'get_common_keywords': lambda d: SentimentAnalyzer.get_common_keywords(d.news()['headline']),
+    'analyze_annual_trends': lambda d: publication_analysis.analyze_annual_trends(d.news()),
+    'analyze_quarterly_trends': lambda d: publication_analysis.analyze_quarterly_trends(d.news()),
+    'publication_trends': lambda d: publication_analysis.publication_trends([d.news()]),
+    'plot_stock_data': plot(stock_analysis.plot_stock_data),
+    'plot_rsi': plot(stock_analysis.plot_rsi),
+    'plot_macd': plot(stock_analysis.plot_macd),
+    'rsi_grid': lambda d: rsi_grid(d.price_panel().close, RSI_PERIODS),
+    'rsi_per_period': rsi_per_period,
+    'macd_grid': lambda d: macd_grid(d.price_panel().close, MACD_COMBOS),
+    'macd_per_combo': macd_per_combo,
+}
+
+# Benchmarks that must beat another by a factor: name -> (reference, minimum speedup).
+# Checked by `main` whenever both ran, instead of timing assertions in the unit tests.
+SPEEDUPS = {
+    'analyze_sentiment_table': ('analyze_sentiment', 10.0),
+    'rsi_grid': ('rsi_per_period', 10.0),
+    'macd_grid': ('macd_per_combo', 10.0),
+}
+
+# Inputs each benchmark needs, prepared before timing so only the function is measured
+INPUTS = {
+    'load_data': ['news_zip'],
+    'load_stock_data': ['prices_csv'],
+    'plot_stock_data': ['prices'],
+    'plot_rsi': ['prices'],
+    'plot_macd': ['prices'],
+    'rsi_grid': ['price_panel'],
+    'rsi_per_period': ['prices'],
+    'macd_grid': ['price_panel'],
+    'macd_per_combo': ['prices'],
+}
+
+
+def measure(function: Callable[[], object], repeat: int = 1, memory: bool = True) -> Dict[str, float]:
+    """
+    Best wall time over `repeat` runs and, optionally, peak traced memory of one more run.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    result = {'seconds': min(timings)}
+    if memory:
+        tracemalloc.start()
+        try:
+            function()
+            result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(sizes: List[str], names: List[str] = None, repeat: int = 1, memory: bool = True,
+                   log: Callable[[str], None] = None) -> Dict:
+    """
+    Run benchmarks on synthetic data of each size.
+
+    Parameters:
+    - sizes (List[str]): Keys of SIZES, or plain row counts.
+    - names (List[str]): Benchmarks to run, defaults to all of BENCHMARKS.
+    - repeat (int): Timed runs per benchmark (the best is kept).
+    - memory (bool): Also measure peak memory (one extra, slower run).
+    - log (Callable): Called with a line per finished benchmark.
+
+    Returns:
+    - Dict: 'meta' (environment) and 'results' keyed by 'name[size]', each with
+      'rows', 'seconds' and 'peak_mb'.
+    """
+    names = names or list(BENCHMARKS)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            rows = SIZES.get(size) or int(size)
+            datasets = Datasets(rows, directory)
+            for name in names:
+                for prepare in INPUTS.get(name, ['news']):
+                    getattr(datasets, prepare)()
+                key = f'{name}[{size}]'
+                results[key] = {'rows': rows, **measure(lambda: BENCHMARKS[name](datasets), repeat, memory)}
+                if log:
+                    log(format_result(key, results[key]))
+    return {'meta': environment(), 'results': results}
+
+
+def environment() -> Dict[str, str]:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def format_result(key: str, result: Dict[str, float]) -> str:
+    memory = f"{result['peak_mb']:10.1f} MB" if 'peak_mb' in result else ''
+    return f"{key:<40} {result['seconds']:10.4f} s {memory}"
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.2) -> List[Dict]:
+    """
+    Benchmarks that got slower or used more memory than the baseline by more than `tolerance`.
+
+    Returns:
+    - List[Dict]: One entry per regression with the benchmark, metric, baseline
+      and current values and their ratio.
+    """
+    regressions = []
+    for key, result in current['results'].items():
+        before = baseline['results'].get(key)
+        if before is None:
+            continue
+        for metric, floor in (('seconds', MIN_REGRESSION_SECONDS), ('peak_mb', 0.0)):
+            if metric not in result or metric not in before:
+                continue
+            if result[metric] > before[metric] * (1 + tolerance) and result[metric] - before[metric] > floor:
+                regressions.append({'benchmark': key, 'metric': metric, 'baseline': before[metric],
+                                    'current': result[metric], 'ratio': result[metric] / max(before[metric], 1e-12)})
+    return regressions
+
+
+def check_speedups(results: Dict, speedups: Dict = SPEEDUPS) -> List[Dict]:
+    """
+    Benchmarks that are not faster than their reference by the factor in `speedups`.
+
+    Returns:
+    - List[Dict]: One entry per shortfall with the benchmark, its reference, the
+      required and the measured speedup; pairs that did not both run are skipped.
+    """
+    shortfalls = []
+    for key, result in results['results'].items():
+        name, _, size = key.partition('[')
+        if name not in speedups:
+            continue
+        reference, required = speedups[name]
+        before = results['results'].get(f'{reference}[{size}')
+        if before is None:
+            continue
+        speedup = before['seconds'] / max(result['seconds'], 1e-12)
+        if speedup < required:
+            shortfalls.append({'benchmark': key, 'reference': f'{reference}[{size}', 'required': required,
+                               'speedup': speedup})
+    return shortfalls
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Command line: run the benchmarks, save the results as JSON, check SPEEDUPS and
+    optionally compare them against a baseline file (exit code 1 on regressions or
+    missed speedups).
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the analysis hot paths on synthetic data.')
+    parser.add_argument('--sizes', nargs='+', default=['10k'], help='Dataset sizes: 10k, 1M, 10M or a row count.')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Benchmarks to run.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (the best is kept).')
+    parser.add_argument('--no-memory', action='store_true', help='Skip peak memory measurement.')
+    parser.add_argument('--output', help='Write the results to this JSON file.')
+    parser.add_argument('--baseline', help='Compare against results saved earlier with --output.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown before a regression.')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.only, args.repeat, not args.no_memory, log=print)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    shortfalls = check_speedups(results)
+    for shortfall in shortfalls:
+        print(f"TOO SLOW {shortfall['benchmark']}: {shortfall['speedup']:.1f}x faster than "
+              f"{shortfall['reference']}, expected {shortfall['required']:.0f}x")
+    if not args.baseline:
+        return 1 if shortfalls else 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression['benchmark']} {regression['metric']}: "
+              f"{regression['baseline']:.4f} -> {regression['current']:.4f} ({regression['ratio']:.2f}x)")
+    return 1 if regressions or shortfalls else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import os
+import glob
+import pandas as pd
+from typing import Iterable, List, Optional
+
+# Parquet I/O goes through pandas, which needs pyarrow installed at call time.
+PARTITION_COLS = ['stock', 'year']
+
+
+def compact_dtypes(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast a price frame to compact dtypes: float32 prices and indicators,
+    categorical 'stock'.
+
+    Parameters:
+    - data (pd.DataFrame): Price data with a 'Date' column.
+
+    Returns:
+    - pd.DataFrame: A compacted copy of the data.
+    """
+    data = data.copy()
+    float_cols = data.select_dtypes(include='float').columns
+    data[float_cols] = data[float_cols].astype('float32')
+    if 'stock' in data.columns:
+        data['stock'] = data['stock'].astype('category')
+    return data
+
+
+def write_store(data: pd.DataFrame, store_dir: str) -> None:
+    """
+    Write price data to a Parquet dataset partitioned by stock and year.
+
+    Partitions present in `data` are replaced, all others are left untouched, so
+    symbols can be ingested one at a time.
+
+    Parameters:
+    - data (pd.DataFrame): Price data with 'Date' and 'stock' columns.
+    - store_dir (str): Root directory of the dataset.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(data['Date']):
+        raise ValueError("The 'Date' column must be in datetime format.")
+    data = compact_dtypes(data)
+    data['stock'] = data['stock'].astype(str)
+    data['year'] = data['Date'].dt.year
+    data.to_parquet(store_dir, partition_cols=PARTITION_COLS, index=False,
+                    existing_data_behavior='delete_matching')
+
+
+def ingest_yfinance_csvs(csv_dir: str, store_dir: str) -> List[str]:
+    """
+    Ingest '<SYMBOL>_historical_data.csv' files into the columnar store.
+
+    Parameters:
+    - csv_dir (str): Directory holding the yfinance CSV files.
+    - store_dir (str): Root directory of the dataset.
+
+    Returns:
+    - List[str]: The symbols that were ingested.
+    """
+    symbols = []
+    for path in sorted(glob.glob(os.path.join(csv_dir, '*_historical_data.csv'))):
+        symbol = os.path.basename(path).split('_')[0]
+        data = pd.read_csv(path, parse_dates=['Date'])
+        data['stock'] = symbol
+        write_store(data, store_dir)
+        symbols.append(symbol)
+    return symbols
+
+
+def ingest_stock_data(csv_path: str, store_dir: str) -> None:
+    """
+    Ingest the stock_data.csv output of the financial analysis notebook.
+
+    Parameters:
+    - csv_path (str): Path to stock_data.csv.
+    - store_dir (str): Root directory of the dataset.
+    """
+    data = pd.read_csv(csv_path, parse_dates=['Date'])
+    write_store(data, store_dir)
+
+
+def load_store(store_dir: str, columns: Optional[List[str]] = None, symbols: Optional[Iterable[str]] = None,
+               start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load price data from the columnar store, pushing the filters down to Parquet.
+
+    Symbol and year filters prune whole partitions, the date range is applied to
+    row groups, and only the requested columns are read.
+
+    Parameters:
+    - store_dir (str): Root directory of the dataset.
+    - columns (List[str]): Columns to read besides 'Date' and 'stock', defaults to all.
+    - symbols (Iterable[str]): Symbols to read, defaults to all.
+    - start (str): First date to include.
+    - end (str): Last date to include.
+
+    Returns:
+    - pd.DataFrame: Data indexed by 'Date' with a categorical 'stock' column,
+      in the same layout as `stock_analysis.load_data`.
+    """
+    filters = []
+    if symbols is not None:
+        filters.append(('stock', 'in', list(symbols)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        filters += [('year', '>=', start.year), ('Date', '>=', start)]
+    if end is not None:
+        end = pd.Timestamp(end)
+        filters += [('year', '<=', end.year), ('Date', '<=', end)]
+    if columns is not None:
+        columns = ['Date', 'stock'] + [column for column in columns if column not in ('Date', 'stock')]
+
+    data = pd.read_parquet(store_dir, columns=columns, filters=filters or None)
+    data = data.drop(columns='year', errors='ignore')
+    data['stock'] = data['stock'].astype(str).astype('category')
+    data = data.sort_values(['stock', 'Date'], kind='stable')
+    return data.set_index('Date')
@@ -0,0 +1,243 @@
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Tuple
+
+try:
+    from scripts.alignment import price_columns
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    from alignment import price_columns
+
+BLOCK_ELEMENTS = 1 << 16
+
+
+def panel(data: pd.DataFrame, value_col: str, symbols: pd.Index, dates: pd.DatetimeIndex,
+          date_col: str = 'Date', symbol_col: str = 'stock') -> np.ndarray:
+    """
+    Lay a long-format column out as a dense symbol x date array (NaN where missing).
+
+    Rows whose symbol or date is not in the grid are ignored.
+    """
+    row_dates, row_symbols = price_columns(data, date_col, symbol_col)
+    rows = symbols.get_indexer(row_symbols)
+    columns = dates.get_indexer(row_dates)
+    keep = (rows >= 0) & (columns >= 0)
+    values = np.full((len(symbols), len(dates)), np.nan)
+    values[rows[keep], columns[keep]] = data[value_col].to_numpy(dtype=np.float64)[keep]
+    return values
+
+
+def shift(values: np.ndarray, lag: int) -> np.ndarray:
+    """
+    Shift a symbol x time array forward by `lag` steps along time (backward if negative).
+    Lags of the whole length or more leave every value NaN.
+    """
+    shifted = np.full_like(values, np.nan)
+    if abs(lag) >= values.shape[1]:
+        return shifted
+    if lag >= 0:
+        shifted[:, lag:] = values[:, :values.shape[1] - lag]
+    else:
+        shifted[:, :lag] = values[:, -lag:]
+    return shifted
+
+
+def below(values: np.ndarray, held: np.ndarray, value: np.ndarray) -> np.ndarray:
+    """
+    How far every window entry sits below `value` for ranking: one if lower, a half if equal.
+
+    Parameters:
+    - values (np.ndarray): Window contents, shape (..., window).
+    - held (np.ndarray): Mask of the window entries that take part in the ranking.
+    - value (np.ndarray): One value per window, shape (..., 1).
+
+    Returns:
+    - np.ndarray: Shape (..., window), zero for entries that are not held. Summed,
+      it is the rank of `value` among the held entries, less a half; one minus it is
+      how much `value` adds to the rank of every entry.
+    """
+    return held * ((values < value) + 0.5 * (values == value))
+
+
+def window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum of the last `window` values at every time step (last axis), from one cumulative sum.
+    """
+    totals = np.cumsum(values, axis=-1, dtype=np.float64)
+    sums = totals.copy()
+    sums[..., window:] -= totals[..., :-window]
+    return sums
+
+
+def center(values: np.ndarray) -> np.ndarray:
+    """
+    Subtract every row's mean (ignoring NaN).
+
+    Correlation does not depend on it, but it keeps the cumulative sums small,
+    which keeps window sums taken as their differences accurate over long histories.
+    """
+    with np.errstate(invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = np.nanmean(values, axis=1, keepdims=True)
+    return values - np.nan_to_num(means)
+
+
+def rolling_pearson(x: np.ndarray, y: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """
+    Rolling Pearson correlation of two symbol x time arrays, pairwise-complete.
+
+    Counts, sums, squares and cross products of the valid pairs are turned into
+    window sums by differencing cumulative sums, so each window costs O(1).
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+    n, sx, sy, sxy, sxx, syy = window_sums(np.stack([valid, x, y, x * y, x * x, y * y]), window)
+    cov = n * sxy - sx * sy
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = cov / np.sqrt(var_x * var_y)
+    r[(n < min_periods) | ~(var_x > 0) | ~(var_y > 0)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def rolling_spearman(x: np.ndarray, y: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """
+    Rolling Spearman correlation of two symbol x time arrays, pairwise-complete.
+
+    The valid pairs of every window are ranked inside that window (ties get their
+    average rank) and the ranks are correlated, so each value equals
+    `scipy.stats.spearmanr` over the window. The ranks are kept up to date as the
+    window slides: the leaving and the joining pair each shift the other ranks by
+    at most one, so each step costs O(window) rather than ranking the window anew.
+    Ranks are multiples of a half, so the updates are exact.
+    """
+    rows, steps = x.shape
+    # Window contents of x and y as a ring buffer, with their ranks
+    values = np.full((2, rows, window), np.nan)
+    ranks = np.zeros((2, rows, window))
+    held = np.zeros((rows, window), dtype=bool)
+    new = np.stack([x, y])
+    new_held = ~(np.isnan(x) | np.isnan(y))
+    r = np.full((rows, steps), np.nan)
+    for step in range(steps):
+        slot = slice(step % window, step % window + 1)
+        # The leaving pair no longer lifts the entries above it
+        ranks -= held[:, slot] * (1 - below(values, held, values[..., slot]))
+        values[..., slot] = new[..., step:step + 1]
+        held[:, slot] = new_held[:, step:step + 1]
+        # The joining pair lifts the entries above it; its own rank counts those below
+        shifts = below(values, held, values[..., slot])
+        ranks += held[:, slot] * (1 - shifts)
+        ranks[..., slot] = shifts.sum(axis=-1, keepdims=True) + 0.5
+        n = held.sum(axis=-1)
+        # Average ranks of n values always sum to n (n + 1) / 2
+        squared_mean = n * (n + 1) ** 2 / 4
+        kept = held * ranks
+        var_x = np.einsum('ij,ij->i', kept[0], ranks[0]) - squared_mean
+        var_y = np.einsum('ij,ij->i', kept[1], ranks[1]) - squared_mean
+        cov = np.einsum('ij,ij->i', kept[0], ranks[1]) - squared_mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r[:, step] = np.where((n >= min_periods) & (var_x > 0) & (var_y > 0), cov / np.sqrt(var_x * var_y), np.nan)
+    return np.clip(r, -1.0, 1.0)
+
+
+def rolling_correlation(x: np.ndarray, y: np.ndarray, lags: Iterable[int], window: int,
+                        min_periods: int = None, method: str = 'pearson') -> np.ndarray:
+    """
+    Rolling correlation of `x` against `y` for several lead/lag offsets.
+
+    At lag k the pairs are (x[t - k], y[t]), so a positive lag means `x` leads `y`
+    by k steps; every window ends at the time of `y`.
+
+    Parameters:
+    - x (np.ndarray): Symbol x time array, e.g. daily compound sentiment.
+    - y (np.ndarray): Symbol x time array on the same grid, e.g. daily returns.
+    - lags (Iterable[int]): Offsets of `x` relative to `y`.
+    - window (int): Number of time steps per window.
+    - min_periods (int): Minimum number of valid pairs, defaults to `window`.
+    - method (str): 'pearson', or 'spearman' to correlate the ranks of the pairs
+      inside every window.
+
+    Returns:
+    - np.ndarray: float32 array of shape (symbols, lags, time).
+    """
+    if method not in ('pearson', 'spearman'):
+        raise ValueError("method must be 'pearson' or 'spearman'.")
+    min_periods = window if min_periods is None else min_periods
+    lags = list(lags)
+    result = np.empty((x.shape[0], len(lags), x.shape[1]), dtype=np.float32)
+    if method == 'spearman':
+        # The Spearman kernel steps through time, so every lag of a block of symbols
+        # shares one pass; the blocks keep its windows in cache
+        block = max(1, BLOCK_ELEMENTS // max(len(lags) * window, 1))
+        for start in range(0, x.shape[0], block):
+            rows = slice(start, start + block)
+            shifted = np.concatenate([shift(x[rows], lag) for lag in lags])
+            r = rolling_spearman(shifted, np.tile(y[rows], (len(lags), 1)), window, min_periods)
+            result[rows] = r.reshape(len(lags), -1, x.shape[1]).transpose(1, 0, 2)
+        return result
+    x, y = center(x), center(y)
+    # Blocks of symbols small enough for the intermediates to stay in cache
+    block = max(1, BLOCK_ELEMENTS // max(x.shape[1], 1))
+    for start in range(0, x.shape[0], block):
+        rows = slice(start, start + block)
+        for i, lag in enumerate(lags):
+            result[rows, i] = rolling_pearson(shift(x[rows], lag), y[rows], window, min_periods)
+    return result
+
+
+class CorrelationCube:
+    """
+    Rolling sentiment-return correlations as one symbol x lag x time array.
+    """
+
+    def __init__(self, values: np.ndarray, symbols: pd.Index, lags: List[int], dates: pd.DatetimeIndex):
+        self.values = values
+        self.symbols = symbols
+        self.lags = lags
+        self.dates = dates
+
+    def frame(self, symbol) -> pd.DataFrame:
+        """Correlations of one symbol, dates by lags."""
+        return pd.DataFrame(self.values[self.symbols.get_loc(symbol)].T, index=self.dates,
+                            columns=pd.Index(self.lags, name='lag'))
+
+    def latest(self) -> pd.DataFrame:
+        """Most recent correlation of every symbol at every lag, ignoring missing values."""
+        values = self.values
+        last = np.where(~np.isnan(values), np.arange(values.shape[2]), -1).max(axis=2)
+        latest = np.take_along_axis(values, np.maximum(last, 0)[..., None], axis=2)[..., 0]
+        latest[last < 0] = np.nan
+        return pd.DataFrame(latest, index=self.symbols, columns=pd.Index(self.lags, name='lag'))
+
+
+def sentiment_return_correlation(sentiment: pd.DataFrame, prices: pd.DataFrame, lags: Iterable[int] = range(-5, 6),
+                                 window: int = 60, min_periods: int = None, method: str = 'pearson',
+                                 sentiment_col: str = 'compound', return_col: str = 'Daily_Return',
+                                 date_col: str = 'Date', symbol_col: str = 'stock') -> CorrelationCube:
+    """
+    Rolling correlation between daily sentiment and daily returns for every symbol and lag.
+
+    Parameters:
+    - sentiment (pd.DataFrame): Daily sentiment per symbol, e.g. from `alignment.daily_sentiment`.
+    - prices (pd.DataFrame): Daily bars with a return column; their dates form the time axis.
+    - lags (Iterable[int]): Sessions by which sentiment leads returns (negative: lags them).
+    - window (int): Sessions per window.
+    - min_periods (int): Minimum sessions with both values, defaults to `window`.
+    - method (str): 'pearson' or 'spearman'.
+    - sentiment_col (str): Sentiment column to correlate.
+    - return_col (str): Return column to correlate.
+    - date_col (str): Date column (or index name) of both frames.
+    - symbol_col (str): Symbol column of both frames.
+
+    Returns:
+    - CorrelationCube: The symbol x lag x time correlations with their labels.
+    """
+    dates, symbols = price_columns(prices, date_col, symbol_col)
+    grid_dates = pd.DatetimeIndex(dates.dropna().unique()).sort_values()
+    grid_symbols = pd.Index(pd.unique(symbols.dropna()))
+    x = panel(sentiment, sentiment_col, grid_symbols, grid_dates, date_col, symbol_col)
+    y = panel(prices, return_col, grid_symbols, grid_dates, date_col, symbol_col)
+    lags = list(lags)
+    return CorrelationCube(rolling_correlation(x, y, lags, window, min_periods, method), grid_symbols, lags, grid_dates)
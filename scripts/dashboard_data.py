@@ -0,0 +1,140 @@
+import os
+import pandas as pd
+from typing import Callable, Dict, List, Tuple
+
+try:
+    from scripts.indicators import group_segments
+    from scripts.profiling import profiled
+    from scripts.sentiment_store import empty_daily, load_partition, partition_path
+    from scripts.stock_analysis import load_data
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    from indicators import group_segments
+    from profiling import profiled
+    from sentiment_store import empty_daily, load_partition, partition_path
+    from stock_analysis import load_data
+
+# Loaded datasets by (absolute path, loader), with the file version they were loaded at.
+# Module state survives Streamlit reruns, so each file is parsed once per change.
+_CACHE: Dict[Tuple[str, Callable], Tuple[Tuple[int, int], object]] = {}
+
+
+def file_version(path: str) -> Tuple[int, int]:
+    """
+    Version of a file, or of a directory such as a columnar store: the latest
+    modification time in nanoseconds and the total size in bytes.
+    """
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    latest, size = os.stat(path).st_mtime_ns, 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            latest, size = max(latest, stat.st_mtime_ns), size + stat.st_size
+    return latest, size
+
+
+def cached_load(path: str, loader: Callable[[str], object]) -> object:
+    """
+    Load `path` with `loader`, reusing the previous result until the file changes.
+
+    Parameters:
+    - path (str): The file (or store directory) to load.
+    - loader (Callable): Function turning the path into the cached object.
+
+    Returns:
+    - object: The loaded object.
+    """
+    key = (os.path.abspath(path), loader)
+    version = file_version(path)
+    hit = _CACHE.get(key)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    value = loader(path)
+    _CACHE[key] = (version, value)
+    return value
+
+
+def loaded_version(path: str, loader: Callable[[str], object]) -> Tuple[int, int]:
+    """
+    File version the cached result of `cached_load(path, loader)` was loaded at,
+    or None if it has not been loaded.
+    """
+    hit = _CACHE.get((os.path.abspath(path), loader))
+    return None if hit is None else hit[0]
+
+
+def clear_cache() -> None:
+    """
+    Forget every cached dataset.
+    """
+    _CACHE.clear()
+
+
+class SymbolIndex:
+    """
+    A long-format frame grouped into one contiguous block per symbol, so selecting
+    a symbol is a positional slice instead of a boolean scan over every row.
+    """
+
+    def __init__(self, data: pd.DataFrame, group_col: str = 'stock'):
+        order, starts, lengths, labels = group_segments(data[group_col])
+        self.data = data.iloc[order]
+        self.slices = {label: slice(start, start + length)
+                       for label, start, length in zip(labels, starts.tolist(), lengths.tolist())}
+
+    def symbols(self) -> List:
+        """Symbols in order of first appearance."""
+        return list(self.slices)
+
+    def __contains__(self, symbol) -> bool:
+        return symbol in self.slices
+
+    def __getitem__(self, symbol) -> pd.DataFrame:
+        return self.data.iloc[self.slices[symbol]]
+
+
+@profiled
+def load_price_index(path: str) -> SymbolIndex:
+    """Load stock_data.csv (or a columnar store) indexed by symbol."""
+    return SymbolIndex(load_data(path))
+
+
+@profiled
+def load_sentiment_index(path: str) -> SymbolIndex:
+    """Load a daily sentiment CSV indexed by symbol."""
+    return SymbolIndex(pd.read_csv(path))
+
+
+class DashboardData:
+    """
+    Data-access layer for the Streamlit dashboard.
+
+    Datasets are loaded only when first requested, memoized across reruns and
+    reloaded only when their file changes.
+    """
+
+    def __init__(self, price_path: str, sentiment_path: str):
+        self.price_path = price_path
+        self.sentiment_path = sentiment_path
+
+    def prices(self) -> SymbolIndex:
+        """Price and indicator data by symbol."""
+        return cached_load(self.price_path, load_price_index)
+
+    def price_version(self) -> Tuple[int, int]:
+        """Version of the price file the last `prices` result was loaded at, e.g. to key rendered charts."""
+        return loaded_version(self.price_path, load_price_index)
+
+    def sentiment(self, symbol=None):
+        """
+        Daily sentiment by symbol. With a `symbol` and a `sentiment_store` directory,
+        only that symbol's partition is read (and cached until it changes).
+        """
+        if symbol is None or not os.path.isdir(self.sentiment_path):
+            index = cached_load(self.sentiment_path, load_sentiment_index)
+            return index if symbol is None else index[symbol]
+        path = partition_path(self.sentiment_path, symbol)
+        if not os.path.isdir(path):
+            return empty_daily()
+        return cached_load(path, load_partition)
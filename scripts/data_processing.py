@@ -1,18 +1,105 @@
 
 import os # manipulate the files and directories
 import zipfile # unzipp data.zip
+import hashlib # fingerprint the archive
+import tempfile # atomic extraction
 import pandas as pd # for manipulating the dataset
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List
 
-def extract_zip(zip_path: str, extract_to: str) -> None:
+try:
+    from scripts.date_parsing import parse_dates, load_cached_dates, save_cached_dates
+    from scripts.profiling import profiled
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    from date_parsing import parse_dates, load_cached_dates, save_cached_dates
+    from profiling import profiled
+
+# Date columns parsed on load, with the `errors` mode used for each
+DATE_COLUMNS = {'Date': 'coerce', 'date': 'raise'}
+
+def archive_fingerprint(zip_path: str, use_hash: bool = False) -> str:
+    """
+    Fingerprints a zip file so unchanged archives can be detected.
+
+    Args:
+        zip_path (str): The path to the zip file.
+        use_hash (bool): Hash the archive contents instead of using its size and mtime.
+
+    Returns:
+        str: The fingerprint.
+    """
+    if use_hash:
+        digest = hashlib.sha256()
+        with open(zip_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    stat = os.stat(zip_path)
+    return f'{stat.st_size}-{stat.st_mtime_ns}'
+
+def member_target(extract_to: str, name: str) -> str:
+    """
+    Resolves where an archive member is extracted, refusing names that escape the directory.
+
+    Args:
+        extract_to (str): The extraction directory.
+        name (str): The member name stored in the archive.
+
+    Returns:
+        str: The resolved path of the member.
+
+    Raises:
+        ValueError: If the member would be written outside `extract_to`.
+    """
+    root = os.path.realpath(extract_to)
+    target = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, target]) != root or target == root:
+        raise ValueError(f'Archive member {name!r} escapes {extract_to!r}')
+    return target
+
+@profiled
+def extract_zip(zip_path: str, extract_to: str, use_hash: bool = False, force: bool = False) -> None:
     """
     Extracts a zip file to the specified directory.
 
+    Extraction is skipped when the archive has not changed since the last
+    extraction into the same directory. Each member is written to a temporary
+    file and moved into place, so concurrent workers never see partial files.
+    Members whose names point outside `extract_to` are rejected before anything is written.
+
     Args:
         zip_path (str): The path to the zip file.
         extract_to (str): The directory where the zip contents will be extracted.
+        use_hash (bool): Detect changes by content hash instead of size and mtime.
+        force (bool): Extract even if the archive is unchanged.
+
+    Raises:
+        ValueError: If a member name escapes `extract_to` (e.g. '../x' or an absolute path).
     """
+    os.makedirs(extract_to, exist_ok=True)
+    stamp_path = os.path.join(extract_to, f'.{os.path.basename(zip_path)}.stamp')
+    fingerprint = archive_fingerprint(zip_path, use_hash)
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(extract_to)
+        members = [info for info in zip_ref.infolist() if not info.is_dir()]
+        targets = [member_target(extract_to, member.filename) for member in members]
+        if not force and os.path.exists(stamp_path):
+            with open(stamp_path) as f:
+                unchanged = f.read() == fingerprint
+            if unchanged and all(os.path.exists(target) for target in targets):
+                return
+        for member, target in zip(members, targets):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target))
+            try:
+                with os.fdopen(fd, 'wb') as out, zip_ref.open(member) as src:
+                    while block := src.read(1 << 20):
+                        out.write(block)
+                os.replace(tmp_path, target)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+    with open(stamp_path, 'w') as f:
+        f.write(fingerprint)
 
 def load_csv_from_zip(extracted_dir: str, filename: str) -> pd.DataFrame:
     """
@@ -28,32 +115,113 @@ def load_csv_from_zip(extracted_dir: str, filename: str) -> pd.DataFrame:
     file_path = os.path.join(extracted_dir, filename)
     return pd.read_csv(file_path, index_col=0)
 
-def load_data(zip_path: str, filename: str) -> pd.DataFrame:
+@profiled
+def standardize_dates(df: pd.DataFrame, cache_path: str = None, fingerprint: str = None) -> pd.DataFrame:
+    """
+    Parses the 'Date' (prices) and 'date' (news) columns in place.
+
+    Timestamps are parsed by layout with fixed formats (see `date_parsing`). When a
+    cache path is given, parsed columns are reused from it if its fingerprint still
+    matches, and written to it otherwise. The number of rows that went through each
+    parse path is stored in `df.attrs['date_parse_report']`.
+
+    Args:
+        df (pd.DataFrame): The loaded data.
+        cache_path (str): Optional .npz file holding previously parsed columns.
+        fingerprint (str): Fingerprint of the data file the cache belongs to.
+
+    Returns:
+        pd.DataFrame: The same DataFrame with datetime columns.
+    """
+    columns = [column for column in DATE_COLUMNS if column in df.columns]
+    report = {}
+    cached = load_cached_dates(cache_path, fingerprint, len(df)) if cache_path else {}
+    if cached and set(cached) == set(columns):
+        for column in columns:
+            df[column] = cached[column].set_axis(df.index)
+            report[column] = {'cache': len(df)}
+    else:
+        for column in columns:
+            df[column], report[column] = parse_dates(df[column], errors=DATE_COLUMNS[column])
+        if cache_path and columns:
+            save_cached_dates(cache_path, fingerprint, {column: df[column] for column in columns})
+    df.attrs['date_parse_report'] = report
+    return df
+
+@profiled
+def read_csv_from_zip(zip_path: str, filename: str) -> pd.DataFrame:
     """
-    Orchestrates the extraction and loading of data from a zip file.
+    Streams a CSV member straight out of a zip file without extracting it.
+
+    Args:
+        zip_path (str): The path to the zip file.
+        filename (str): The name of the CSV member to load.
+
+    Returns:
+        pd.DataFrame: The loaded data as a pandas DataFrame.
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref, zip_ref.open(filename) as member:
+        return pd.read_csv(member, index_col=0)
+
+def iter_csv_from_zip(zip_path: str, filename: str, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Streams a CSV member out of a zip file in chunks.
+
+    Args:
+        zip_path (str): The path to the zip file.
+        filename (str): The name of the CSV member to load.
+        chunksize (int): Number of rows per chunk.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks with standardized date columns.
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref, zip_ref.open(filename) as member:
+        for chunk in pd.read_csv(member, index_col=0, chunksize=chunksize):
+            yield standardize_dates(chunk)
+
+def load_members(zip_path: str, filenames: List[str], max_workers: int = None) -> Dict[str, pd.DataFrame]:
+    """
+    Loads several CSV members of a zip file in parallel.
+
+    Each worker opens its own handle on the archive, so reads do not contend.
+
+    Args:
+        zip_path (str): The path to the zip file.
+        filenames (List[str]): The names of the CSV members to load.
+        max_workers (int): Number of worker threads, defaults to one per member.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The loaded data keyed by member name.
+    """
+    def load(filename):
+        return standardize_dates(read_csv_from_zip(zip_path, filename))
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(filenames), 1)) as pool:
+        return dict(zip(filenames, pool.map(load, filenames)))
+
+@profiled
+def load_data(zip_path: str, filename: str, cache_dir: str = None) -> pd.DataFrame:
+    """
+    Orchestrates the loading of data from a zip file.
+
+    The CSV member is streamed directly from the archive. Parsed date columns are
+    cached (next to the archive unless `cache_dir` is given) and reused until the
+    archive changes.
 
     Args:
         zip_path (str): The path to the zip file.
         filename (str): The name of the CSV file to load.
+        cache_dir (str): Directory for the parsed-date cache, defaults to the archive's directory.
 
     Returns:
         pd.DataFrame: The processed data as a pandas DataFrame.
     """
     try:
-        
-        extract_to = "../Data"
-        extract_zip(zip_path, extract_to)
-    
-        df = load_csv_from_zip(extract_to, filename)
+        df = read_csv_from_zip(zip_path, filename)
         # Standardize the Date column
-        if 'Date' in df.columns:
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce', utc=True)
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'], format='mixed', utc=True)
-        
-        
-        # df['date'] = pd.to_datetime(df['Date'], format="mixed", utc=True)  # Convert to datetime, coerce errors to NaT
-        return df
-    
+        cache_name = f'{os.path.basename(zip_path)}.{os.path.basename(filename)}.dates.npz'
+        cache_path = os.path.join(cache_dir if cache_dir is not None else os.path.dirname(zip_path), cache_name)
+        return standardize_dates(df, cache_path, archive_fingerprint(zip_path))
+
     except Exception as e:
-        raise RuntimeError(f'Error loading data: {str(e)}') 
\ No newline at end of file
+        raise RuntimeError(f'Error loading data: {str(e)}')
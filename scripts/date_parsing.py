@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+# Timestamp layouts found in the news and price files, keyed by their digit
+# signature (every digit replaced by '9'). Each maps to the format of the leading
+# characters, how many characters that format covers, and where a '+HH:MM'/'-HH:MM'
+# UTC offset starts (None if there is none). Anything else takes the slow path.
+KNOWN_LAYOUTS: Dict[str, Tuple[str, int, Optional[int]]] = {
+    '9999-99-99 99:99:99-99:99': ('%Y-%m-%d %H:%M:%S', 19, 19),
+    '9999-99-99 99:99:99+99:99': ('%Y-%m-%d %H:%M:%S', 19, 19),
+    '9999-99-99T99:99:99-99:99': ('%Y-%m-%dT%H:%M:%S', 19, 19),
+    '9999-99-99T99:99:99+99:99': ('%Y-%m-%dT%H:%M:%S', 19, 19),
+    '9999-99-99T99:99:99Z': ('%Y-%m-%dT%H:%M:%S', 19, None),
+    '9999-99-99 99:99:99': ('%Y-%m-%d %H:%M:%S', 19, None),
+    '9999-99-99T99:99:99': ('%Y-%m-%dT%H:%M:%S', 19, None),
+    '9999-99-99 99:99': ('%Y-%m-%d %H:%M', 16, None),
+    '9999-99-99': ('%Y-%m-%d', 10, None),
+}
+FALLBACK = 'fallback'
+# Values longer than this never match a known layout.
+MAX_LAYOUT_WIDTH = 32
+
+_NAT = np.iinfo(np.int64).min
+_ZERO, _NINE = ord('0'), ord('9')
+
+
+def utc_nanoseconds(values: pd.Series) -> np.ndarray:
+    """
+    Int64 nanoseconds since the epoch of a UTC timestamp Series (NaT becomes int64 min).
+    """
+    return pd.DatetimeIndex(values).as_unit('ns').asi8
+
+
+def code_points(values: pd.Series) -> np.ndarray:
+    """
+    Lay out the values as a fixed-width (rows x MAX_LAYOUT_WIDTH) matrix of code points.
+
+    Missing values become empty strings, so every row can be inspected with array operations.
+    """
+    text = values.to_numpy(dtype=object)
+    text = np.where(values.notna().to_numpy(), text, '')
+    width = MAX_LAYOUT_WIDTH
+    return text.astype(f'U{width}').view(np.uint32).reshape(len(text), width)
+
+
+def layout_signatures(points: np.ndarray) -> np.ndarray:
+    """
+    Replace every digit with '9' so that timestamps sharing a layout share a signature.
+
+    Parameters:
+    - points (np.ndarray): Code point matrix from `code_points`.
+
+    Returns:
+    - np.ndarray: The signature of every row as a fixed-width string array.
+    """
+    masked = points.copy()
+    masked[(masked >= _ZERO) & (masked <= _NINE)] = _NINE
+    return masked.view(f'U{points.shape[1]}').ravel()
+
+
+def _two_digits(points: np.ndarray, column: int) -> np.ndarray:
+    return (points[:, column].astype(np.int64) - _ZERO) * 10 + (points[:, column + 1].astype(np.int64) - _ZERO)
+
+
+def _parse_layout(points: np.ndarray, fmt: str, width: int, offset_at: Optional[int]) -> np.ndarray:
+    leading = np.ascontiguousarray(points[:, :width]).view(f'U{width}').ravel()
+    parsed = pd.DatetimeIndex(pd.to_datetime(leading, format=fmt, errors='coerce')).as_unit('ns').asi8
+    if offset_at is not None:
+        sign = np.where(points[:, offset_at] == ord('-'), -1, 1)
+        minutes = _two_digits(points, offset_at + 1) * 60 + _two_digits(points, offset_at + 4)
+        valid = parsed != _NAT
+        parsed[valid] -= (sign * minutes * 60_000_000_000)[valid]
+    return parsed
+
+
+def parse_dates(values: pd.Series, errors: str = 'raise') -> Tuple[pd.Series, Dict[str, int]]:
+    """
+    Parse timestamps to UTC, grouping them by layout so most rows use a fixed format.
+
+    The layout of every value is detected with array operations; each layout listed
+    in KNOWN_LAYOUTS is then parsed in one vectorized call with its exact format and
+    its UTC offset applied arithmetically. Only values with an unknown layout (or
+    that fail their format) fall back to `pd.to_datetime(format='mixed')`. The
+    result is the same as `pd.to_datetime(values, format='mixed', utc=True, errors=errors)`.
+
+    Parameters:
+    - values (pd.Series): Raw timestamp strings.
+    - errors (str): 'raise' or 'coerce', applied to the fallback path.
+
+    Returns:
+    - Tuple[pd.Series, Dict[str, int]]: The parsed UTC timestamps and the number of
+      rows that went through each layout (and the fallback).
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return pd.to_datetime(values, utc=True), {}
+
+    parsed = np.full(len(values), _NAT, dtype=np.int64)
+    pending = values.notna().to_numpy()
+    report: Dict[str, int] = {}
+    if len(values):
+        points = code_points(values)
+        fits = values.astype(object).where(values.notna(), '').str.len().to_numpy() <= MAX_LAYOUT_WIDTH
+        codes, signatures = pd.factorize(layout_signatures(points))
+        for code, signature in enumerate(signatures):
+            if signature not in KNOWN_LAYOUTS:
+                continue
+            rows = np.flatnonzero((codes == code) & fits)
+            group = _parse_layout(points[rows], *KNOWN_LAYOUTS[signature])
+            ok = group != _NAT
+            parsed[rows[ok]] = group[ok]
+            pending[rows[ok]] = False
+            report[str(signature)] = int(ok.sum())
+
+    stragglers = np.flatnonzero(pending)
+    if len(stragglers):
+        group = pd.to_datetime(values.iloc[stragglers], format='mixed', utc=True, errors=errors)
+        ok = group.notna().to_numpy()
+        parsed[stragglers[ok]] = utc_nanoseconds(group[ok])
+        report[FALLBACK] = len(stragglers)
+
+    result = pd.Series(pd.DatetimeIndex(parsed.view('datetime64[ns]')).tz_localize('UTC'),
+                       index=values.index, name=values.name)
+    return result, report
+
+
+def load_cached_dates(cache_path: str, fingerprint: str, length: int) -> Dict[str, pd.Series]:
+    """
+    Load previously parsed date columns if the cache matches the data file.
+
+    Parameters:
+    - cache_path (str): Path of the .npz cache file.
+    - fingerprint (str): Fingerprint of the data file the cache must belong to.
+    - length (int): Expected number of rows.
+
+    Returns:
+    - Dict[str, pd.Series]: Parsed columns by name, empty if the cache is stale or missing.
+    """
+    try:
+        with np.load(cache_path, allow_pickle=False) as cache:
+            if str(cache['__fingerprint__']) != fingerprint:
+                return {}
+            columns = {name: cache[name] for name in cache.files if name != '__fingerprint__'}
+    except (OSError, KeyError, ValueError):
+        return {}
+    if any(len(values) != length for values in columns.values()):
+        return {}
+    return {name: pd.Series(pd.DatetimeIndex(values.view('datetime64[ns]')).tz_localize('UTC'), name=name)
+            for name, values in columns.items()}
+
+
+def save_cached_dates(cache_path: str, fingerprint: str, columns: Dict[str, pd.Series]) -> None:
+    """
+    Store parsed date columns next to the data file; failures to write are ignored.
+
+    Parameters:
+    - cache_path (str): Path of the .npz cache file.
+    - fingerprint (str): Fingerprint of the data file the columns were parsed from.
+    - columns (Dict[str, pd.Series]): Parsed UTC timestamp columns by name.
+    """
+    arrays = {name: utc_nanoseconds(values) for name, values in columns.items()}
+    try:
+        with open(cache_path, 'wb') as f:
+            np.savez(f, __fingerprint__=np.array(fingerprint), **arrays)
+    except OSError:
+        pass
@@ -1,6 +1,142 @@
+import datetime
+import hashlib
+import numpy as np
 import pandas as pd
 import re
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
 
+try:
+    from scripts.profiling import profiled
+    from scripts.sketches import StreamingTopK
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    from profiling import profiled
+    from sketches import StreamingTopK
+
+# Day names indexed by the integer day of the week (Monday=0), as in `dt.dayofweek`
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+NS_PER_MINUTE = 60_000_000_000
+MINUTES_PER_DAY = 24 * 60
+DOMAIN_PATTERN = r"@([\w\.-]+)"
+
+# Domain codes and distinct domains by publisher vocabulary, so repeated reports
+# over the same publishers skip the regex entirely; least recently used first.
+DOMAIN_CACHE_SIZE = 16
+_DOMAIN_CACHE: 'OrderedDict[bytes, Tuple[np.ndarray, pd.Index]]' = OrderedDict()
+
+def ranked_counts(counts: np.ndarray, labels, name: str) -> pd.Series:
+    """
+    Non-zero counts as a Series sorted by count, ties kept in label order.
+    """
+    order = np.argsort(-counts, kind='stable')
+    order = order[counts[order] > 0]
+    return pd.Series(counts[order], index=pd.Index(np.asarray(labels, dtype=object)[order], name=name),
+                     name='count', dtype='int64')
+
+def wall_clock_nanoseconds(dates: pd.Series) -> np.ndarray:
+    """
+    Local wall-clock time of a datetime column as int64 nanoseconds (NaT is the int64 minimum).
+    """
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        raise ValueError("The 'date' column must be in datetime format.")
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+def day_of_week_counts(nanoseconds: np.ndarray) -> np.ndarray:
+    """
+    Article counts per day of the week (Monday=0) from wall-clock nanoseconds.
+    """
+    valid = nanoseconds != np.iinfo(np.int64).min
+    # 1970-01-01 was a Thursday
+    days = (nanoseconds[valid] // (NS_PER_MINUTE * MINUTES_PER_DAY) + 3) % 7
+    return np.bincount(days, minlength=7)
+
+def minute_of_day_counts(nanoseconds: np.ndarray) -> np.ndarray:
+    """
+    Article counts per minute of the day (0-1439) from wall-clock nanoseconds.
+    """
+    valid = nanoseconds != np.iinfo(np.int64).min
+    minutes = (nanoseconds[valid] // NS_PER_MINUTE) % MINUTES_PER_DAY
+    return np.bincount(minutes, minlength=MINUTES_PER_DAY)
+
+def publisher_codes(publishers: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Integer code of every article's publisher (-1 for missing) and the distinct publishers.
+
+    Categorical columns reuse their codes; anything else is factorized once.
+    """
+    if isinstance(publishers.dtype, pd.CategoricalDtype):
+        return publishers.cat.codes.to_numpy(), publishers.cat.categories
+    return pd.factorize(publishers)
+
+def vocabulary_key(values: pd.Index) -> bytes:
+    """
+    Content hash of a vocabulary (its values, in order).
+    """
+    hashes = pd.util.hash_array(np.asarray(values, dtype=object).astype(str).astype(object), categorize=False)
+    return hashlib.blake2b(hashes.tobytes(), digest_size=16).digest()
+
+def domain_lookup(publishers: pd.Index) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Domain of every distinct publisher, extracted with one vectorized regex and cached
+    per publisher vocabulary.
+
+    Parameters:
+    - publishers (pd.Index): Distinct publisher names; non-strings have no domain.
+
+    Returns:
+    - Tuple[np.ndarray, pd.Index]: The domain code of each publisher (-1 if none) and the distinct domains.
+    """
+    key = vocabulary_key(publishers)
+    if key in _DOMAIN_CACHE:
+        _DOMAIN_CACHE.move_to_end(key)
+        return _DOMAIN_CACHE[key]
+    names = pd.Series(publishers, dtype=object)
+    names = names.where(names.map(type) == str).astype('string')
+    domains = names.str.extract(DOMAIN_PATTERN, expand=False).astype(object)
+    codes, uniques = pd.factorize(domains)
+    hit = _DOMAIN_CACHE[key] = (codes, pd.Index(uniques, dtype=object))
+    while len(_DOMAIN_CACHE) > DOMAIN_CACHE_SIZE:
+        _DOMAIN_CACHE.popitem(last=False)
+    return hit
+
+@profiled
+def publisher_domains(publishers: pd.Series) -> pd.DataFrame:
+    """
+    Publisher and email domain of every article as categoricals.
+
+    The regex runs once per distinct publisher and the result is broadcast back
+    through the integer codes.
+
+    Parameters:
+    - publishers (pd.Series): The 'publisher' column.
+
+    Returns:
+    - pd.DataFrame: Categorical 'publisher' and 'domain' columns on the same index.
+    """
+    codes, names = publisher_codes(publishers)
+    domain_codes, domains = domain_lookup(names)
+    article_domains = np.where(codes >= 0, domain_codes[codes] if len(domain_codes) else -1, -1)
+    return pd.DataFrame({
+        'publisher': pd.Categorical.from_codes(codes, categories=pd.Index(names, dtype=object)),
+        'domain': pd.Categorical.from_codes(article_domains, categories=domains),
+    }, index=publishers.index)
+
+def domain_counts(codes: np.ndarray, publishers: pd.Index) -> pd.DataFrame:
+    """
+    Articles per email domain, given publisher codes.
+
+    Articles are counted per publisher and the counts summed per domain, so the
+    regex never sees individual articles.
+    """
+    counts = np.bincount(codes[codes >= 0], minlength=len(publishers))
+    domain_codes, domains = domain_lookup(publishers)
+    has_domain = domain_codes >= 0
+    totals = np.bincount(domain_codes[has_domain], weights=counts[has_domain], minlength=len(domains))
+    return ranked_counts(totals.astype(np.int64), domains, 'domain').reset_index()
+
+@profiled
 def headline_length_stats(data: pd.DataFrame) -> pd.Series:
     """
     Calculate and return descriptive statistics for the length of headlines.
@@ -11,22 +147,47 @@ def headline_length_stats(data: pd.DataFrame) -> pd.Series:
     Returns:
         pd.Series: Descriptive statistics for headline lengths.
     """
-    data['headline_length'] = data['headline'].apply(len)
-    
-    return data['headline_length'].describe()
+    return data['headline'].str.len().rename('headline_length').describe()
 
-def articles_per_publisher(data: pd.DataFrame) -> pd.Series:
+@profiled
+def articles_per_publisher(data: pd.DataFrame, approximate: bool = False, capacity: int = 1000) -> pd.Series:
     """
     Count the number of articles per publisher.
     
     Parameters:
         data (pd.DataFrame): DataFrame containing the data.
+        approximate (bool): Estimate the counts of the top publishers with a sketch.
+        capacity (int): Number of publishers kept when approximating.
     
     Returns:
         pd.Series: Counts of articles per publisher.
     """
+    if approximate:
+        return publisher_sketch([data['publisher']], capacity)
     return data['publisher'].value_counts()
 
+def publisher_sketch(chunks: Iterable[pd.Series], capacity: int = 1000, epsilon: float = 1e-4,
+                     delta: float = 1e-3) -> pd.Series:
+    """
+    Estimate articles per publisher over a stream of publisher chunks in constant memory.
+
+    Parameters:
+        chunks (Iterable[pd.Series]): Chunks of the 'publisher' column.
+        capacity (int): Number of heavy-hitter publishers kept.
+        epsilon (float): Maximum overcount as a fraction of all articles seen.
+        delta (float): Probability of exceeding that bound.
+
+    Returns:
+        pd.Series: Estimated counts of the top publishers, most frequent first.
+    """
+    topk = StreamingTopK(capacity, epsilon, delta)
+    for chunk in chunks:
+        topk.update(chunk)
+    top = topk.top()
+    return pd.Series([count for _, count in top], index=pd.Index([name for name, _ in top], name='publisher'),
+                     name='count', dtype='int64')
+
+@profiled
 def articles_by_day_of_week(data: pd.DataFrame) -> pd.Series:
     """
     Analyze the distribution of articles by day of the week.
@@ -37,14 +198,11 @@ def articles_by_day_of_week(data: pd.DataFrame) -> pd.Series:
     Returns:
         pd.Series: Counts of articles by day of the week.
     """
-    if not pd.api.types.is_datetime64_any_dtype(data['date']):
-        raise ValueError("The 'date' column must be in datetime format.")
-    
-    data['day_of_week'] = data['date'].dt.day_name()
-    
-    return data['day_of_week'].value_counts()
+    counts = day_of_week_counts(wall_clock_nanoseconds(data['date']))
+    return ranked_counts(counts, DAY_NAMES, 'day_of_week')
 
 
+@profiled
 def articles_by_time(data: pd.DataFrame) -> pd.Series:
     """
     Analyze the distribution of articles by time of the day.
@@ -53,17 +211,12 @@ def articles_by_time(data: pd.DataFrame) -> pd.Series:
         data (pd.DataFrame): DataFrame containing the data with a 'date' column in datetime format.
     
     Returns:
-        pd.Series: Counts of articles by time of the day.
+        pd.Series: Counts of articles by minute of the day, indexed by `datetime.time`.
     """
-    # Ensure the 'date' column is in datetime format
-    if not pd.api.types.is_datetime64_any_dtype(data['date']):
-        raise ValueError("The 'date' column must be in datetime format.")
-    
-    # Extract the hour of the day
-    data['time'] = data['date'].dt.time
-    
-    # Return counts of articles by hour of the day
-    return data['time'].value_counts().sort_index()
+    counts = minute_of_day_counts(wall_clock_nanoseconds(data['date']))
+    minutes = np.flatnonzero(counts)
+    times = [datetime.time(minute // 60, minute % 60) for minute in minutes.tolist()]
+    return pd.Series(counts[minutes], index=pd.Index(times, name='time'), name='count', dtype='int64')
 
 
 def extract_domains(email: str) -> str:
@@ -76,9 +229,12 @@ def extract_domains(email: str) -> str:
     Returns:
     - str: Domain part of the email address.
     """
-    match = re.search(r"@([\w\.-]+)", email)
+    if not isinstance(email, str):
+        return None
+    match = re.search(DOMAIN_PATTERN, email)
     return match.group(1) if match else None
 
+@profiled
 def identify_unique_domains(data: pd.DataFrame) -> pd.DataFrame:
     """
     Identify unique domains from email addresses used as publisher names.
@@ -89,7 +245,34 @@ def identify_unique_domains(data: pd.DataFrame) -> pd.DataFrame:
     Returns:
     - pd.DataFrame: DataFrame containing unique domains and their frequency.
     """
-    data['domain'] = data['publisher'].apply(extract_domains)
-    domain_counts = data['domain'].value_counts().reset_index()
-    domain_counts.columns = ['domain', 'count']
-    return domain_counts
\ No newline at end of file
+    return domain_counts(*publisher_codes(data['publisher']))
+
+@profiled
+def descriptive_report(data: pd.DataFrame) -> dict:
+    """
+    Compute every descriptive statistic of the news data in one pass over its columns.
+
+    The input is left unchanged: dates are binned by integer day of the week and
+    minute of the day, and publishers are factorized once for both the publisher
+    and the domain counts.
+
+    Parameters:
+    - data (pd.DataFrame): DataFrame with 'headline', 'publisher' and a datetime 'date' column.
+
+    Returns:
+    - dict: 'headline_length' (pd.Series of descriptive statistics), 'publishers'
+      (pd.Series of articles per publisher), 'day_of_week' (pd.Series of articles per
+      day name, Monday first), 'minute_of_day' (np.ndarray of 1440 article counts) and
+      'domains' (pd.DataFrame with 'domain' and 'count' columns).
+    """
+    nanoseconds = wall_clock_nanoseconds(data['date'])
+    codes, publishers = publisher_codes(data['publisher'])
+    publisher_counts = np.bincount(codes[codes >= 0], minlength=len(publishers))
+    day_counts = day_of_week_counts(nanoseconds)
+    return {
+        'headline_length': headline_length_stats(data),
+        'publishers': ranked_counts(publisher_counts, publishers, 'publisher'),
+        'day_of_week': pd.Series(day_counts, index=pd.Index(DAY_NAMES, name='day_of_week'), name='count'),
+        'minute_of_day': minute_of_day_counts(nanoseconds),
+        'domains': domain_counts(codes, publishers),
+    }
@@ -1,27 +1,184 @@
+import os
+import time
+import tempfile
 import pandas as pd
-import pynance as pn
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
 
-def fetch_historical_data(stocks, start_date="2022-01-01", end_date="2023-01-01"):
+try:
+    import pynance as pn
+except ImportError:  # only needed for live downloads
+    pn = None
+
+
+def pynance_source(stock, start_date, end_date):
+    """
+    Download daily bars for one stock with pynance (end date exclusive).
+    """
+    if pn is None:
+        raise ImportError("pynance is required to download market data.")
+    return pd.DataFrame(pn.data.get(stock, start=start_date, end=end_date))
+
+
+def local_csv_source(directory):
+    """
+    Build an offline data source that reads '<STOCK>_historical_data.csv' files,
+    e.g. data/raw/yfinance_data. It can be passed to `fetch_historical_data` in place
+    of the pynance download.
+
+    Parameters:
+    directory (str): Directory holding the yfinance CSV files.
+
+    Returns:
+    Callable: A source taking (stock, start_date, end_date).
+    """
+    def source(stock, start_date, end_date):
+        path = os.path.join(directory, f'{stock}_historical_data.csv')
+        data = pd.read_csv(path, index_col='Date', parse_dates=True)
+        return data[(data.index >= pd.Timestamp(start_date)) & (data.index < pd.Timestamp(end_date))]
+    return source
+
+
+# Failures worth retrying are network and I/O errors (the exceptions of requests,
+# used by pynance, are OSErrors too); a missing file or a bad symbol fails at once.
+TRANSIENT_ERRORS = (OSError,)
+PERMANENT_ERRORS = (FileNotFoundError, IsADirectoryError, PermissionError)
+
+
+def fetch_with_retry(source, stock, start_date, end_date, retries=3, backoff=1.0):
+    """
+    Call a data source, retrying with exponential backoff on transient failures.
+    """
+    for attempt in range(retries):
+        try:
+            return source(stock, start_date, end_date)
+        except PERMANENT_ERRORS:
+            raise
+        except TRANSIENT_ERRORS:
+            if attempt == retries - 1:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def missing_ranges(start_date, end_date, cached_start=None, cached_end=None) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """
+    Date ranges of [start_date, end_date) not covered by the cached range.
+
+    The cache always covers one contiguous range, so at most the part before and
+    the part after it are missing.
+    """
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    if cached_start is None:
+        return [(start, end)]
+    ranges = []
+    if start < cached_start:
+        ranges.append((start, cached_start))
+    if end > cached_end:
+        ranges.append((cached_end, end))
+    return ranges
+
+
+def covered_end(requested_end, data, today=None) -> pd.Timestamp:
+    """
+    End (exclusive) of the date range a fetch can be trusted to cover.
+
+    A request may reach past the data that exists yet, so the covered range stops
+    at the day after the last returned bar and never includes today, whose bar
+    may still change. Later fetches then request those days again.
+    """
+    today = pd.Timestamp(today) if today is not None else pd.Timestamp.today()
+    index = data.index.tz_localize(None) if getattr(data.index, 'tz', None) is not None else data.index
+    last_bar = index.max().normalize() + pd.Timedelta(days=1) if len(index) else pd.Timestamp.min
+    return min(pd.Timestamp(requested_end), last_bar, today.normalize())
+
+
+def fetch_stock(stock, start_date, end_date, source=pynance_source, cache_dir=None, retries=3, backoff=1.0,
+                today=None):
+    """
+    Fetch historical data for one stock, only requesting dates missing from the cache.
+
+    Parameters:
+    stock (str): Stock symbol.
+    start_date (str): Start date in YYYY-MM-DD format.
+    end_date (str): End date (exclusive) in YYYY-MM-DD format.
+    source (Callable): Data source taking (stock, start_date, end_date).
+    cache_dir (str): Directory for the per-symbol cache, or None to disable caching.
+    retries (int): Attempts per request.
+    backoff (float): Initial delay in seconds between attempts, doubled every retry.
+    today (str): Current date, defaults to the system date; see `covered_end`.
+
+    Returns:
+    pd.DataFrame: Daily bars for the stock in [start_date, end_date).
+    """
+    cache_path = os.path.join(cache_dir, f'{stock}.pkl') if cache_dir else None
+    cached = pd.read_pickle(cache_path) if cache_path and os.path.exists(cache_path) else None
+    frames, cached_start, cached_end = [], None, None
+    if cached is not None:
+        frames.append(cached['data'])
+        cached_start, cached_end = cached['start'], cached['end']
+
+    ranges = missing_ranges(start_date, end_date, cached_start, cached_end)
+    for range_start, range_end in ranges:
+        frames.append(fetch_with_retry(source, stock, range_start.strftime('%Y-%m-%d'),
+                                       range_end.strftime('%Y-%m-%d'), retries, backoff))
+    data = pd.concat(frames).sort_index() if len(frames) > 1 else frames[0]
+    data = data[~data.index.duplicated(keep='last')]
+
+    if cache_path and ranges:
+        os.makedirs(cache_dir, exist_ok=True)
+        starts = [start for start, _ in ranges] + ([cached_start] if cached_start is not None else [])
+        ends = [end for _, end in ranges] + ([cached_end] if cached_end is not None else [])
+        cache_start, cache_end = min(starts), covered_end(max(ends), data, today)
+        if cache_end > cache_start:
+            # A temporary file of its own per write, so concurrent fetches of a symbol never share one
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f'{stock}.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pd.to_pickle({'data': data, 'start': cache_start, 'end': cache_end}, f)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    index = data.index.tz_localize(None) if getattr(data.index, 'tz', None) is not None else data.index
+    return data[(index >= start) & (index < end)]
+
+
+def fetch_historical_data(stocks, start_date="2022-01-01", end_date="2023-01-01", source=pynance_source,
+                          cache_dir=None, max_workers=32, retries=3, backoff=1.0, today=None):
     """
     Fetch historical market data for a list of stocks.
 
+    Stocks are fetched concurrently on a bounded thread pool, so refreshing many
+    tickers takes about as long as the slowest single download. With a cache
+    directory only the date ranges not fetched before are requested.
+
     Parameters:
     stocks (tuple): A tuple of stock symbols.
     start_date (str): Start date for fetching the data in YYYY-MM-DD format.
     end_date (str): End date for fetching the data in YYYY-MM-DD format.
+    source (Callable): Data source taking (stock, start_date, end_date), e.g.
+        `local_csv_source('data/raw/yfinance_data')` to work offline.
+    cache_dir (str): Directory for the per-symbol cache, or None to disable caching.
+    max_workers (int): Maximum number of concurrent downloads.
+    retries (int): Attempts per request.
+    backoff (float): Initial delay in seconds between attempts, doubled every retry.
+    today (str): Current date, defaults to the system date. Days from today on are
+        never treated as cached.
 
     Returns:
     pd.DataFrame: A DataFrame containing historical data for all stocks.
     """
-    yfinance_data = []  # Initialize an empty list to store DataFrames
-
-    for stock in stocks:
-        # Fetch data for each stock
-        data = pn.data.get(stock, start=start_date, end=end_date)
-        yf_df = pd.DataFrame(data)  # Convert to a DataFrame
+    def fetch(stock):
+        yf_df = fetch_stock(stock, start_date, end_date, source, cache_dir, retries, backoff, today).copy()
         yf_df['stock'] = stock  # Add the stock symbol to the DataFrame
-        yfinance_data.append(yf_df)  # Append the DataFrame to the list
+        return yf_df
+
+    stocks = list(stocks)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(stocks)))) as pool:
+        yfinance_data = list(pool.map(fetch, stocks))
 
     # Concatenate all DataFrames in the list into a single DataFrame
     yfinance_df = pd.concat(yfinance_data)
-    return yfinance_df
\ No newline at end of file
+    return yfinance_df
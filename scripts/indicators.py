@@ -0,0 +1,392 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Tuple
+
+# Declarative description of every indicator plotted by stock_analysis.py.
+# Each entry names a kernel ('kind'), the column it reads ('source'), the
+# columns it writes ('outputs') and any keyword parameters for the kernel.
+# Entries are evaluated in order, so a later entry may read an earlier output.
+INDICATOR_SPEC: List[Dict] = [
+    {'kind': 'sma', 'source': 'Close', 'period': 20, 'outputs': ['SMA_20']},
+    {'kind': 'ema', 'source': 'Close', 'period': 20, 'outputs': ['EMA_20']},
+    {'kind': 'rsi', 'source': 'Close', 'period': 14, 'outputs': ['RSI_14']},
+    {'kind': 'macd', 'source': 'Close', 'fast': 12, 'slow': 26, 'signal': 9,
+     'outputs': ['MACD', 'MACD_Signal', 'MACD_Hist']},
+    {'kind': 'pct_change', 'source': 'Close', 'outputs': ['Daily_Return']},
+    {'kind': 'cumprod', 'source': 'Daily_Return', 'outputs': ['Cumulative_Return']},
+]
+
+
+def group_segments(symbols: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lay out rows so that every symbol occupies one contiguous slice.
+
+    Parameters:
+    - symbols (pd.Series): Symbol of every row.
+
+    Returns:
+    - Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The stable row order that
+      groups the symbols, the start and length of each symbol's slice in that order,
+      and the symbol labels.
+    """
+    codes, labels = pd.factorize(symbols, use_na_sentinel=False)
+    order = np.argsort(codes, kind='stable')
+    lengths = np.bincount(codes, minlength=len(labels))
+    starts = np.cumsum(lengths) - lengths
+    return order, starts, lengths, np.asarray(labels)
+
+
+def segment_positions(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Position of every row within its own segment (0 for the first row of a symbol).
+    """
+    total = int(lengths.sum())
+    return np.arange(total) - np.repeat(starts, lengths)
+
+
+def take(param, idx):
+    """A scalar parameter as is, or the entries of a per-row parameter array at `idx`."""
+    return param[idx] if np.ndim(param) else param
+
+
+def window_sum(values: np.ndarray, ends: np.ndarray, period) -> np.ndarray:
+    """
+    Sum the `period` values ending at each index in `ends`, oldest value first.
+
+    The summation order is fixed so that the result for a window never depends on
+    how much history surrounds it. `period` is a scalar or one period per end.
+    """
+    total = values[ends - (period - 1)].copy()
+    for lag in range(int(np.max(period, initial=1)) - 2, -1, -1):
+        if np.ndim(period):
+            inside = period - 2 >= lag
+            total[inside] += values[ends[inside] - lag]
+        else:
+            total += values[ends - lag]
+    return total
+
+
+def run_recursive(values: np.ndarray, out: np.ndarray, first: np.ndarray, remaining: np.ndarray,
+                  step: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> None:
+    """
+    Advance a first-order recursion over many segments at once.
+
+    `out[first]` must already hold each segment's seed; the following
+    `remaining - 1` rows of every segment are filled in place with
+    `step(previous_output, value, rows)`. Each time step is one vectorized update across
+    every segment that is still long enough.
+
+    Parameters:
+    - values (np.ndarray): Contiguous input values.
+    - out (np.ndarray): Output array, updated in place.
+    - first (np.ndarray): Index of the seeded row of each segment.
+    - remaining (np.ndarray): Number of rows from the seed to the end of each segment.
+    - step (Callable): Recurrence applied elementwise.
+    """
+    if len(first) == 0:
+        return
+    order = np.argsort(-remaining, kind='stable')
+    first = first[order]
+    neg_remaining = -remaining[order]
+    for t in range(1, -int(neg_remaining[0])):
+        active = np.searchsorted(neg_remaining, -t, side='left')
+        idx = first[:active] + t
+        out[idx] = step(out[idx - 1], values[idx], idx)
+
+
+def ema_step(period) -> Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]:
+    """
+    TA-Lib style exponential smoothing step with k = 2 / (period + 1).
+
+    `period` is a scalar or an array indexed like the values (the step's third
+    argument selects the entries being advanced), so many periods can be smoothed
+    side by side with the same arithmetic.
+    """
+    k = 2.0 / (period + 1)
+    return lambda prev, value, idx: (value - prev) * take(k, idx) + prev
+
+
+def wilder_step(period) -> Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]:
+    """Wilder's smoothing step as used by TA-Lib's RSI; `period` as in `ema_step`."""
+    return lambda prev, value, idx: (prev * (take(period, idx) - 1) + value) / take(period, idx)
+
+
+def product_step(prev: np.ndarray, value: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Running product step."""
+    return prev * value
+
+
+
+class Layout:
+    """
+    Contiguous per-symbol layout shared by the indicator kernels.
+
+    The first `context` rows of every segment are history that was already
+    computed (carried over by `IncrementalIndicators`); kernels only fill in the
+    rows after it. For a plain batch run the context is empty.
+    """
+
+    def __init__(self, starts: np.ndarray, lengths: np.ndarray, base: np.ndarray = None,
+                 context: np.ndarray = None, prior: Dict[str, np.ndarray] = None):
+        self.starts = starts
+        self.lengths = lengths
+        self.ends = starts + lengths
+        self.size = int(lengths.sum())
+        self.local = segment_positions(starts, lengths)
+        base = np.zeros_like(starts) if base is None else base
+        context = np.zeros_like(starts) if context is None else context
+        # Position of every row within its symbol's full history
+        self.pos = self.local + np.repeat(base, lengths)
+        self.base = base
+        self.new_first = starts + context
+        self.is_new = self.local >= np.repeat(context, lengths)
+        self.prior = prior or {}
+
+    def array(self, key: str) -> np.ndarray:
+        """Output buffer for `key`, pre-filled with any carried-over values."""
+        if key in self.prior:
+            return self.prior[key].copy()
+        return np.full(self.size, np.nan)
+
+
+def seed_and_run(layout: Layout, values: np.ndarray, out: np.ndarray, seed_pos: int,
+                 seed: Callable[[np.ndarray], np.ndarray],
+                 step: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> None:
+    """
+    Seed a recursion at position `seed_pos` of every symbol and advance it over the new rows.
+
+    Symbols whose seed row is among the new rows get `out[row] = seed(rows)`;
+    symbols seeded earlier continue from the last carried-over output.
+    """
+    seed_idx = layout.starts + seed_pos - layout.base
+    fresh = (seed_idx >= layout.new_first) & (seed_idx < layout.ends)
+    out[seed_idx[fresh]] = seed(seed_idx[fresh])
+    carried = (seed_idx < layout.new_first) & (layout.new_first < layout.ends)
+    first = np.where(fresh, seed_idx, layout.new_first - 1)
+    active = fresh | carried
+    run_recursive(values, out, first[active], layout.ends[active] - first[active], step)
+
+
+def smoothed(layout: Layout, values: np.ndarray, out: np.ndarray, period: int,
+             offset: int = 0, wilder: bool = False) -> np.ndarray:
+    """
+    Exponentially smooth every segment, seeding with the simple mean of the first window.
+
+    The seed covers rows `offset .. offset + period - 1` of each symbol; rows before it
+    are NaN, matching TA-Lib's lookback.
+    """
+    step = wilder_step(period) if wilder else ema_step(period)
+    seed_and_run(layout, values, out, offset + period - 1,
+                 lambda idx: window_sum(values, idx, period) / period, step)
+    return out
+
+
+def rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    """
+    Convert Wilder average gain/loss into RSI, returning 0 for flat windows like TA-Lib.
+    """
+    total = avg_gain + avg_loss
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rsi = np.where(total != 0, 100 * (avg_gain / total), 0.0)
+    rsi[np.isnan(total)] = np.nan
+    return rsi
+
+
+def _sma(layout, values, outputs, period):
+    out = layout.array(outputs[0])
+    ends = np.flatnonzero(layout.is_new & (layout.pos >= period - 1))
+    out[ends] = window_sum(values, ends, period) / period
+    return {outputs[0]: out}
+
+
+def _ema(layout, values, outputs, period):
+    return {outputs[0]: smoothed(layout, values, layout.array(outputs[0]), period)}
+
+
+def _rsi(layout, values, outputs, period):
+    diff = np.full(layout.size, np.nan)
+    idx = np.flatnonzero(layout.local >= 1)
+    diff[idx] = values[idx] - values[idx - 1]
+    gain = np.where(diff > 0, diff, 0.0)
+    loss = np.where(diff < 0, -diff, 0.0)
+    gain_key, loss_key = f'{outputs[0]}/avg_gain', f'{outputs[0]}/avg_loss'
+    avg_gain = smoothed(layout, gain, layout.array(gain_key), period, offset=1, wilder=True)
+    avg_loss = smoothed(layout, loss, layout.array(loss_key), period, offset=1, wilder=True)
+    return {outputs[0]: rsi_from_averages(avg_gain, avg_loss), gain_key: avg_gain, loss_key: avg_loss}
+
+
+def _macd(layout, values, outputs, fast, slow, signal):
+    if fast >= slow:
+        raise ValueError("The fast MACD period must be shorter than the slow period.")
+    fast_key, slow_key = f'{outputs[0]}/fast_ema', f'{outputs[0]}/slow_ema'
+    # TA-Lib aligns the fast EMA seed so that both EMAs start on the same row.
+    fast_ema = smoothed(layout, values, layout.array(fast_key), fast, offset=slow - fast)
+    slow_ema = smoothed(layout, values, layout.array(slow_key), slow)
+    macd_line = fast_ema - slow_ema
+    signal_line = smoothed(layout, macd_line, layout.array(outputs[1]), signal, offset=slow - 1)
+    macd = np.where(layout.pos >= slow + signal - 2, macd_line, np.nan)
+    return {outputs[0]: macd, outputs[1]: signal_line, outputs[2]: macd - signal_line,
+            fast_key: fast_ema, slow_key: slow_ema}
+
+
+def _pct_change(layout, values, outputs):
+    out = layout.array(outputs[0])
+    idx = np.flatnonzero(layout.is_new & (layout.pos >= 1))
+    out[idx] = values[idx] / values[idx - 1] - 1
+    return {outputs[0]: out}
+
+
+def _cumprod(layout, values, outputs):
+    # Like pandas' (1 + r).cumprod(): the leading NaN return stays NaN.
+    growth = 1 + values
+    out = layout.array(outputs[0])
+    seed_and_run(layout, growth, out, 1, lambda idx: growth[idx], product_step)
+    return {outputs[0]: out}
+
+
+KERNELS: Dict[str, Callable] = {
+    'sma': _sma,
+    'ema': _ema,
+    'rsi': _rsi,
+    'macd': _macd,
+    'pct_change': _pct_change,
+    'cumprod': _cumprod,
+}
+
+
+def lookback(entry: Dict) -> int:
+    """
+    Number of leading rows of a symbol for which an indicator is undefined.
+    """
+    kind = entry['kind']
+    if kind in ('sma', 'ema'):
+        return entry['period'] - 1
+    if kind == 'rsi':
+        return entry['period']
+    if kind == 'macd':
+        return entry['slow'] + entry['signal'] - 2
+    return 1
+
+
+def evaluate_spec(layout: Layout, spec: List[Dict], source: Callable[[str], np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Run every entry of an indicator spec over a prepared layout.
+
+    Parameters:
+    - layout (Layout): The contiguous per-symbol layout.
+    - spec (List[Dict]): Indicator specification.
+    - source (Callable): Returns a raw input column in layout order.
+
+    Returns:
+    - Dict[str, np.ndarray]: Raw inputs, indicator outputs and intermediate state arrays.
+    """
+    columns: Dict[str, np.ndarray] = {}
+    for entry in spec:
+        params = {key: value for key, value in entry.items() if key not in ('kind', 'source', 'outputs')}
+        name = entry['source']
+        if name not in columns:
+            columns[name] = source(name)
+        columns.update(KERNELS[entry['kind']](layout, columns[name], entry['outputs'], **params))
+    return columns
+
+
+def compute_indicators(data: pd.DataFrame, spec: List[Dict] = None, group_col: str = 'stock') -> pd.DataFrame:
+    """
+    Compute technical indicators separately for every symbol in a long-format frame.
+
+    Rows are regrouped into one contiguous slice per symbol and every indicator in
+    `spec` is evaluated for all symbols in a single batched NumPy pass, so windows
+    never cross from one symbol into the next. Rows of a symbol are assumed to be
+    in chronological order.
+
+    Parameters:
+    - data (pd.DataFrame): Price data such as the output of `fetch_historical_data`.
+    - spec (List[Dict]): Indicator specification, defaults to `INDICATOR_SPEC`.
+    - group_col (str): Column holding the symbol.
+
+    Returns:
+    - pd.DataFrame: A copy of `data` with one column per indicator output.
+    """
+    spec = INDICATOR_SPEC if spec is None else spec
+    if group_col in data.columns:
+        order, starts, lengths, _ = group_segments(data[group_col])
+    else:
+        order = np.arange(len(data))
+        starts, lengths = np.array([0]), np.array([len(data)])
+    layout = Layout(starts, lengths)
+    columns = evaluate_spec(layout, spec, lambda name: data[name].to_numpy(dtype=np.float64)[order])
+
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    result = data.copy()
+    for entry in spec:
+        for name in entry['outputs']:
+            result[name] = columns[name][inverse]
+    return result
+
+
+class IncrementalIndicators:
+    """
+    Stateful indicator calculator for appending new bars to an existing history.
+
+    For every symbol only the last few rows needed to continue each indicator are
+    kept (the raw inputs plus EMA seeds, RSI average gain/loss, the MACD EMAs and
+    signal, and the cumulative-return product). Appending N rows therefore costs
+    O(N) regardless of history length, and produces exactly the same values as
+    `compute_indicators` over the full history.
+    """
+
+    def __init__(self, spec: List[Dict] = None, group_col: str = 'stock'):
+        self.spec = INDICATOR_SPEC if spec is None else spec
+        self.group_col = group_col
+        self.window = max(lookback(entry) for entry in self.spec) + 1
+        self.counts: Dict = {}
+        self.state = pd.DataFrame()
+
+    def update(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute indicators for new rows and advance the carried-over state.
+
+        Parameters:
+        - data (pd.DataFrame): New rows, each later than the stored rows of its symbol.
+
+        Returns:
+        - pd.DataFrame: A copy of `data` with one column per indicator output.
+        """
+        n_context = len(self.state)
+        symbols = np.concatenate([
+            self.state[self.group_col].to_numpy(dtype=object) if n_context else np.empty(0, dtype=object),
+            data[self.group_col].to_numpy(dtype=object),
+        ])
+        order, starts, lengths, labels = group_segments(pd.Series(symbols, dtype=object))
+        # Stored rows sort ahead of new rows of the same symbol because the sort is stable.
+        context = np.add.reduceat((order < n_context).astype(np.int64), starts) if len(starts) else starts
+        seen = np.array([self.counts.get(label, 0) for label in labels], dtype=np.int64)
+
+        pad = np.full(len(data), np.nan)
+        prior = {key: np.concatenate([self.state[key].to_numpy(dtype=np.float64), pad])[order]
+                 for key in self.state.columns if key != self.group_col}
+        layout = Layout(starts, lengths, base=seen - context, context=context, prior=prior)
+
+        def source(name):
+            if name in prior:
+                values = prior[name].copy()
+                values[layout.is_new] = data[name].to_numpy(dtype=np.float64)[order[layout.is_new] - n_context]
+                return values
+            return data[name].to_numpy(dtype=np.float64)[order]
+
+        columns = evaluate_spec(layout, self.spec, source)
+
+        keep = layout.local >= np.repeat(lengths - self.window, lengths)
+        state = {self.group_col: np.repeat(labels, lengths)[keep]}
+        state.update({key: values[keep] for key, values in columns.items()})
+        self.state = pd.DataFrame(state)
+        self.counts.update(zip(labels, (seen - context + lengths).tolist()))
+
+        new_rows = np.empty(len(data), dtype=np.int64)
+        new_rows[order[layout.is_new] - n_context] = np.flatnonzero(layout.is_new)
+        result = data.copy()
+        for entry in self.spec:
+            for name in entry['outputs']:
+                result[name] = columns[name][new_rows]
+        return result
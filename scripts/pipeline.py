@@ -0,0 +1,317 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+import pandas as pd
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List
+
+try:
+    from scripts.alignment import daily_sentiment
+    from scripts.data_processing import load_data
+    from scripts.fetch_stock_data import fetch_historical_data, local_csv_source, pynance_source
+    from scripts.indicators import compute_indicators
+    from scripts.sentiment_analysis import SentimentAnalyzer, lexicon_version
+    from scripts.sentiment_cache import SentimentCache
+    from scripts.sentiment_store import build_store, daily_aggregates
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    from alignment import daily_sentiment
+    from data_processing import load_data
+    from fetch_stock_data import fetch_historical_data, local_csv_source, pynance_source
+    from indicators import compute_indicators
+    from sentiment_analysis import SentimentAnalyzer, lexicon_version
+    from sentiment_cache import SentimentCache
+    from sentiment_store import build_store, daily_aggregates
+
+DEFAULT_CONFIG = {
+    'raw_prices': 'data/raw/yfinance_data',
+    'news_zip': 'Data/raw_analyst_ratings.csv.zip',
+    'news_file': 'raw_analyst_ratings.csv',
+    'output_dir': 'Data',
+    'start_date': '1980-01-01',
+    'end_date': '2100-01-01',
+    'sentiment_jobs': 1,
+    'sentiment_backend': 'vader',
+    'price_source': 'pynance',
+    'symbols': '',
+    # Current date for the fetch stage, empty for the system date
+    'today': '',
+}
+STATE_FILE = '.pipeline_state.json'
+# Price sources of the fetch stage: 'pynance' downloads the bars (the default of
+# `fetch_historical_data`), 'local' reads the CSV files in 'raw_prices'.
+PRICE_SOURCES: Dict[str, Callable[[Dict], Callable]] = {
+    'pynance': lambda config: pynance_source,
+    'local': lambda config: local_csv_source(config['raw_prices']),
+}
+
+
+def output_path(config: Dict, name: str) -> str:
+    return os.path.join(config['output_dir'], name)
+
+
+def symbols_in(directory: str) -> List[str]:
+    """Symbols with a '<SYMBOL>_historical_data.csv' file in a directory."""
+    suffix = '_historical_data.csv'
+    return sorted(name[:-len(suffix)] for name in os.listdir(directory) if name.endswith(suffix))
+
+
+def replace_atomically(path: str, write: Callable[[str], None]) -> None:
+    """Write a file through a temporary path, so readers never see a partial output."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def fetch_end(config: Dict) -> str:
+    """
+    End date (exclusive) the fetch stage actually requests: 'end_date', but no later
+    than tomorrow. Unlike a far-future 'end_date' it moves every day, so the stage
+    reruns and picks up the new bars.
+    """
+    today = pd.Timestamp(config['today'] or pd.Timestamp.today()).normalize()
+    return min(pd.Timestamp(config['end_date']), today + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+
+
+def run_fetch(config: Dict) -> None:
+    source = config['price_source']
+    if source not in PRICE_SOURCES:
+        raise ValueError(f"price_source must be one of {sorted(PRICE_SOURCES)}.")
+    # 'symbols' is comma-separated; empty means every symbol with a file in 'raw_prices'
+    symbols = [symbol for symbol in config['symbols'].split(',') if symbol] or symbols_in(config['raw_prices'])
+    # Downloads are cached per symbol so reruns only request new dates; local files are re-read whole
+    cache_dir = None if source == 'local' else output_path(config, 'price_cache')
+    data = fetch_historical_data(symbols, config['start_date'], config['fetch_end'],
+                                 source=PRICE_SOURCES[source](config), cache_dir=cache_dir,
+                                 today=config['today'] or None)
+    replace_atomically(output_path(config, 'prices_raw.csv'), data.to_csv)
+
+
+def run_indicators(config: Dict) -> None:
+    prices = pd.read_csv(output_path(config, 'prices_raw.csv'), parse_dates=['Date'])
+    data = compute_indicators(prices)
+    replace_atomically(output_path(config, 'stock_data.csv'), lambda path: data.to_csv(path, index=False))
+
+
+def run_news(config: Dict) -> None:
+    news = load_data(config['news_zip'], config['news_file'], cache_dir=config['output_dir'])
+    replace_atomically(output_path(config, 'news.pkl'), news.to_pickle)
+
+
+def run_sentiment(config: Dict) -> None:
+    news = pd.read_pickle(output_path(config, 'news.pkl'))
+    backend = config['sentiment_backend']
+    cache = SentimentCache(output_path(config, 'sentiment_cache.sqlite'), lexicon_version(backend))
+    try:
+        scores = SentimentAnalyzer.analyze_sentiment(news['headline'], n_jobs=config['sentiment_jobs'], cache=cache,
+                                                     backend=backend)
+    finally:
+        cache.close()
+    scored = pd.concat([news[['date', 'stock']], scores], axis=1)
+    replace_atomically(output_path(config, 'sentiment_analysis.pkl'), scored.to_pickle)
+
+
+def run_align(config: Dict) -> None:
+    scored = pd.read_pickle(output_path(config, 'sentiment_analysis.pkl'))
+    prices = pd.read_csv(output_path(config, 'stock_data.csv'), usecols=['Date', 'stock'], parse_dates=['Date'])
+    daily = daily_sentiment(scored, prices)
+    replace_atomically(output_path(config, 'daily_sentiment.csv'), lambda path: daily.to_csv(path, index=False))
+
+
+def run_store(config: Dict) -> None:
+    scored = pd.read_pickle(output_path(config, 'sentiment_analysis.pkl'))
+    prices = pd.read_csv(output_path(config, 'stock_data.csv'), usecols=['Date', 'stock'], parse_dates=['Date'])
+    build_store(output_path(config, 'sentiment_store'), daily_aggregates(scored, prices))
+
+
+# Every stage: the function that runs it, the files it reads and writes (config
+# keys or output file names) and the settings that change its result.
+# Stages depend on each other through these files; order is only for display.
+# Every output and cache lives under 'output_dir'; inputs are only read.
+STAGES: Dict[str, Dict] = {
+    'fetch': {'run': run_fetch, 'inputs': ['raw_prices'],
+              'params': ['price_source', 'symbols', 'start_date', 'fetch_end'],
+              'outputs': ['prices_raw.csv']},
+    'indicators': {'run': run_indicators, 'inputs': ['prices_raw.csv'], 'params': [],
+                   'outputs': ['stock_data.csv']},
+    'news': {'run': run_news, 'inputs': ['news_zip'], 'params': ['news_file'], 'outputs': ['news.pkl']},
+    'sentiment': {'run': run_sentiment, 'inputs': ['news.pkl'], 'params': ['sentiment_backend'],
+                  'outputs': ['sentiment_analysis.pkl']},
+    'align': {'run': run_align, 'inputs': ['sentiment_analysis.pkl', 'stock_data.csv'], 'params': [],
+              'outputs': ['daily_sentiment.csv']},
+    'store': {'run': run_store, 'inputs': ['sentiment_analysis.pkl', 'stock_data.csv'], 'params': [],
+              'outputs': ['sentiment_store']},
+}
+
+
+def resolve(config: Dict, name: str) -> str:
+    """Path of a stage input or output: a config entry, or a file in the output directory."""
+    return config[name] if name in config else output_path(config, name)
+
+
+def content_hash(path: str) -> str:
+    """
+    blake2b digest of a file, or of every file under a directory (names included).
+    Missing paths hash to an empty string.
+    """
+    if not os.path.exists(path):
+        return ''
+    digest = hashlib.blake2b(digest_size=16)
+    files = [path] if os.path.isfile(path) else sorted(
+        os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+    for file in files:
+        digest.update(os.path.relpath(file, path).encode('utf-8'))
+        with open(file, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def stage_key(config: Dict, name: str) -> str:
+    """Hash of everything a stage's result depends on: its input contents and settings."""
+    stage = STAGES[name]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps({
+        'inputs': {item: content_hash(resolve(config, item)) for item in stage['inputs']},
+        'params': {item: config[item] for item in stage['params']},
+    }, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def dependencies(name: str) -> List[str]:
+    """Stages producing any input of `name`."""
+    inputs = set(STAGES[name]['inputs'])
+    return [other for other, stage in STAGES.items() if inputs & set(stage['outputs'])]
+
+
+def downstream(names: List[str]) -> List[str]:
+    """The given stages and every stage depending on them, directly or not."""
+    selected = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for name in STAGES:
+            if name not in selected and selected & set(dependencies(name)):
+                selected.add(name)
+                changed = True
+    return [name for name in STAGES if name in selected]
+
+
+def is_current(config: Dict, state: Dict, name: str, key: str) -> bool:
+    """Whether a stage's recorded run used the same inputs and its outputs are untouched."""
+    recorded = state.get(name)
+    if not recorded or recorded['key'] != key:
+        return False
+    return all(content_hash(resolve(config, item)) == digest for item, digest in recorded['outputs'].items())
+
+
+def load_state(config: Dict) -> Dict:
+    path = output_path(config, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(config: Dict, state: Dict) -> None:
+    def write(path):
+        with open(path, 'w') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+    replace_atomically(output_path(config, STATE_FILE), write)
+
+
+def run_pipeline(config: Dict = None, only: List[str] = None, start: str = None, force: bool = False,
+                 jobs: int = None, log: Callable[[str], None] = None) -> Dict[str, str]:
+    """
+    Run the pipeline stages, skipping those whose inputs have not changed.
+
+    A stage is run only if the hash of its inputs and settings differs from its
+    last successful run or its outputs were changed since. Stages whose
+    dependencies are satisfied run in parallel worker processes (e.g. price
+    indicators next to news sentiment).
+
+    Parameters:
+    - config (Dict): Paths and settings, merged over DEFAULT_CONFIG.
+    - only (List[str]): Run only these stages (their inputs must already exist).
+    - start (str): Run this stage and everything downstream of it.
+    - force (bool): Run the selected stages even if they are up to date.
+    - jobs (int): Number of worker processes, 1 to run stages in-process, None for
+      one per stage that can run at once.
+    - log (Callable): Called with a line per stage.
+
+    Returns:
+    - Dict[str, str]: 'ran' or 'skipped' for every selected stage.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    config['fetch_end'] = fetch_end(config)
+    selected = list(STAGES)
+    if only:
+        selected = [name for name in STAGES if name in only]
+    elif start:
+        selected = downstream([start])
+    log = log or (lambda line: None)
+    state = load_state(config)
+    status = {}
+    pending = list(selected)
+    running = {}
+    pool = ProcessPoolExecutor(max_workers=jobs or len(STAGES)) if jobs != 1 else None
+
+    def finish(name, key):
+        state[name] = {'key': key, 'outputs': {item: content_hash(resolve(config, item))
+                                               for item in STAGES[name]['outputs']}}
+        save_state(config, state)
+        status[name] = 'ran'
+        log(f'{name}: ran')
+
+    try:
+        while pending or running:
+            busy = {name for name, _ in running.values()}
+            ready = [name for name in pending
+                     if not any(dep in pending or dep in busy for dep in dependencies(name))]
+            for name in ready:
+                pending.remove(name)
+                key = stage_key(config, name)
+                if not force and is_current(config, state, name, key):
+                    status[name] = 'skipped'
+                    log(f'{name}: up to date')
+                elif pool is None:
+                    STAGES[name]['run'](config)
+                    finish(name, key)
+                else:
+                    running[pool.submit(STAGES[name]['run'], config)] = (name, key)
+            if running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, key = running.pop(future)
+                    future.result()
+                    finish(name, key)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return status
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Command line for the pipeline: fetch -> indicators and news -> sentiment -> align and store.
+    """
+    parser = argparse.ArgumentParser(description='Run the data pipeline, skipping stages whose inputs are unchanged.')
+    stages = parser.add_mutually_exclusive_group()
+    stages.add_argument('--only', nargs='+', choices=list(STAGES), help='Run only these stages.')
+    stages.add_argument('--from', dest='start', choices=list(STAGES), help='Run this stage and everything after it.')
+    parser.add_argument('--force', action='store_true', help='Run the selected stages even if up to date.')
+    parser.add_argument('--jobs', type=int, help='Worker processes, 1 to run stages in-process.')
+    for name, default in DEFAULT_CONFIG.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, default=default, type=type(default),
+                            choices=list(PRICE_SOURCES) if name == 'price_source' else None)
+    args = parser.parse_args(argv)
+
+    config = {name: getattr(args, name) for name in DEFAULT_CONFIG}
+    run_pipeline(config, args.only, args.start, args.force, args.jobs, log=print)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import threading
+import tracemalloc
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List
+
+try:
+    import resource
+except ImportError:  # Windows has no getrusage
+    resource = None
+
+# PROFILE_ENV=1 records wall time, rows, peak RSS and allocated blocks of every
+# instrumented call; PROFILE_ENV=memory also traces the peak bytes allocated
+# inside each outermost call (slower). PROFILE_OUTPUT_ENV names a file written at exit:
+# a Chrome trace for '.json', JSON lines otherwise.
+PROFILE_ENV = 'SCRIPTS_PROFILE'
+PROFILE_OUTPUT_ENV = 'SCRIPTS_PROFILE_OUTPUT'
+
+_MODE = os.environ.get(PROFILE_ENV, '').strip().lower()
+ENABLED = _MODE not in ('', '0', 'false', 'off', 'no')
+TRACE_MEMORY = _MODE == 'memory'
+
+_EVENTS: List[Dict] = []
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+_ORIGIN = time.perf_counter()
+
+
+def enable(on: bool = True, memory: bool = False) -> None:
+    """Turn recording on or off at runtime (e.g. from a debug toggle)."""
+    global ENABLED, TRACE_MEMORY
+    ENABLED, TRACE_MEMORY = on, on and memory
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the process so far, in MB (NaN where unavailable)."""
+    if resource is None:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def count_rows(value) -> int:
+    """Rows in a DataFrame, Series, array or list, None for anything else."""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index, np.ndarray, list, tuple)):
+        return len(value)
+    return None
+
+
+class Span:
+    """
+    Timing of one block of code, recorded as an event when it exits.
+    """
+
+    def __init__(self, name: str, rows: int = None):
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        stack = getattr(_LOCAL, 'stack', None)
+        if stack is None:
+            stack = _LOCAL.stack = []
+        self.depth = len(stack)
+        stack.append(self)
+        # Only the outermost span traces allocations: resetting the peak inside a
+        # nested span would lose the enclosing span's peak
+        self.traced = TRACE_MEMORY and not tracemalloc.is_tracing()
+        if self.traced:
+            tracemalloc.start()
+        self.blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        event = {
+            'name': self.name,
+            'start': self.start - _ORIGIN,
+            'seconds': seconds,
+            'rows': self.rows,
+            'rows_per_second': self.rows / seconds if self.rows and seconds > 0 else None,
+            'peak_rss_mb': peak_rss_mb(),
+            'allocated_blocks': sys.getallocatedblocks() - self.blocks,
+            'depth': self.depth,
+            'pid': os.getpid(),
+            'thread': threading.get_ident(),
+            'error': exc_info[0].__name__ if exc_info[0] else None,
+        }
+        if self.traced:
+            event['peak_alloc_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+        _LOCAL.stack.pop()
+        with _LOCK:
+            _EVENTS.append(event)
+        return False
+
+
+class _NullSpan:
+    """Stand-in for `Span` while profiling is off; entering and leaving it does nothing."""
+
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, rows: int = None):
+    """
+    Context manager timing a block as `name`. Set `.rows` on the returned span
+    when the row count is only known inside the block.
+    """
+    return Span(name, rows) if ENABLED else _NULL_SPAN
+
+
+def profiled(func: Callable = None, name: str = None, rows: Callable = None):
+    """
+    Decorator recording every call of a function while profiling is enabled.
+
+    Parameters:
+    - func (Callable): The function, when used as a bare `@profiled`.
+    - name (str): Event name, defaults to 'module.function'.
+    - rows (Callable): Called with the function's arguments to count the rows it
+      processes; defaults to the length of the first DataFrame, Series or array argument.
+
+    Returns:
+    - Callable: The wrapped function, which only checks a flag while profiling is off.
+    """
+    if func is None:
+        return lambda f: profiled(f, name, rows)
+    label = name or f"{func.__module__.split('.')[-1]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not ENABLED:
+            return func(*args, **kwargs)
+        if rows is not None:
+            count = rows(*args, **kwargs)
+        else:
+            count = next((n for n in map(count_rows, list(args) + list(kwargs.values())) if n is not None), None)
+        with Span(label, count):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def events() -> List[Dict]:
+    """Copy of the events recorded so far, in completion order."""
+    with _LOCK:
+        return list(_EVENTS)
+
+
+def clear() -> None:
+    """Forget all recorded events."""
+    with _LOCK:
+        _EVENTS.clear()
+
+
+def summary(recorded: List[Dict] = None) -> pd.DataFrame:
+    """
+    Events aggregated per name: calls, total and mean seconds, rows, throughput,
+    allocated blocks and the highest peak RSS, slowest first.
+    """
+    frame = pd.DataFrame(events() if recorded is None else recorded,
+                         columns=['name', 'seconds', 'rows', 'peak_rss_mb', 'allocated_blocks'])
+    frame['rows'] = pd.to_numeric(frame['rows'])
+    grouped = frame.groupby('name').agg(calls=('seconds', 'size'), seconds=('seconds', 'sum'),
+                                        rows=('rows', 'sum'), allocated_blocks=('allocated_blocks', 'sum'),
+                                        peak_rss_mb=('peak_rss_mb', 'max'))
+    grouped.insert(2, 'mean_seconds', grouped['seconds'] / grouped['calls'])
+    grouped.insert(4, 'rows_per_second', (grouped['rows'] / grouped['seconds']).where(grouped['rows'] > 0))
+    return grouped.sort_values('seconds', ascending=False)
+
+
+def write_jsonl(path: str, recorded: List[Dict] = None) -> None:
+    """Write one JSON object per event."""
+    with open(path, 'w') as f:
+        for event in events() if recorded is None else recorded:
+            f.write(json.dumps(event) + '\n')
+
+
+def chrome_trace(recorded: List[Dict] = None) -> Dict:
+    """Events as complete ('X') events of the Chrome trace format (chrome://tracing, Perfetto)."""
+    trace = []
+    for event in events() if recorded is None else recorded:
+        args = {key: value for key, value in event.items()
+                if key not in ('name', 'start', 'seconds', 'pid', 'thread') and value is not None}
+        trace.append({'name': event['name'], 'ph': 'X', 'ts': event['start'] * 1e6, 'dur': event['seconds'] * 1e6,
+                      'pid': event['pid'], 'tid': event['thread'], 'args': args})
+    return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+
+def write_chrome_trace(path: str, recorded: List[Dict] = None) -> None:
+    """Write the events as a Chrome trace file."""
+    with open(path, 'w') as f:
+        json.dump(chrome_trace(recorded), f)
+
+
+def export(path: str, recorded: List[Dict] = None) -> None:
+    """Write the events to `path`: a Chrome trace for '.json', JSON lines otherwise."""
+    if path.endswith('.json'):
+        write_chrome_trace(path, recorded)
+    else:
+        write_jsonl(path, recorded)
+
+
+if ENABLED and os.environ.get(PROFILE_OUTPUT_ENV):
+    atexit.register(lambda: export(os.environ[PROFILE_OUTPUT_ENV]))
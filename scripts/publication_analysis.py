@@ -1,10 +1,166 @@
 # src/publication_analysis.py
 
+import os
+import hashlib
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from typing import Tuple
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Tuple
 import statsmodels.api as sm
 
+try:
+    from scripts.data_processing import iter_csv_from_zip
+    from scripts.descriptive_analysis import wall_clock_nanoseconds
+    from scripts.indicators import group_segments
+    from scripts.profiling import profiled
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    from data_processing import iter_csv_from_zip
+    from descriptive_analysis import wall_clock_nanoseconds
+    from indicators import group_segments
+    from profiling import profiled
+
+GRANULARITIES = ('day', 'week', 'month', 'quarter', 'year')
+NS_PER_DAY = 86_400_000_000_000
+COMPONENTS = ['trend', 'seasonal', 'resid']
+
+# Decomposed components by hash of (values, period, model), shared by every series
+# with the same content whichever group it belongs to; least recently used first.
+DECOMPOSITION_CACHE_SIZE = 256
+_DECOMPOSITION_CACHE: 'OrderedDict[bytes, np.ndarray]' = OrderedDict()
+
+
+def civil_from_days(days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calendar year and month (1-12) of day numbers counted from 1970-01-01.
+
+    Integer-only conversion of the proleptic Gregorian calendar (H. Hinnant's
+    `civil_from_days`), vectorized over numpy arrays.
+    """
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month
+
+
+def period_keys(nanoseconds: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Integer bin of every timestamp at each granularity.
+
+    Days count from 1970-01-01, weeks start on Monday, and months, quarters and
+    years are numbered from year 0.
+    """
+    days = nanoseconds // NS_PER_DAY
+    year, month = civil_from_days(days)
+    return {
+        'day': days,
+        # 1970-01-01 was a Thursday, so Monday-based weeks start 3 days earlier
+        'week': (days + 3) // 7,
+        'month': year * 12 + month - 1,
+        'quarter': year * 4 + (month - 1) // 3,
+        'year': year,
+    }
+
+
+def period_starts(granularity: str, keys: np.ndarray) -> np.ndarray:
+    """
+    First day of each bin from `period_keys`, as datetime64[ns].
+    """
+    if granularity == 'day':
+        starts = keys.astype('datetime64[D]')
+    elif granularity == 'week':
+        starts = (keys * 7 - 3).astype('datetime64[D]')
+    else:
+        months_per_bin = {'month': 1, 'quarter': 3, 'year': 12}[granularity]
+        starts = (keys * months_per_bin - 1970 * 12).astype('datetime64[M]')
+    return starts.astype('datetime64[ns]')
+
+
+class TrendAggregator:
+    """
+    Article counts per day, week, month, quarter and year, accumulated chunk by chunk.
+
+    Each chunk of dates is binned with integer arithmetic on int64 nanoseconds,
+    so the whole file never has to be in memory and no Period objects are built.
+    """
+
+    def __init__(self, granularities: Iterable[str] = GRANULARITIES):
+        self.counts = {granularity: Counter() for granularity in granularities}
+
+    @profiled
+    def update(self, dates: pd.Series) -> None:
+        """
+        Add a chunk of publication dates (NaT is ignored).
+        """
+        nanoseconds = wall_clock_nanoseconds(dates)
+        nanoseconds = nanoseconds[nanoseconds != np.iinfo(np.int64).min]
+        for granularity, keys in period_keys(nanoseconds).items():
+            if granularity in self.counts and len(keys):
+                low = keys.min()
+                counts = np.bincount(keys - low)
+                bins = np.flatnonzero(counts)
+                self.counts[granularity].update(dict(zip((bins + low).tolist(), counts[bins].tolist())))
+
+    def trend(self, granularity: str) -> pd.DataFrame:
+        """
+        Article counts at one granularity.
+
+        Returns:
+        - pd.DataFrame: 'date' (start of each period) and 'no_of_articles' columns, in date order.
+        """
+        counter = self.counts[granularity]
+        keys = np.array(sorted(counter), dtype=np.int64)
+        return pd.DataFrame({
+            'date': period_starts(granularity, keys),
+            'no_of_articles': np.array([counter[key] for key in keys.tolist()], dtype=np.int64),
+        })
+
+    def trends(self) -> Dict[str, pd.DataFrame]:
+        """
+        Article counts at every granularity, keyed by granularity.
+        """
+        return {granularity: self.trend(granularity) for granularity in self.counts}
+
+
+@profiled
+def publication_trends(chunks: Iterable[pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Publication trends at every granularity from one pass over chunks of news data.
+
+    Parameters:
+    - chunks (Iterable[pd.DataFrame]): Chunks with a datetime 'date' column.
+
+    Returns:
+    - Dict[str, pd.DataFrame]: Counts per 'day', 'week', 'month', 'quarter' and 'year'.
+    """
+    aggregator = TrendAggregator()
+    for chunk in chunks:
+        aggregator.update(chunk['date'])
+    return aggregator.trends()
+
+
+def publication_trends_from_zip(zip_path: str, filename: str, chunksize: int = 100_000) -> Dict[str, pd.DataFrame]:
+    """
+    Publication trends of a news CSV inside a zip file, read in chunks.
+
+    Parameters:
+    - zip_path (str): The path to the zip file.
+    - filename (str): The name of the news CSV member.
+    - chunksize (int): Number of rows held in memory at a time.
+
+    Returns:
+    - Dict[str, pd.DataFrame]: Counts per 'day', 'week', 'month', 'quarter' and 'year'.
+    """
+    return publication_trends(iter_csv_from_zip(zip_path, filename, chunksize))
+
+
+@profiled
 def analyze_annual_trends(data: pd.DataFrame) -> pd.DataFrame:
     """
     Analyze annual publication trends.
@@ -15,12 +171,11 @@ def analyze_annual_trends(data: pd.DataFrame) -> pd.DataFrame:
     Returns:
     - pd.DataFrame: DataFrame for annual article counts.
     """
-    # Group by year and count articles
-    annual_counts = data.groupby(data['date'].dt.to_period('Y')).size().reset_index(name='no_of_articles')
-    annual_counts['date'] = annual_counts['date'].dt.to_timestamp()
-    
-    return annual_counts
+    aggregator = TrendAggregator(['year'])
+    aggregator.update(data['date'])
+    return aggregator.trend('year')
 
+@profiled
 def analyze_quarterly_trends(data: pd.DataFrame) -> pd.DataFrame:
     """
     Analyze quarterly publication trends.
@@ -31,11 +186,9 @@ def analyze_quarterly_trends(data: pd.DataFrame) -> pd.DataFrame:
     Returns:
     - pd.DataFrame: DataFrame for quarterly article counts.
     """
-    # Group by quarter and count articles
-    quarterly_counts = data.groupby(data['date'].dt.to_period('Q')).size().reset_index(name='no_of_articles')
-    quarterly_counts['date'] = quarterly_counts['date'].dt.to_timestamp()
-    
-    return quarterly_counts
+    aggregator = TrendAggregator(['quarter'])
+    aggregator.update(data['date'])
+    return aggregator.trend('quarter')
 
 def plot_long_term_trends(annual_counts: pd.DataFrame, quarterly_counts: pd.DataFrame) -> None:
     """
@@ -63,6 +216,7 @@ def plot_long_term_trends(annual_counts: pd.DataFrame, quarterly_counts: pd.Data
 
 
 
+@profiled
 def decompose_time_series(data: pd.DataFrame, frequency: int) -> None:
     """
     Decompose the time series into trend, seasonality, and residual components.
@@ -74,7 +228,99 @@ def decompose_time_series(data: pd.DataFrame, frequency: int) -> None:
     Returns:
     - None: Plots the decomposition.
     """
-    data.set_index('date', inplace=True)
+    series = data.set_index('date')['no_of_articles']
     
-    decomposed = sm.tsa.seasonal_decompose(data['no_of_articles'], model='additive', period=frequency)
-    return decomposed
\ No newline at end of file
+    decomposed = sm.tsa.seasonal_decompose(series, model='additive', period=frequency)
+    return decomposed
+
+
+def decompose_values(job: Tuple[np.ndarray, int, str]) -> np.ndarray:
+    """
+    Seasonal decomposition of one series of values.
+
+    Parameters:
+    - job (Tuple[np.ndarray, int, str]): The values, the seasonal period and the model.
+
+    Returns:
+    - np.ndarray: Trend, seasonal and residual components, shape (3, len(values)).
+    """
+    values, period, model = job
+    decomposed = sm.tsa.seasonal_decompose(values, model=model, period=period)
+    return np.vstack([decomposed.trend, decomposed.seasonal, decomposed.resid])
+
+
+def series_key(values: np.ndarray, period: int, model: str) -> bytes:
+    """
+    Cache key of a decomposition: a hash of the values and the parameters.
+    """
+    digest = hashlib.blake2b(np.ascontiguousarray(values, dtype=np.float64).tobytes(), digest_size=16)
+    digest.update(f'{period}:{model}'.encode('utf-8'))
+    return digest.digest()
+
+
+@profiled
+def decompose_many(data: pd.DataFrame, period: int, group_col: str = 'publisher', date_col: str = 'date',
+                   value_col: str = 'no_of_articles', model: str = 'additive', n_jobs: int = None) -> pd.DataFrame:
+    """
+    Seasonal decomposition of many series of a long-format frame in one call.
+
+    Series are decomposed in parallel worker processes and the input is left
+    unchanged. Series shorter than two full periods, or with missing values,
+    cannot be decomposed and are skipped; their labels are listed in
+    `result.attrs['skipped']`. Results are cached by a hash of each series, so
+    repeated calls only decompose series whose values changed.
+
+    Parameters:
+    - data (pd.DataFrame): Long-format data with group, date and value columns.
+    - period (int): Seasonal period in rows.
+    - group_col (str): Column naming the series (e.g. 'publisher' or 'stock').
+    - date_col (str): Column ordering the rows of each series.
+    - value_col (str): Column to decompose.
+    - model (str): 'additive' or 'multiplicative'.
+    - n_jobs (int): Number of worker processes, 1 to run in-process, None for all cores.
+
+    Returns:
+    - pd.DataFrame: One row per input row of a decomposed series, with the group,
+      date, 'observed', 'trend', 'seasonal' and 'resid' columns.
+    """
+    data = data.sort_values(date_col, kind='stable')
+    order, starts, lengths, labels = group_segments(data[group_col])
+    values = data[value_col].to_numpy(dtype=np.float64)[order]
+    usable = [i for i in range(len(labels))
+              if lengths[i] >= 2 * period and not np.isnan(values[starts[i]:starts[i] + lengths[i]]).any()]
+
+    keys = {i: series_key(values[starts[i]:starts[i] + lengths[i]], period, model) for i in usable}
+    found = {}
+    for key in dict.fromkeys(keys.values()):
+        if key in _DECOMPOSITION_CACHE:
+            _DECOMPOSITION_CACHE.move_to_end(key)
+            found[key] = _DECOMPOSITION_CACHE[key]
+    missing = [key for key in dict.fromkeys(keys.values()) if key not in found]
+    if missing:
+        first = {}
+        for i, key in keys.items():
+            first.setdefault(key, i)
+        jobs = [(values[starts[first[key]]:starts[first[key]] + lengths[first[key]]], period, model)
+                for key in missing]
+        n_jobs = n_jobs or os.cpu_count()
+        if n_jobs > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(jobs))) as pool:
+                results = list(pool.map(decompose_values, jobs, chunksize=max(1, len(jobs) // (4 * n_jobs))))
+        else:
+            results = list(map(decompose_values, jobs))
+        found.update(zip(missing, results))
+        _DECOMPOSITION_CACHE.update(zip(missing, results))
+        while len(_DECOMPOSITION_CACHE) > DECOMPOSITION_CACHE_SIZE:
+            _DECOMPOSITION_CACHE.popitem(last=False)
+
+    positions = np.concatenate([np.arange(starts[i], starts[i] + lengths[i]) for i in usable] + [np.arange(0)])
+    components = np.hstack([found[keys[i]] for i in usable] + [np.empty((len(COMPONENTS), 0))])
+    rows = order[positions]
+    result = pd.DataFrame({
+        group_col: data[group_col].iloc[rows].to_numpy(),
+        date_col: data[date_col].iloc[rows].to_numpy(),
+        'observed': values[positions],
+        **dict(zip(COMPONENTS, components)),
+    })
+    result.attrs['skipped'] = [labels[i] for i in sorted(set(range(len(labels))) - set(usable))]
+    return result
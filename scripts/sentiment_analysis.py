@@ -1,36 +1,373 @@
+import os
+import sys
+import hashlib
+import argparse
+import numpy as np
 import pandas as pd
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from collections import Counter
+from collections import Counter, deque
 import string
 import re
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-from typing import Tuple, List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Tuple, List, Dict
 
-# Ensure you have the required nltk resources
-nltk.download('punkt_tab')
-nltk.download('stopwords')
-nltk.download('vader_lexicon')
+try:
+    from scripts.profiling import profiled
+    from scripts.sentiment_cache import SentimentCache, normalize_headline
+    from scripts.sketches import StreamingTopK
+    from scripts.vader_table import LexiconTable, polarity_table
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    from profiling import profiled
+    from sentiment_cache import SentimentCache, normalize_headline
+    from sketches import StreamingTopK
+    from vader_table import LexiconTable, polarity_table
+
+# NLTK resources used by this module and where nltk.data finds them. They are
+# resolved on first use (nltk itself is slow to import), not at import time.
+NLTK_RESOURCES = {
+    'punkt_tab': 'tokenizers/punkt_tab/english/',
+    'stopwords': 'corpora/stopwords',
+    'vader_lexicon': 'sentiment/vader_lexicon.zip',
+}
+
+_resolved_resources = set()
+
+def ensure_nltk_resource(name: str) -> None:
+    """
+    Make sure an NLTK resource is available, downloading it only if it is missing.
+
+    Parameters:
+    - name (str): Key of NLTK_RESOURCES.
+
+    Raises:
+    - LookupError: If the resource is missing and cannot be downloaded (e.g. offline).
+    """
+    if name in _resolved_resources:
+        return
+    import nltk
+    try:
+        nltk.data.find(NLTK_RESOURCES[name])
+    except LookupError:
+        if not nltk.download(name, quiet=True):
+            raise LookupError(
+                f"NLTK resource '{name}' is missing and could not be downloaded. "
+                f"Install an offline bundle with: python scripts/sentiment_analysis.py bundle <dir>"
+            )
+    _resolved_resources.add(name)
+
+def verify_nltk_resources() -> Dict[str, bool]:
+    """
+    Check, without downloading, which NLTK resources can be found locally.
+
+    Returns:
+    - Dict[str, bool]: Availability of every resource in NLTK_RESOURCES.
+    """
+    import nltk
+    available = {}
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+            available[name] = True
+        except LookupError:
+            available[name] = False
+    return available
+
+def bundle_nltk_resources(download_dir: str) -> Dict[str, bool]:
+    """
+    Download every NLTK resource into a directory that can be shipped to offline
+    machines and pointed to with the NLTK_DATA environment variable.
+
+    Parameters:
+    - download_dir (str): Target directory.
+
+    Returns:
+    - Dict[str, bool]: Whether each resource was downloaded.
+    """
+    import nltk
+    return {name: bool(nltk.download(name, download_dir=download_dir, quiet=True)) for name in NLTK_RESOURCES}
+
+SCORE_COLUMNS = ['neg', 'neu', 'pos', 'compound']
+
+# Text cleanup tables shared by every headline
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+NON_ALPHA = re.compile(r'[^a-z\s]')
+# Words that word_tokenize splits in text that only contains [a-z\s]
+# (the MacIntyre contractions of NLTK's Treebank tokenizer)
+CONTRACTION_SPLITS = {
+    'cannot': ['can', 'not'],
+    'gimme': ['gim', 'me'],
+    'gonna': ['gon', 'na'],
+    'gotta': ['got', 'ta'],
+    'lemme': ['lem', 'me'],
+    'wanna': ['wan', 'na'],
+}
+
+# English stopwords, loaded once per process
+_stop_words = None
+
+def get_stop_words() -> frozenset:
+    """
+    Return the NLTK English stopword set, loading it on first use.
+    """
+    global _stop_words
+    if _stop_words is None:
+        ensure_nltk_resource('stopwords')
+        from nltk.corpus import stopwords
+        _stop_words = frozenset(stopwords.words('english'))
+    return _stop_words
+
+def tokenize_headlines(headlines: pd.Series) -> pd.Series:
+    """
+    Clean and tokenize a chunk of headlines with vectorized string operations.
+
+    Produces the same tokens as `SentimentAnalyzer.preprocess_text` (lowercase,
+    letters only, word_tokenize contractions, no stopwords), one token per row.
+    Missing headlines are skipped.
+
+    Parameters:
+    - headlines (pd.Series): Headline strings.
+
+    Returns:
+    - pd.Series: The keywords in corpus order.
+    """
+    cleaned = headlines.astype(object).str.lower().str.replace(NON_ALPHA, '', regex=True)
+    tokens = cleaned.str.split().explode().dropna().reset_index(drop=True)
+    contracted = tokens.isin(CONTRACTION_SPLITS.keys())
+    if contracted.any():
+        tokens = tokens.where(~contracted, tokens[contracted].map(CONTRACTION_SPLITS)).explode()
+    return tokens[~tokens.isin(get_stop_words())]
+
+def count_keywords(headlines: List[str]) -> Counter:
+    """
+    Count keywords in one chunk of headlines, in order of first occurrence.
+    """
+    codes, uniques = pd.factorize(tokenize_headlines(pd.Series(headlines, dtype=object)))
+    return Counter(dict(zip(uniques, np.bincount(codes, minlength=len(uniques)).tolist())))
+
+def bounded_map(func, items: Iterable, pool: ProcessPoolExecutor = None, window: int = 2) -> Iterable:
+    """
+    Yield `func(item)` for every item in order, optionally computed in a process pool.
+
+    Unlike `Executor.map`, which submits the whole input up front, at most `window`
+    items are in flight: the input is read lazily and the next item is submitted only
+    once the oldest result has been taken, so memory stays bounded by the window.
+    """
+    if pool is None:
+        yield from map(func, items)
+        return
+    pending = deque()
+    try:
+        for item in items:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(pool.submit(func, item))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+def partial_keyword_counts(chunks: Iterable[pd.Series], n_jobs: int = 1) -> Iterable[Counter]:
+    """
+    Yield one keyword Counter per chunk, in chunk order, optionally counted in a process pool.
+    """
+    batches = (chunk.tolist() for chunk in chunks)
+    n_jobs = n_jobs or os.cpu_count()
+    pool = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+    try:
+        yield from bounded_map(count_keywords, batches, pool, window=2 * n_jobs)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+def keyword_counter(chunks: Iterable[pd.Series], n_jobs: int = 1) -> Counter:
+    """
+    Count keywords over a stream of headline chunks, e.g. from `iter_csv_from_zip`.
+
+    Each chunk is counted on its own (optionally in a process pool) and the
+    partial counters are merged in chunk order, so memory is bounded by the
+    chunk size and the vocabulary, never by the corpus.
+
+    Parameters:
+    - chunks (Iterable[pd.Series]): Chunks of headline strings.
+    - n_jobs (int): Number of worker processes, 1 to count in-process, None for all cores.
+
+    Returns:
+    - Counter: Keyword frequencies.
+    """
+    word_freq = Counter()
+    for partial in partial_keyword_counts(chunks, n_jobs):
+        word_freq.update(partial)
+    return word_freq
+
+def keyword_sketch(chunks: Iterable[pd.Series], n_jobs: int = 1, capacity: int = 1000,
+                   epsilon: float = 1e-4, delta: float = 1e-3) -> StreamingTopK:
+    """
+    Approximate keyword counts over a stream of headline chunks in constant memory.
+
+    Parameters:
+    - chunks (Iterable[pd.Series]): Chunks of headline strings.
+    - n_jobs (int): Number of worker processes, 1 to count in-process, None for all cores.
+    - capacity (int): Number of heavy-hitter candidates kept.
+    - epsilon (float): Maximum overcount as a fraction of all keywords seen.
+    - delta (float): Probability of exceeding that bound.
+
+    Returns:
+    - StreamingTopK: A mergeable, serializable heavy-hitters sketch.
+    """
+    topk = StreamingTopK(capacity, epsilon, delta)
+    for partial in partial_keyword_counts(chunks, n_jobs):
+        topk.update(list(partial), list(partial.values()))
+    return topk
+
+# One VADER analyzer per process, built on first use
+_analyzer = None
+
+def get_analyzer():
+    """
+    Return this process's shared VADER SentimentIntensityAnalyzer, creating it on first use.
+    """
+    global _analyzer
+    if _analyzer is None:
+        ensure_nltk_resource('vader_lexicon')
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+def score_headlines(headlines: List[str]) -> np.ndarray:
+    """
+    Score a batch of headlines with VADER.
+
+    Parameters:
+    - headlines (List[str]): Headline strings.
+
+    Returns:
+    - np.ndarray: Array of shape (len(headlines), 4) with neg, neu, pos and compound scores.
+    """
+    sia = get_analyzer()
+    scores = np.empty((len(headlines), len(SCORE_COLUMNS)), dtype=np.float64)
+    for row, headline in enumerate(headlines):
+        result = sia.polarity_scores(headline)
+        scores[row] = [result[column] for column in SCORE_COLUMNS]
+    return scores
+
+# The VADER lexicon as arrays over the vocabulary seen so far, one per process
+_table = None
+
+def get_table() -> LexiconTable:
+    """
+    Return this process's shared LexiconTable, built from the VADER analyzer on first use.
+    """
+    global _table
+    if _table is None:
+        sia = get_analyzer()
+        _table = LexiconTable(sia.lexicon, sia.constants)
+    return _table
+
+def score_headlines_table(headlines: List[str]) -> np.ndarray:
+    """
+    Score a batch of headlines with the vectorized VADER rules of `vader_table`.
+
+    Parameters:
+    - headlines (List[str]): Headline strings.
+
+    Returns:
+    - np.ndarray: Array of shape (len(headlines), 4) with neg, neu, pos and compound scores.
+    """
+    return polarity_table(headlines, get_table())
+
+# Scoring backends: 'vader' runs polarity_scores per headline, 'table' scores whole
+# batches with array operations (same scores up to the last rounded digit).
+SCORERS = {'vader': score_headlines, 'table': score_headlines_table}
+
+@profiled
+def score_in_batches(texts: List[str], n_jobs: int = 1, chunksize: int = 20_000,
+                     backend: str = 'vader') -> np.ndarray:
+    """
+    Score headlines in batches, optionally spread over a process pool.
+
+    Parameters:
+    - texts (List[str]): Headline strings.
+    - n_jobs (int): Number of worker processes, 1 to score in-process, None for all cores.
+    - chunksize (int): Number of headlines per batch.
+    - backend (str): Key of SCORERS.
+
+    Returns:
+    - np.ndarray: Array of shape (len(texts), 4) with neg, neu, pos and compound scores.
+    """
+    if backend not in SCORERS:
+        raise ValueError(f"backend must be one of {sorted(SCORERS)}.")
+    scorer = SCORERS[backend]
+    scores = np.empty((len(texts), len(SCORE_COLUMNS)), dtype=np.float64)
+    bounds = range(0, len(texts), chunksize)
+    batches = (texts[start:start + chunksize] for start in bounds)
+    n_jobs = n_jobs or os.cpu_count()
+    pool = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 and len(texts) > chunksize else None
+    try:
+        results = bounded_map(scorer, batches, pool, window=2 * n_jobs)
+        for start, batch_scores in zip(bounds, results):
+            scores[start:start + len(batch_scores)] = batch_scores
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+    return scores
+
+# Fingerprint of the lexicon, cached per process
+_lexicon_digest = None
+
+def lexicon_version(backend: str = 'vader') -> str:
+    """
+    Fingerprint of the scoring backend, VADER lexicon and NLTK version, used to key cached scores.
+    """
+    global _lexicon_digest
+    if _lexicon_digest is None:
+        import nltk
+        digest = hashlib.sha1(nltk.__version__.encode('utf-8'))
+        digest.update(repr(sorted(get_analyzer().lexicon.items())).encode('utf-8'))
+        _lexicon_digest = digest.hexdigest()[:16]
+    return f'{backend}-{_lexicon_digest}'
 
 class SentimentAnalyzer:
     
     @staticmethod
-    def analyze_sentiment(headlines: pd.Series) -> pd.DataFrame:
+    @profiled
+    def analyze_sentiment(headlines: pd.Series, n_jobs: int = 1, chunksize: int = 20_000,
+                          cache: SentimentCache = None, backend: str = 'vader') -> pd.DataFrame:
         """
         Analyze sentiment of headlines using VADER.
 
+        Repeated headlines are scored once. With a `SentimentCache`, previously
+        scored headlines are looked up in bulk and only the misses are scored.
+        Misses are scored in batches by one reused analyzer per worker; with
+        `n_jobs` other than 1 the batches are spread over a process pool.
+
         Parameters:
         - headlines (pd.Series): Series of headline strings.
+        - n_jobs (int): Number of worker processes, 1 to score in-process, None for all cores.
+        - chunksize (int): Number of headlines per batch.
+        - cache (SentimentCache): Optional persistent score cache, e.g. versioned with
+          `lexicon_version(backend)`; its keys always include the backend, so scores
+          of one backend are never served for another.
+        - backend (str): 'vader' to score one headline at a time with NLTK's analyzer,
+          'table' to score whole batches with array operations (much faster).
 
         Returns:
         - pd.DataFrame: DataFrame with original headlines and their sentiment scores.
         """
-        sia = SentimentIntensityAnalyzer()
-        sentiments = headlines.apply(lambda x: sia.polarity_scores(x))
-        sentiment_df = pd.DataFrame(sentiments.tolist())
+        normalized = [normalize_headline(text) if isinstance(text, str) else text for text in headlines.tolist()]
+        codes, uniques = pd.factorize(pd.Series(normalized, dtype=object), use_na_sentinel=False)
+        unique_texts = list(uniques)
+        unique_scores = np.empty((len(unique_texts), len(SCORE_COLUMNS)), dtype=np.float64)
+        missing = np.arange(len(unique_texts))
+        if cache is not None:
+            keys = cache.keys(unique_texts, backend)
+            cached, found = cache.lookup(keys)
+            unique_scores[found] = cached[found]
+            missing = np.flatnonzero(~found)
+        unique_scores[missing] = score_in_batches([unique_texts[i] for i in missing], n_jobs, chunksize, backend)
+        if cache is not None:
+            cache.store([keys[i] for i in missing], unique_scores[missing])
+
+        sentiment_df = pd.DataFrame(unique_scores[codes], columns=SCORE_COLUMNS, index=headlines.index)
         sentiment_df = pd.concat([headlines, sentiment_df], axis=1)
         return sentiment_df
 
@@ -53,6 +390,7 @@ class SentimentAnalyzer:
             return 'Neutral'
 
     @staticmethod
+    @profiled
     def apply_sentiment_categories(data: pd.DataFrame) -> pd.DataFrame:
         """
         Apply sentiment categories to the DataFrame.
@@ -78,28 +416,41 @@ class SentimentAnalyzer:
         - str: The cleaned and preprocessed text.
         """
         text = text.lower()
-        text = text.translate(str.maketrans('', '', string.punctuation))
-        text = re.sub(r'[^a-z\s]', '', text)
+        text = text.translate(PUNCTUATION_TABLE)
+        text = NON_ALPHA.sub('', text)
+        ensure_nltk_resource('punkt_tab')
+        from nltk.tokenize import word_tokenize
         words = word_tokenize(text)
-        stop_words = set(stopwords.words('english'))
+        stop_words = get_stop_words()
         words = [word for word in words if word not in stop_words]
         return ' '.join(words)
 
     @staticmethod
-    def get_common_keywords(headlines: pd.Series, top_n: int = 20) -> List[Tuple[str, int]]:
+    @profiled
+    def get_common_keywords(headlines: pd.Series, top_n: int = 20, chunksize: int = 100_000,
+                            n_jobs: int = 1, approximate: bool = False) -> List[Tuple[str, int]]:
         """
         Identify the most common keywords in the headlines.
+
+        Headlines are tokenized chunk by chunk with vectorized string operations and
+        the partial counts merged, so the joined corpus is never built. With
+        `approximate=True` the counts come from a count-min/heavy-hitters sketch
+        (see `keyword_sketch`), using constant memory regardless of vocabulary size.
         
         Parameters:
         - headlines (pd.Series): The series of headlines to analyze.
         - top_n (int): The number of top keywords to return.
+        - chunksize (int): Number of headlines per chunk.
+        - n_jobs (int): Number of worker processes, 1 to count in-process, None for all cores.
+        - approximate (bool): Estimate the counts with a sketch instead of counting exactly.
         
         Returns:
         - List[Tuple[str, int]]: A list of tuples with the top keywords and their counts.
         """
-        cleaned_headlines = headlines.apply(SentimentAnalyzer.preprocess_text)
-        all_words = ' '.join(cleaned_headlines).split()
-        word_freq = Counter(all_words)
+        chunks = (headlines.iloc[start:start + chunksize] for start in range(0, len(headlines), chunksize))
+        if approximate:
+            return keyword_sketch(chunks, n_jobs, capacity=max(1000, 10 * top_n)).top(top_n)
+        word_freq = keyword_counter(chunks, n_jobs)
         return word_freq.most_common(top_n)
 
     @staticmethod
@@ -110,6 +461,8 @@ class SentimentAnalyzer:
         Parameters:
         - word_freq (Counter): A counter object containing word frequencies.
         """
+        from wordcloud import WordCloud
+        import matplotlib.pyplot as plt
         wordcloud = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(word_freq)
         plt.figure(figsize=(10, 8))
         plt.imshow(wordcloud, interpolation='bilinear')
@@ -117,6 +470,48 @@ class SentimentAnalyzer:
         plt.title('Most Common Words in Headlines')
         plt.show()
 
+    @staticmethod
+    @profiled
+    def plot_sentiment(daily, stock: str):
+        """
+        Plot a symbol's daily mean compound score above its Positive/Neutral/Negative headline mix.
+
+        Parameters:
+        - daily (pd.DataFrame or str): The symbol's rows of the daily sentiment store
+          (see `sentiment_store.load_symbol`), or the store directory to read them from.
+        - stock (str): The symbol to plot.
+
+        Returns:
+        - matplotlib.figure.Figure: The figure.
+        """
+        import matplotlib.pyplot as plt
+        try:
+            from scripts.sentiment_store import CATEGORIES, load_symbol
+            from scripts.stock_analysis import plot_line
+        except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+            from sentiment_store import CATEGORIES, load_symbol
+            from stock_analysis import plot_line
+        if isinstance(daily, str):
+            daily = load_symbol(daily, stock)
+
+        fig, (score_ax, mix_ax) = plt.subplots(2, 1, figsize=(14, 7), sharex=True,
+                                               gridspec_kw={'height_ratios': [2, 1]})
+        if len(daily):
+            plot_line(score_ax, daily, 'compound', label='Mean Compound Score', color='tab:blue')
+            mix_ax.stackplot(daily.index, *(daily[category] for category in CATEGORIES), labels=CATEGORIES,
+                             colors=['tab:green', 'tab:gray', 'tab:red'], step='mid')
+            mix_ax.legend(loc='upper left')
+        score_ax.axhline(0.05, color='green', linestyle='--', label='Positive (0.05)')
+        score_ax.axhline(-0.05, color='red', linestyle='--', label='Negative (-0.05)')
+        score_ax.set_title(f'Daily Sentiment for {stock}')
+        score_ax.set_ylabel('Compound Score')
+        score_ax.legend()
+        score_ax.grid()
+        mix_ax.set_xlabel('Date')
+        mix_ax.set_ylabel('Headlines')
+        mix_ax.grid()
+        return fig
+
     @staticmethod
     def perform_nlp_analysis(headlines: pd.Series) -> None:
         """
@@ -131,4 +526,29 @@ class SentimentAnalyzer:
             print(f'{word}: {freq}')
         
         word_freq = Counter(dict(common_keywords))
-        SentimentAnalyzer.plot_wordcloud(word_freq)
\ No newline at end of file
+        SentimentAnalyzer.plot_wordcloud(word_freq)
+
+def main(argv: List[str] = None) -> int:
+    """
+    Command line for managing the NLTK resources needed by this module.
+
+    `verify` reports which resources are available locally (exit code 1 if any are
+    missing); `bundle <dir>` downloads them all into a directory for offline use.
+    """
+    parser = argparse.ArgumentParser(description='Manage NLTK resources for sentiment analysis.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('verify', help='Check that all NLTK resources are available locally.')
+    bundle = commands.add_parser('bundle', help='Download all NLTK resources into a directory.')
+    bundle.add_argument('download_dir')
+    args = parser.parse_args(argv)
+
+    if args.command == 'verify':
+        status = verify_nltk_resources()
+    else:
+        status = bundle_nltk_resources(args.download_dir)
+    for name, ok in status.items():
+        print(f"{name}: {'ok' if ok else 'missing'}")
+    return 0 if all(status.values()) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
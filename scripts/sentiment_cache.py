@@ -0,0 +1,109 @@
+import sqlite3
+import hashlib
+import numpy as np
+from typing import List, Tuple
+
+
+def normalize_headline(headline: str) -> str:
+    """
+    Collapse runs of whitespace and trim the ends.
+
+    VADER tokenizes on whitespace and keeps case and punctuation (both affect
+    the score), so this is the only normalization that cannot change a score.
+    """
+    return ' '.join(headline.split())
+
+
+class SentimentCache:
+    """
+    Persistent, content-addressed store of sentiment scores in SQLite.
+
+    Scores are keyed by a hash of the normalized headline together with the
+    lexicon version and the scorer, so a new lexicon or another scoring backend
+    never returns scores computed differently. Lookups and
+    inserts are done in bulk, and hit/miss counts are kept for reporting.
+    """
+
+    def __init__(self, path: str, version: str):
+        """
+        Parameters:
+        - path (str): SQLite database file (':memory:' for a throwaway cache).
+        - version (str): Version of the lexicon/scorer the scores belong to.
+        """
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS scores ('
+            'key BLOB PRIMARY KEY, neg REAL, neu REAL, pos REAL, compound REAL) WITHOUT ROWID'
+        )
+        self.connection.commit()
+
+    def keys(self, headlines: List[str], scorer: str = '') -> List[bytes]:
+        """
+        Cache keys for normalized headlines.
+
+        Parameters:
+        - headlines (List[str]): Normalized headlines.
+        - scorer (str): Scoring backend the scores come from, e.g. 'vader' or 'table'.
+
+        Returns:
+        - List[bytes]: One key per headline.
+        """
+        prefix = f'{self.version}\0{scorer}\0'.encode('utf-8')
+        return [hashlib.blake2b(prefix + str(headline).encode('utf-8'), digest_size=16).digest()
+                for headline in headlines]
+
+    def lookup(self, keys: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Look up many keys in one query.
+
+        Parameters:
+        - keys (List[bytes]): Keys from `keys()`.
+
+        Returns:
+        - Tuple[np.ndarray, np.ndarray]: An array of shape (len(keys), 4) with
+          neg, neu, pos and compound scores, and a boolean mask of the keys found.
+        """
+        scores = np.full((len(keys), 4), np.nan)
+        found = np.zeros(len(keys), dtype=bool)
+        with self.connection:
+            self.connection.execute('CREATE TEMP TABLE IF NOT EXISTS lookup (row INTEGER, key BLOB)')
+            self.connection.execute('DELETE FROM lookup')
+            self.connection.executemany('INSERT INTO lookup VALUES (?, ?)', enumerate(keys))
+            rows = self.connection.execute(
+                'SELECT lookup.row, neg, neu, pos, compound FROM lookup JOIN scores ON scores.key = lookup.key'
+            ).fetchall()
+        if rows:
+            rows = np.array(rows, dtype=np.float64)
+            index = rows[:, 0].astype(np.int64)
+            scores[index] = rows[:, 1:]
+            found[index] = True
+        self.hits += int(found.sum())
+        self.misses += int(len(keys) - found.sum())
+        return scores, found
+
+    def store(self, keys: List[bytes], scores: np.ndarray) -> None:
+        """
+        Insert or replace the scores of many keys.
+        """
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?)',
+                ((key, *map(float, row)) for key, row in zip(keys, scores)),
+            )
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        """Hit/miss counts and hit rate since the cache was opened."""
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate}
+
+    def close(self) -> None:
+        self.connection.close()
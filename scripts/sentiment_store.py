@@ -0,0 +1,184 @@
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from urllib.parse import quote
+from typing import List
+
+try:
+    from scripts.alignment import MARKET_CLOSE, MARKET_TZ, market_days, price_columns, session_positions
+    from scripts.profiling import profiled
+    from scripts.sentiment_analysis import SCORE_COLUMNS
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    from alignment import MARKET_CLOSE, MARKET_TZ, market_days, price_columns, session_positions
+    from profiling import profiled
+    from sentiment_analysis import SCORE_COLUMNS
+
+# Parquet I/O goes through pandas, which needs pyarrow installed at call time.
+# One partition per symbol, so the dashboard reads a single directory per chart.
+PARTITION_COL = 'stock'
+# Labels of `SentimentAnalyzer.categorize_sentiment`, counted per day.
+CATEGORIES = ['Positive', 'Neutral', 'Negative']
+STORE_COLUMNS = ['Date'] + SCORE_COLUMNS + ['articles'] + CATEGORIES
+
+
+def category_counts(compound: np.ndarray) -> np.ndarray:
+    """
+    One-hot Positive/Neutral/Negative columns of compound scores, with the
+    thresholds of `categorize_sentiment` (missing scores count as Neutral).
+    """
+    positive = compound >= 0.05
+    negative = compound <= -0.05
+    return np.column_stack([positive, ~(positive | negative), negative]).astype(np.int64)
+
+
+def empty_daily() -> pd.DataFrame:
+    """A daily sentiment frame without rows, indexed by 'Date'."""
+    frame = pd.DataFrame({column: pd.Series(dtype=np.float64) for column in SCORE_COLUMNS})
+    for column in ['articles'] + CATEGORIES:
+        frame[column] = pd.Series(dtype=np.int64)
+    frame.index = pd.DatetimeIndex([], name='Date')
+    return frame
+
+
+@profiled
+def daily_aggregates(news: pd.DataFrame, prices: pd.DataFrame = None, cutoff: str = MARKET_CLOSE,
+                     tz: str = MARKET_TZ, time_col: str = 'date', symbol_col: str = 'stock',
+                     date_col: str = 'Date') -> pd.DataFrame:
+    """
+    Aggregate scored headlines per symbol and day.
+
+    Parameters:
+    - news (pd.DataFrame): Headlines with a timestamp, a symbol and the SCORE_COLUMNS,
+      such as `analyze_sentiment` output joined back to the news.
+    - prices (pd.DataFrame): Optional daily bars; when given, headlines are assigned
+      to the trading session that can react to them (as in `alignment.daily_sentiment`),
+      otherwise to their calendar day in market local time.
+    - cutoff (str): Market close as 'HH:MM', used with `prices`.
+    - tz (str): Market timezone.
+    - time_col (str): Publication timestamp column of `news`.
+    - symbol_col (str): Symbol column of both frames.
+    - date_col (str): Date column (or index name) of `prices`.
+
+    Returns:
+    - pd.DataFrame: 'stock' and the STORE_COLUMNS: mean scores, the number of
+      'articles' and the count of every category, one row per symbol and day.
+    """
+    symbols = news[symbol_col].astype(object).to_numpy()
+    if prices is None:
+        days, _ = market_days(news[time_col], tz)
+        keep = days != np.iinfo(np.int64).min
+        dates = (days[keep] * 86_400 * 10**9).astype('datetime64[ns]')
+    else:
+        bar_dates, bar_symbols = price_columns(prices, date_col, symbol_col)
+        positions = session_positions(news[time_col], news[symbol_col], bar_dates, bar_symbols, cutoff, tz)
+        keep = positions >= 0
+        dates = bar_dates.to_numpy()[positions[keep]]
+    scores = news[SCORE_COLUMNS].to_numpy(dtype=np.float64)[keep]
+    frame = pd.DataFrame(scores, columns=SCORE_COLUMNS)
+    frame[CATEGORIES] = category_counts(scores[:, SCORE_COLUMNS.index('compound')])
+    frame.insert(0, 'Date', pd.DatetimeIndex(dates).normalize())
+    frame.insert(0, 'stock', symbols[keep])
+    frame['articles'] = 1
+    return combine([frame])
+
+
+def combine(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Merge daily aggregates that may share (stock, Date) rows: means are weighted
+    by their article counts, counts are added.
+    """
+    data = pd.concat(parts, ignore_index=True)
+    weighted = data[SCORE_COLUMNS].mul(data['articles'], axis=0)
+    totals = pd.concat([data[['stock', 'Date', 'articles'] + CATEGORIES], weighted], axis=1)
+    totals = totals.groupby(['stock', 'Date'], sort=True).sum().reset_index()
+    totals[SCORE_COLUMNS] = totals[SCORE_COLUMNS].div(totals['articles'], axis=0)
+    return totals[['stock'] + STORE_COLUMNS]
+
+
+def partition_path(store_dir: str, symbol: str) -> str:
+    """Directory holding one symbol's rows in the store."""
+    return os.path.join(store_dir, f'{PARTITION_COL}={quote(str(symbol), safe="")}')
+
+
+@profiled
+def update_store(store_dir: str, daily: pd.DataFrame) -> List[str]:
+    """
+    Merge new daily aggregates into the store.
+
+    Only the partitions of the symbols in `daily` are read and rewritten; feed each
+    headline once, as aggregates of the same headline would be counted twice.
+
+    Parameters:
+    - store_dir (str): Root directory of the store.
+    - daily (pd.DataFrame): Output of `daily_aggregates` for the new headlines.
+
+    Returns:
+    - List[str]: The symbols that were updated.
+    """
+    symbols = sorted(daily['stock'].astype(str).unique())
+    if not symbols:
+        return []
+    parts = [daily.assign(stock=daily['stock'].astype(str))]
+    existing = [symbol for symbol in symbols if os.path.isdir(partition_path(store_dir, symbol))]
+    if existing:
+        stored = pd.read_parquet(store_dir, filters=[(PARTITION_COL, 'in', existing)])
+        parts.append(stored.assign(stock=stored['stock'].astype(str)))
+    merged = combine(parts)
+    merged.to_parquet(store_dir, partition_cols=[PARTITION_COL], index=False,
+                      existing_data_behavior='delete_matching')
+    return symbols
+
+
+def build_store(store_dir: str, daily: pd.DataFrame) -> None:
+    """
+    Replace the store with `daily`, writing it beside the old one and swapping it in.
+
+    The old store is renamed aside before the new one takes its place and is only
+    deleted afterwards, so a store exists at every point except between the two
+    renames, and a crash never loses both.
+    """
+    tmp_dir = f'{store_dir}.{os.getpid()}.tmp'
+    old_dir = f'{store_dir}.{os.getpid()}.old'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    update_store(tmp_dir, daily)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(store_dir):
+        os.replace(store_dir, old_dir)
+    try:
+        os.replace(tmp_dir, store_dir)
+    except OSError:
+        if os.path.exists(old_dir):
+            os.replace(old_dir, store_dir)
+        raise
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+@profiled
+def load_partition(path: str) -> pd.DataFrame:
+    """
+    Read one symbol's partition directory, indexed by 'Date'.
+    """
+    data = pd.read_parquet(path, columns=STORE_COLUMNS)
+    return data.sort_values('Date', kind='stable').set_index('Date')
+
+
+def load_symbol(store_dir: str, symbol: str, start: str = None, end: str = None) -> pd.DataFrame:
+    """
+    Daily sentiment of one symbol, reading only its partition.
+
+    Parameters:
+    - store_dir (str): Root directory of the store.
+    - symbol (str): The symbol to read.
+    - start (str): First date to include.
+    - end (str): Last date to include.
+
+    Returns:
+    - pd.DataFrame: Mean scores, 'articles' and category counts indexed by 'Date';
+      empty if the symbol has no news.
+    """
+    path = partition_path(store_dir, symbol)
+    if not os.path.isdir(path):
+        return empty_daily()
+    return load_partition(path).loc[start:end]
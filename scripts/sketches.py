@@ -0,0 +1,186 @@
+import io
+import math
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Tuple
+
+# Fixed key so item hashes are identical across processes and runs,
+# which is what makes sketches from different shards mergeable.
+HASH_KEY = 'solar-sketch-key'
+
+
+def hash_items(items) -> np.ndarray:
+    """
+    Deterministic 64-bit hashes of string items.
+    """
+    return pd.util.hash_array(np.asarray(items, dtype=object), hash_key=HASH_KEY, categorize=False)
+
+
+class CountMinSketch:
+    """
+    Count-min sketch: frequency estimates in constant memory.
+
+    Estimates never undercount, and overcount by at most `epsilon` times the
+    total count with probability at least `1 - delta`.
+    """
+
+    def __init__(self, epsilon: float = 1e-4, delta: float = 1e-3, seed: int = 0):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.seed = seed
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        rng = np.random.default_rng(seed)
+        self.multipliers = rng.integers(1, 2 ** 63, self.depth, dtype=np.uint64) | np.uint64(1)
+        self.offsets = rng.integers(0, 2 ** 63, self.depth, dtype=np.uint64)
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        mixed = hashes[None, :] * self.multipliers[:, None] + self.offsets[:, None]
+        return ((mixed >> np.uint64(32)) % np.uint64(self.width)).astype(np.intp)
+
+    def update(self, items, counts=None) -> None:
+        """
+        Add `counts` (default 1 each) for a batch of items.
+        """
+        counts = np.ones(len(items), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        columns = self._columns(hash_items(items))
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts)
+        self.total += int(counts.sum())
+
+    def estimate(self, items) -> np.ndarray:
+        """
+        Estimated counts of a batch of items.
+        """
+        if len(items) == 0:
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(hash_items(items))
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def compatible(self, other: 'CountMinSketch') -> bool:
+        return (self.width, self.depth, self.seed) == (other.width, other.depth, other.seed)
+
+    def merge(self, other: 'CountMinSketch') -> None:
+        """
+        Add another sketch built with the same parameters into this one.
+        """
+        if not self.compatible(other):
+            raise ValueError("Only sketches with the same epsilon, delta and seed can be merged.")
+        self.table += other.table
+        self.total += other.total
+
+
+class StreamingTopK:
+    """
+    Approximate heavy hitters over an unbounded stream in constant memory.
+
+    A count-min sketch estimates every item's count and a bounded candidate set
+    keeps the `capacity` items with the highest estimates. Instances built with
+    the same parameters can be merged (e.g. one per day or per shard) and
+    serialized with `to_bytes`/`from_bytes` or `save`/`load`.
+    """
+
+    def __init__(self, capacity: int = 1000, epsilon: float = 1e-4, delta: float = 1e-3, seed: int = 0):
+        self.capacity = capacity
+        self.sketch = CountMinSketch(epsilon, delta, seed)
+        self.candidates = {}
+
+    def _refresh(self, items: List) -> None:
+        items = list(dict.fromkeys(list(self.candidates) + list(items)))
+        estimates = self.sketch.estimate(items)
+        if len(items) > self.capacity:
+            keep = np.argsort(-estimates, kind='stable')[:self.capacity]
+            items, estimates = [items[i] for i in keep], estimates[keep]
+        self.candidates = dict(zip(items, estimates.tolist()))
+
+    def update(self, items, counts=None) -> None:
+        """
+        Add a batch of items (optionally with counts) to the stream.
+        """
+        if counts is None:
+            codes, uniques = pd.factorize(pd.Series(items, dtype=object))
+            counts, items = np.bincount(codes[codes >= 0], minlength=len(uniques)), list(uniques)
+        else:
+            items = list(items)
+        if len(items) == 0:
+            return
+        self.sketch.update(items, counts)
+        self._refresh(items)
+
+    def merge(self, other: 'StreamingTopK') -> None:
+        """
+        Combine another partial result into this one.
+        """
+        self.sketch.merge(other.sketch)
+        self._refresh(list(other.candidates))
+
+    def top(self, n: int = None) -> List[Tuple[str, int]]:
+        """
+        The `n` items with the highest estimated counts, most frequent first.
+        """
+        ranked = sorted(self.candidates.items(), key=lambda item: -item[1])
+        return ranked[:n] if n is not None else ranked
+
+    def error_bound(self) -> float:
+        """
+        Maximum overcount of any estimate, with probability at least 1 - delta.
+        """
+        return self.sketch.epsilon * self.sketch.total
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the sketch and candidates.
+        """
+        buffer = io.BytesIO()
+        sketch = self.sketch
+        np.savez_compressed(
+            buffer,
+            params=np.array([self.capacity, sketch.seed, sketch.total], dtype=np.int64),
+            accuracy=np.array([sketch.epsilon, sketch.delta]),
+            table=sketch.table,
+            candidates=np.array(list(self.candidates), dtype=str),
+            estimates=np.array(list(self.candidates.values()), dtype=np.int64),
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'StreamingTopK':
+        """
+        Rebuild an instance serialized with `to_bytes`.
+        """
+        with np.load(io.BytesIO(data), allow_pickle=False) as saved:
+            capacity, seed, total = saved['params'].tolist()
+            epsilon, delta = saved['accuracy'].tolist()
+            topk = cls(capacity, epsilon, delta, seed)
+            topk.sketch.table = saved['table']
+            topk.sketch.total = total
+            topk.candidates = dict(zip(saved['candidates'].tolist(), saved['estimates'].tolist()))
+        return topk
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'StreamingTopK':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def merge_all(partials: Iterable[StreamingTopK]) -> StreamingTopK:
+    """
+    Merge several partial results (e.g. daily sketches) into one.
+
+    Raises ValueError when there is nothing to merge, as an empty result would
+    not know the capacity and error bounds to use.
+    """
+    partials = iter(partials)
+    first = next(partials, None)
+    if first is None:
+        raise ValueError("merge_all needs at least one partial result.")
+    merged = StreamingTopK.from_bytes(first.to_bytes())
+    for partial in partials:
+        merged.merge(partial)
+    return merged
@@ -1,22 +1,132 @@
+import io
+import os
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from collections import OrderedDict
+from typing import Tuple
 
-def load_data(file_path):
+try:
+    from scripts.profiling import profiled
+except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+    from profiling import profiled
+
+# Points kept per line: about twice the pixel width of a 14-inch chart at 100 dpi,
+# so the min and max of every pixel column survive.
+MAX_POINTS = 2800
+# Rendered charts by (symbol, chart, data version), least recently used first.
+FIGURE_CACHE_SIZE = 64
+_FIGURE_CACHE: 'OrderedDict[Tuple, bytes]' = OrderedDict()
+
+@profiled
+def load_data(file_path, columns=None, symbols=None, start=None, end=None):
     """
-    Load stock data from a CSV file.
+    Load stock data from a CSV file, or from a columnar store directory.
+
+    When `file_path` is a directory written by `columnar_store`, the filters
+    are pushed down to Parquet; a CSV file only reads the requested columns
+    and has the other filters applied after reading.
+
+    Parameters:
+    - file_path (str): CSV file or columnar store directory.
+    - columns (List[str]): Columns to read besides 'Date' and 'stock', defaults to all.
+    - symbols (Iterable[str]): Symbols to keep, defaults to all; needs a 'stock' column.
+    - start (str): First date to include.
+    - end (str): Last date to include.
+
+    Returns:
+    - pd.DataFrame: Data indexed by 'Date'.
     """
-    df = pd.read_csv(file_path, index_col='Date', parse_dates=True)
+    if os.path.isdir(file_path):
+        try:
+            from scripts.columnar_store import load_store
+        except ImportError:  # scripts/ itself is on sys.path (notebooks, src/app.py)
+            from columnar_store import load_store
+        return load_store(file_path, columns, symbols, start, end)
+    usecols = None if columns is None else lambda column: column in {'Date', 'stock', *columns}
+    df = pd.read_csv(file_path, index_col='Date', parse_dates=True, usecols=usecols)
+    if symbols is not None:
+        if 'stock' not in df.columns:
+            raise ValueError(f"{file_path} has no 'stock' column to filter symbols by.")
+        df = df[df['stock'].isin(list(symbols))]
+    if start is not None:
+        df = df[df.index >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df.index <= pd.Timestamp(end)]
     return df
 
+def minmax_indices(values: np.ndarray, max_points: int = MAX_POINTS) -> np.ndarray:
+    """
+    Indices of a min/max-preserving downsample of a series, at most `max_points` long.
+
+    The series is cut into equal buckets and the smallest and largest value of each
+    bucket are kept (in time order), together with the first and last point, so
+    peaks and troughs stay visible at screen resolution.
+    """
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+    buckets = max(1, (max_points - 2) // 2)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = values
+    padded = padded.reshape(buckets, size)
+    missing = np.isnan(padded)
+    low = np.where(missing, np.inf, padded).argmin(axis=1)
+    high = np.where(missing, -np.inf, padded).argmax(axis=1)
+    offsets = np.arange(buckets) * size
+    indices = np.concatenate([[0, n - 1], offsets + low, offsets + high])
+    return np.unique(indices[indices < n])
+
+def downsample(index: pd.Index, values: pd.Series, max_points: int = MAX_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    x and y arrays of a series reduced with `minmax_indices`.
+    """
+    y = values.to_numpy(dtype=np.float64)
+    keep = minmax_indices(y, max_points)
+    return np.asarray(index)[keep], y[keep]
+
+def plot_line(ax, stock_data, column, **kwargs):
+    """
+    Plot one column of a symbol's data, downsampled to screen resolution.
+    """
+    ax.plot(*downsample(stock_data.index, stock_data[column]), **kwargs)
+
+def symbol_rows(df: pd.DataFrame, stock) -> pd.DataFrame:
+    """
+    Rows of one symbol; a frame holding only that symbol is returned as is.
+    """
+    rows = df['stock'] == stock
+    return df if rows.all() else df[rows]
+
+def data_version(stock_data: pd.DataFrame, columns) -> int:
+    """
+    Content hash of the plotted columns, used to invalidate cached charts.
+    """
+    return int(pd.util.hash_pandas_object(stock_data[columns], index=True).sum())
+
+@profiled
+def render_png(fig) -> bytes:
+    """
+    Render a figure to PNG bytes and release it.
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    plt.close(fig)
+    return buffer.getvalue()
+
+@profiled
 def plot_stock_data(stock, df):
     """
     Plot stock price with moving averages.
+
+    Long histories are downsampled to screen resolution (see `minmax_indices`).
     """
     fig, ax = plt.subplots(figsize=(14, 7))
     stock_data = df[df['stock'] == stock]
-    ax.plot(stock_data.index, stock_data['Close'], label='Close Price', color='blue')
-    ax.plot(stock_data.index, stock_data['SMA_20'], label='20-Day SMA', color='orange')
-    ax.plot(stock_data.index, stock_data['EMA_20'], label='20-Day EMA', color='green')
+    plot_line(ax, stock_data, 'Close', label='Close Price', color='blue')
+    plot_line(ax, stock_data, 'SMA_20', label='20-Day SMA', color='orange')
+    plot_line(ax, stock_data, 'EMA_20', label='20-Day EMA', color='green')
     ax.set_title(f'Stock Price for {stock} with SMA and EMA')
     ax.set_xlabel('Date')
     ax.set_ylabel('Price')
@@ -24,13 +134,14 @@ def plot_stock_data(stock, df):
     ax.grid()
     return fig
 
+@profiled
 def plot_rsi(stock, df):
     """
     Plot Relative Strength Index (RSI).
     """
     fig, ax = plt.subplots(figsize=(14, 5))
     stock_data = df[df['stock'] == stock]
-    ax.plot(stock_data.index, stock_data['RSI_14'], label='14-Day RSI', color='purple')
+    plot_line(ax, stock_data, 'RSI_14', label='14-Day RSI', color='purple')
     ax.axhline(70, color='red', linestyle='--', label='Overbought (70)')
     ax.axhline(30, color='green', linestyle='--', label='Oversold (30)')
     ax.set_title(f'RSI for {stock}')
@@ -40,18 +151,53 @@ def plot_rsi(stock, df):
     ax.grid()
     return fig
 
+@profiled
 def plot_macd(stock, df):
     """
     Plot MACD (Moving Average Convergence Divergence).
     """
     fig, ax = plt.subplots(figsize=(14, 7))
     stock_data = df[df['stock'] == stock]
-    ax.plot(stock_data.index, stock_data['MACD'], label='MACD Line', color='black')
-    ax.plot(stock_data.index, stock_data['MACD_Signal'], label='Signal Line', color='red')
-    ax.bar(stock_data.index, stock_data['MACD_Hist'], label='MACD Histogram', color='gray', alpha=0.5)
+    plot_line(ax, stock_data, 'MACD', label='MACD Line', color='black')
+    plot_line(ax, stock_data, 'MACD_Signal', label='Signal Line', color='red')
+    # One LineCollection instead of a Rectangle per bar
+    x, hist = downsample(stock_data.index, stock_data['MACD_Hist'])
+    ax.vlines(x, 0, np.nan_to_num(hist), label='MACD Histogram', color='gray', alpha=0.5)
     ax.set_title(f'MACD for {stock}')
     ax.set_xlabel('Date')
     ax.set_ylabel('MACD')
     ax.legend()
     ax.grid()
-    return fig
\ No newline at end of file
+    return fig
+
+# Chart name -> (plotting function, columns it draws)
+CHARTS = {
+    'Moving Averages': (plot_stock_data, ['Close', 'SMA_20', 'EMA_20']),
+    'RSI': (plot_rsi, ['RSI_14']),
+    'MACD': (plot_macd, ['MACD', 'MACD_Signal', 'MACD_Hist']),
+}
+
+@profiled
+def chart_png(stock, chart, df, version=None):
+    """
+    Rendered chart ('Moving Averages', 'RSI' or 'MACD') of one symbol as PNG bytes.
+
+    Charts are drawn once per (symbol, chart, data version) and then served from
+    an in-process LRU cache. Callers that know the version of their data (e.g.
+    `DashboardData.price_version`) pass it, so a cached chart is served without
+    touching the rows; otherwise it is a hash of the plotted columns.
+    """
+    plot, columns = CHARTS[chart]
+    stock_data = None
+    if version is None:
+        stock_data = symbol_rows(df, stock)
+        version = data_version(stock_data, columns)
+    key = (stock, chart, version)
+    if key in _FIGURE_CACHE:
+        _FIGURE_CACHE.move_to_end(key)
+        return _FIGURE_CACHE[key]
+    image = render_png(plot(stock, symbol_rows(df, stock) if stock_data is None else stock_data))
+    _FIGURE_CACHE[key] = image
+    while len(_FIGURE_CACHE) > FIGURE_CACHE_SIZE:
+        _FIGURE_CACHE.popitem(last=False)
+    return image
@@ -0,0 +1,309 @@
+import string
+import itertools
+import numpy as np
+from typing import Dict, List, Tuple
+
+PUNCTUATION = frozenset(string.punctuation)
+# Offsets (relative to the scored word) of the word sequences VADER's idiom check
+# builds, in the order it tests them; the first match wins.
+IDIOM_SEQUENCES = [(-1, 0), (-2, -1, 0), (-2, -1), (-3, -2, -1), (-3, -2)]
+# Sequences after the scored word, each overriding earlier matches.
+IDIOM_SEQUENCES_AFTER = [(0, 1), (0, 1, 2)]
+ALPHA = 15
+
+
+def strip_punctuation(token: str, punctuation: frozenset) -> str:
+    """
+    The word VADER keeps for a whitespace-separated token.
+
+    VADER replaces a token made of one PUNC_LIST entry before or after a word
+    without punctuation (of at least two characters) by that word. Because that
+    word is then also a word of the punctuation-free text, the result depends on
+    the token alone, never on the rest of the headline.
+    """
+    if token[0] not in PUNCTUATION and token[-1] not in PUNCTUATION:
+        return token
+    for split in range(len(token) - 1, 0, -1):
+        word, mark = token[:split], token[split:]
+        if mark in punctuation and len(word) > 1 and PUNCTUATION.isdisjoint(word):
+            return word
+    for split in range(1, len(token)):
+        mark, word = token[:split], token[split:]
+        if mark in punctuation and len(word) > 1 and PUNCTUATION.isdisjoint(word):
+            return word
+    return token
+
+
+class LexiconTable:
+    """
+    VADER's lexicon and word lists as arrays over an integer vocabulary.
+
+    Every distinct word seen is given an id once; its valence and rule flags
+    (booster, negation, ALL CAPS, ...) are looked up in arrays indexed by that id,
+    so scoring a batch never touches a Python dict per token.
+    """
+
+    def __init__(self, lexicon: Dict[str, float], constants):
+        self.lexicon = lexicon
+        self.constants = constants
+        self.punctuation = frozenset(constants.PUNC_LIST)
+        self.ids: Dict[str, int] = {}
+        self.token_words: Dict[str, int] = {}
+        self.features: Dict[str, np.ndarray] = {}
+        self.add_words([])
+
+    def add_words(self, words: List[str]) -> None:
+        """Give new (case-sensitive) words the next ids and append their features."""
+        lexicon, constants = self.lexicon, self.constants
+        lower = [word.lower() for word in words]
+        new = {
+            'valence': [lexicon.get(word, 0.0) for word in lower],
+            'in_lexicon': [word in lexicon for word in lower],
+            'booster': [constants.BOOSTER_DICT.get(word, 0.0) for word in lower],
+            'is_booster': [word in constants.BOOSTER_DICT for word in lower],
+            'is_upper': [word.isupper() for word in words],
+            'negated': [word in constants.NEGATE or "n't" in word for word in lower],
+            'kind': [word == 'kind' for word in lower],
+            'of': [word == 'of' for word in lower],
+            'least': [word == 'least' for word in lower],
+            'at_very': [word in ('at', 'very') for word in lower],
+            'but': [word == 'but' for word in lower],
+            'never': [word == 'never' for word in words],
+            'so_this': [word in ('so', 'this') for word in words],
+        }
+        for name, values in new.items():
+            values = np.array(values, dtype=np.float64 if name in ('valence', 'booster') else bool)
+            self.features[name] = np.concatenate([self.features[name], values]) if name in self.features else values
+        self.ids.update(zip(words, range(len(self.ids), len(self.ids) + len(words))))
+
+    def encode(self, tokens: List[str]) -> np.ndarray:
+        """
+        Word ids of raw tokens; tokens of one character are dropped by VADER and get -1.
+
+        Tokens are looked up in a dict of every token seen before; only unseen ones
+        go through `strip_punctuation` and the feature lookups.
+        """
+        token_words = self.token_words
+        unseen = -2
+        ids = np.fromiter(map(token_words.get, tokens, itertools.repeat(unseen)), dtype=np.int64, count=len(tokens))
+        missing = np.flatnonzero(ids == unseen)
+        if len(missing):
+            new_tokens = list(dict.fromkeys(tokens[i] for i in missing))
+            punctuation = self.punctuation
+            words = [None if len(token) <= 1 else
+                     token if token[0] not in PUNCTUATION and token[-1] not in PUNCTUATION else
+                     strip_punctuation(token, punctuation) for token in new_tokens]
+            self.add_words([word for word in dict.fromkeys(words) if word is not None and word not in self.ids])
+            token_words.update((token, -1 if word is None else self.ids[word]) for token, word in zip(new_tokens, words))
+            ids[missing] = [token_words[tokens[i]] for i in missing]
+        return ids
+
+    def feature(self, name: str) -> np.ndarray:
+        """One feature of every word id as an array."""
+        return self.features[name]
+
+    def sequence_ids(self, phrase: str) -> Tuple[int, ...]:
+        """Word ids of a space-separated phrase, or None if a word was never seen."""
+        words = phrase.split(' ')
+        if any(word not in self.ids for word in words):
+            return None
+        return tuple(self.ids[word] for word in words)
+
+
+class TokenLayout:
+    """
+    Tokens of a batch of headlines, flattened: row, position and word id per token,
+    with access to the words at fixed offsets from every token.
+    """
+
+    def __init__(self, words: np.ndarray, rows: np.ndarray, lengths: np.ndarray):
+        self.words = words
+        self.rows = rows
+        self.lengths = lengths
+        starts = np.cumsum(lengths) - lengths
+        self.positions = np.arange(len(words)) - starts[rows]
+        self.shifted: Dict[int, np.ndarray] = {0: words}
+
+    def at(self, offset: int, index: np.ndarray = None) -> np.ndarray:
+        """
+        Word ids `offset` places away from every token, or from the tokens at
+        `index`; -1 where that falls outside the headline.
+        """
+        if index is not None:
+            if not len(self.words):
+                return np.full(len(index), -1)
+            target = index + offset
+            inside = (target >= 0) & (target < len(self.words))
+            target = np.where(inside, target, 0)
+            inside &= self.rows[target] == self.rows[index]
+            return np.where(inside, self.words[target], -1)
+        if offset not in self.shifted:
+            self.shifted[offset] = self.at(offset, np.arange(len(self.words)))
+        return self.shifted[offset]
+
+
+def tokenize(texts: List[str], table: LexiconTable) -> TokenLayout:
+    """
+    Split every headline on whitespace and encode the tokens VADER keeps.
+    """
+    split = [text.split() for text in texts]
+    counts = np.fromiter(map(len, split), dtype=np.int64, count=len(split))
+    tokens = table.encode(list(itertools.chain.from_iterable(split)))
+    rows = np.repeat(np.arange(len(texts)), counts)
+    keep = tokens >= 0
+    return TokenLayout(tokens[keep], rows[keep], np.bincount(rows[keep], minlength=len(texts)))
+
+
+def lookup(table: LexiconTable, name: str, ids: np.ndarray) -> np.ndarray:
+    """Feature `name` of word ids, False (or 0) where the id is -1."""
+    values = table.feature(name)
+    return np.where(ids >= 0, values[np.maximum(ids, 0)], values.dtype.type(0))
+
+
+def match(layout: TokenLayout, table: LexiconTable, index: np.ndarray, offsets: Tuple[int, ...],
+          phrase: str) -> np.ndarray:
+    """Whether the words at `offsets` around the tokens at `index` spell `phrase`."""
+    ids = table.sequence_ids(phrase) if len(phrase.split(' ')) == len(offsets) else None
+    matched = np.full(len(index), ids is not None)
+    for offset, word in zip(offsets, ids or ()):
+        matched &= layout.at(offset, index) == word
+    return matched
+
+
+def first_occurrences(layout: TokenLayout) -> np.ndarray:
+    """
+    Index of the first token with the same word in the same headline, for every
+    token (VADER scores repeated words at their first position).
+    """
+    if not len(layout.words):
+        return np.zeros(0, dtype=np.int64)
+    keys = layout.rows * (int(layout.words.max()) + 1) + layout.words
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+    first = order[np.flatnonzero(starts)][np.cumsum(starts) - 1]
+    result = np.empty_like(first)
+    result[order] = first
+    return result
+
+
+def word_valences(layout: TokenLayout, table: LexiconTable, cap_differential: np.ndarray) -> np.ndarray:
+    """
+    Valence of every token under VADER's rules, each evaluated at the token's own position.
+    """
+    constants = table.constants
+    words = layout.words
+    feature = table.feature
+    caps = cap_differential[layout.rows]
+    skipped = feature('is_booster')[words] | (feature('kind')[words] & lookup(table, 'of', layout.at(1)))
+    scored = feature('in_lexicon')[words] & ~skipped
+    valence = np.where(scored, feature('valence')[words], 0.0)
+    emphasis = np.where(valence > 0, constants.C_INCR, -constants.C_INCR)
+    valence = np.where(scored & feature('is_upper')[words] & caps, valence + emphasis, valence)
+
+    before = {offset: layout.at(-offset) for offset in (1, 2, 3)}
+    for offset, damping in ((1, 1.0), (2, 0.95), (3, 0.9)):
+        word = before[offset]
+        applies = scored & (word >= 0) & ~lookup(table, 'in_lexicon', word)
+        # Booster or dampener before the word, signed like the valence so far
+        scalar = lookup(table, 'booster', word)
+        scalar = np.where(valence < 0, -scalar, scalar)
+        capital = lookup(table, 'is_booster', word) & lookup(table, 'is_upper', word) & caps
+        scalar = np.where(capital, scalar + np.where(valence > 0, constants.C_INCR, -constants.C_INCR), scalar)
+        valence = np.where(applies, valence + scalar * damping, valence)
+
+        negated = lookup(table, 'negated', word)
+        if offset == 1:
+            valence = np.where(applies & negated, valence * constants.N_SCALAR, valence)
+        else:
+            never_so = lookup(table, 'never', word) & lookup(table, 'so_this', before[offset - 1])
+            if offset == 2:
+                amplifier = 1.5
+            else:
+                never_so |= lookup(table, 'so_this', before[1])
+                amplifier = 1.25
+            valence = np.where(applies & never_so, valence * amplifier,
+                               np.where(applies & negated, valence * constants.N_SCALAR, valence))
+        if offset == 3:
+            index = np.flatnonzero(applies)
+            valence[index] = idiom_valences(layout, table, index, valence[index])
+
+    least = scored & (before[1] >= 0) & lookup(table, 'least', before[1]) & ~lookup(table, 'in_lexicon', before[1])
+    least &= ~lookup(table, 'at_very', before[2])
+    return np.where(least, valence * constants.N_SCALAR, valence)
+
+
+def idiom_valences(layout: TokenLayout, table: LexiconTable, index: np.ndarray, valence: np.ndarray) -> np.ndarray:
+    """
+    VADER's special-case idioms and two-word dampeners ('kind of', 'sort of', ...)
+    for the tokens at `index`, which have at least three words before them.
+    """
+    constants = table.constants
+    idioms = constants.SPECIAL_CASE_IDIOMS
+    found, result = np.zeros(len(index), dtype=bool), valence.copy()
+    for offsets in IDIOM_SEQUENCES:
+        for phrase, value in idioms.items():
+            matched = match(layout, table, index, offsets, phrase) & ~found
+            result[matched] = value
+            found |= matched
+    for offsets in IDIOM_SEQUENCES_AFTER:
+        for phrase, value in idioms.items():
+            result[match(layout, table, index, offsets, phrase)] = value
+    dampened = np.zeros(len(index), dtype=bool)
+    for phrase in constants.BOOSTER_DICT:
+        if ' ' in phrase:
+            dampened |= match(layout, table, index, (-3, -2), phrase) | match(layout, table, index, (-2, -1), phrase)
+    return np.where(dampened, result + constants.B_DECR, result)
+
+
+def polarity_table(texts: List[str], table: LexiconTable) -> np.ndarray:
+    """
+    VADER polarity scores of a batch of headlines, computed with array operations.
+
+    The batch is tokenized once; tokens are mapped to word ids and the negation,
+    booster, ALL CAPS, idiom, 'least' and 'but' rules are applied to all tokens
+    at once by looking at the words at fixed offsets. Scores equal
+    `SentimentIntensityAnalyzer.polarity_scores` up to the last rounded digit.
+
+    Parameters:
+    - texts (List[str]): Headline strings.
+    - table (LexiconTable): The lexicon and the vocabulary seen so far.
+
+    Returns:
+    - np.ndarray: Array of shape (len(texts), 4) with neg, neu, pos and compound scores.
+    """
+    texts = [text if isinstance(text, str) else str(text.encode('utf-8')) for text in texts]
+    layout = tokenize(texts, table)
+    rows, lengths = layout.rows, layout.lengths
+    capitals = np.bincount(rows, weights=table.feature('is_upper')[layout.words], minlength=len(texts))
+    cap_differential = (capitals > 0) & (capitals < lengths)
+
+    sentiments = word_valences(layout, table, cap_differential)[first_occurrences(layout)]
+    # Words before the first 'but' count half, words after it one and a half times
+    buts = np.flatnonzero(table.feature('but')[layout.words])
+    first_but = np.full(len(texts), np.iinfo(np.int64).max)
+    np.minimum.at(first_but, rows[buts], layout.positions[buts])
+    but_position = first_but[rows]
+    has_but = but_position != np.iinfo(np.int64).max
+    sentiments = np.where(has_but & (layout.positions < but_position), sentiments * 0.5,
+                          np.where(has_but & (layout.positions > but_position), sentiments * 1.5, sentiments))
+
+    exclamations = np.minimum(np.fromiter((text.count('!') for text in texts), np.int64, len(texts)), 4)
+    questions = np.fromiter((text.count('?') for text in texts), np.int64, len(texts))
+    emphasis = exclamations * 0.292 + np.where(questions > 1, np.where(questions <= 3, questions * 0.18, 0.96), 0.0)
+
+    total = np.bincount(rows, weights=sentiments, minlength=len(texts))
+    total = total + np.sign(total) * emphasis
+    compound = total / np.sqrt(total * total + ALPHA)
+    pos_sum = np.bincount(rows, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=len(texts))
+    neg_sum = np.bincount(rows, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=len(texts))
+    neu_count = np.bincount(rows, weights=sentiments == 0, minlength=len(texts))
+    pos_sum, neg_sum = (np.where(pos_sum > -neg_sum, pos_sum + emphasis, pos_sum),
+                        np.where(pos_sum < -neg_sum, neg_sum - emphasis, neg_sum))
+    denominator = pos_sum - neg_sum + neu_count
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scores = np.column_stack([-neg_sum, neu_count, pos_sum]) / denominator[:, None]
+    scores = np.round(np.abs(scores), 3)
+    result = np.column_stack([scores, np.round(compound, 4)])
+    result[lengths == 0] = 0.0
+    return result
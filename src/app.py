@@ -1,35 +1,51 @@
 import streamlit as st
 import pandas as pd
-import sys, os
+import sys, os, json
 # Add the 'scripts' directory to the Python path for module imports
 sys.path.append(os.path.abspath(os.path.join('..', 'scripts')))
 
-from stock_analysis import load_data, plot_stock_data, plot_rsi, plot_macd
+from stock_analysis import chart_png
 from sentiment_analysis import SentimentAnalyzer as sa  # Import the new functions
+from dashboard_data import DashboardData
+import profiling
 # Streamlit UI
 def main():
+    # Each rerun starts a fresh breakdown; recording is on only with SCRIPTS_PROFILE set
+    profiling.clear()
+    with profiling.span('app.rerun'):
+        render()
+    if profiling.ENABLED:
+        debug_panel()
+
+
+def render():
     st.title('Stock Data and Sentiment Analysis')
 
 
-    # Load data
-    df = load_data('../Data/stock_data.csv')
-    daily_sentiment = pd.read_csv('../Data/stock_data.csv')
-    stocks = df['stock'].unique()
+    # Load data lazily; files are parsed once and reused until they change
+    data = DashboardData('../Data/stock_data.csv', '../Data/sentiment_store')
+    prices = data.prices()
+    stocks = prices.symbols()
 
     selected_stock = st.sidebar.selectbox('Select Stock', stocks)
     indicator = st.sidebar.selectbox('Select Indicator', ['Moving Averages', 'RSI', 'MACD', 'Daily Sentiment'])
 
-    if indicator == 'Moving Averages':
-        fig = plot_stock_data(selected_stock, df)
-    elif indicator == 'RSI':
-        fig = plot_rsi(selected_stock, df)
-    elif indicator == 'MACD':
-        fig = plot_macd(selected_stock, df)
-    elif indicator == 'Daily Sentiment':
-        fig = sa.plot_sentiment(daily_sentiment, selected_stock)
-       
-    st.pyplot(fig)
-   
+    if indicator == 'Daily Sentiment':
+        # Only the selected symbol's partition of the daily sentiment store is read
+        fig = sa.plot_sentiment(data.sentiment(selected_stock), selected_stock)
+        st.pyplot(fig)
+    else:
+        # Rendered once per symbol and data version, then served from the cache
+        st.image(chart_png(selected_stock, indicator, prices[selected_stock], version=data.price_version()))
+
+
+def debug_panel():
+    # Where the last rerun spent its time, slowest first
+    with st.sidebar.expander('Profiling (last rerun)'):
+        st.dataframe(profiling.summary())
+        st.download_button('Chrome trace', json.dumps(profiling.chrome_trace()), file_name='trace.json',
+                           mime='application/json')
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
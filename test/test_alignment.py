@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.alignment import session_positions, align_news, daily_sentiment
+
+class TestAlignment(unittest.TestCase):
+
+    def setUp(self):
+        # Thursday 2024-08-01, Friday 08-02 and Monday 08-05 sessions
+        self.prices = pd.DataFrame({
+            'Date': pd.to_datetime(['2024-08-01', '2024-08-02', '2024-08-05', '2024-08-01', '2024-08-05']),
+            'stock': ['A', 'A', 'A', 'B', 'B'],
+            'Close': [1.0, 2.0, 3.0, 4.0, 5.0],
+        }).set_index('Date')
+        self.news = pd.DataFrame({
+            'date': pd.to_datetime(['2024-08-01 09:00-04:00',   # before the close
+                                    '2024-08-01 16:30-04:00',   # after the close
+                                    '2024-08-03 10:00-04:00',   # Saturday
+                                    '2024-08-02 12:00-04:00',   # B has no Friday bar
+                                    '2024-08-06 09:00-04:00',   # after the last bar
+                                    '2024-08-01 19:00-04:00',
+                                    None], utc=True),
+            'stock': ['A', 'A', 'A', 'B', 'A', 'A', 'A'],
+            'neg': 0.0, 'neu': 0.5, 'pos': 0.5,
+            'compound': [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7],
+        })
+
+    def test_session_positions(self):
+        dates = self.prices.index.to_series().reset_index(drop=True)
+        positions = session_positions(self.news['date'], self.news['stock'], dates,
+                                      self.prices['stock'].reset_index(drop=True))
+        np.testing.assert_array_equal(positions, [0, 1, 2, 4, -1, 1, -1])
+
+        early_close = session_positions(self.news['date'], self.news['stock'], dates,
+                                        self.prices['stock'].reset_index(drop=True), cutoff='09:00')
+        self.assertEqual(early_close[0], 1)
+
+    def test_session_positions_with_utc_bars(self):
+        # `load_data` parses bar dates as UTC midnights; they must keep their calendar date
+        dates = self.prices.index.to_series().reset_index(drop=True)
+        symbols = self.prices['stock'].reset_index(drop=True)
+        naive = session_positions(self.news['date'], self.news['stock'], dates, symbols)
+        utc = session_positions(self.news['date'], self.news['stock'], dates.dt.tz_localize('UTC'), symbols)
+        np.testing.assert_array_equal(utc, naive)
+
+        daily = daily_sentiment(self.news, self.prices.tz_localize('UTC').reset_index())
+        self.assertEqual(daily['Date'].dt.strftime('%Y-%m-%d').tolist(),
+                         ['2024-08-01', '2024-08-02', '2024-08-05', '2024-08-05'])
+
+    def test_align_news(self):
+        aligned = align_news(self.news, self.prices)
+        self.assertEqual(len(aligned), 5)
+        self.assertEqual(aligned['Close'].tolist(), [1.0, 2.0, 3.0, 5.0, 2.0])
+        self.assertEqual(aligned['Date'].dt.strftime('%Y-%m-%d').tolist(),
+                         ['2024-08-01', '2024-08-02', '2024-08-05', '2024-08-05', '2024-08-02'])
+        self.assertNotIn('Date', self.news.columns)
+
+    def test_daily_sentiment(self):
+        daily = daily_sentiment(self.news, self.prices.reset_index())
+        self.assertEqual(daily[['stock', 'articles']].values.tolist(),
+                         [['A', 1], ['A', 2], ['A', 1], ['B', 1]])
+        np.testing.assert_allclose(daily['compound'], [0.1, 0.4, 0.3, 0.4])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.backtest import (PricePanel, band_positions, performance, rsi_grid, macd_grid,
+                              backtest_rsi, backtest_macd, backtest_sentiment)
+from scripts.indicators import compute_indicators
+
+class TestBacktest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        dates = pd.bdate_range('2020-01-01', periods=400)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (2, 400)), axis=1))
+        cls.data = pd.DataFrame({'Date': np.tile(dates, 2), 'stock': np.repeat(['A', 'B'], 400),
+                                 'Close': close.ravel()}).set_index('Date')
+        cls.prices = PricePanel(cls.data)
+
+    def test_band_positions(self):
+        enter = np.array([False, True, False, False, False, True])
+        exit = np.array([True, False, False, True, False, False])
+        np.testing.assert_array_equal(band_positions(enter, exit), [0, 1, 1, 0, 0, 1])
+
+    def test_performance(self):
+        returns = np.array([[0.0, 0.1, -0.5, 0.2]])
+        metrics = performance(np.array([[[1.0, 1.0, 0.0, 0.0]]]), returns)
+        self.assertAlmostEqual(metrics['total_return'][0, 0], 1.1 * 0.5 - 1)
+        self.assertAlmostEqual(metrics['max_drawdown'][0, 0], -0.5)
+        self.assertAlmostEqual(metrics['exposure'][0, 0], 0.5)
+        self.assertAlmostEqual(metrics['turnover'][0, 0], 2 / (4 / 252))
+
+    def test_indicators_match_compute_indicators(self):
+        # A gap in B's history: the grids must skip it the way compute_indicators does
+        data = self.data.iloc[np.r_[0:450, 460:800]]
+        prices = PricePanel(data)
+        reference = compute_indicators(data.reset_index())
+        rsi = rsi_grid(prices.close, [14])[0]
+        macd = macd_grid(prices.close, [(12, 26, 9)])[0]
+        for row, symbol in enumerate(prices.symbols):
+            expected = reference[reference['stock'] == symbol]
+            columns = prices.dates.get_indexer(expected['Date'])
+            np.testing.assert_array_equal(rsi[row, columns], expected['RSI_14'].to_numpy())
+            np.testing.assert_array_equal(macd[row, columns], expected['MACD_Hist'].to_numpy())
+            self.assertTrue(np.isnan(np.delete(rsi[row], columns)).all())
+
+    def test_rsi_sweep_matches_loop(self):
+        results = backtest_rsi(self.prices, periods=[7, 14], lowers=[30, 40], uppers=[60, 70])
+        self.assertEqual(len(results), 2 * 2 * 2 * 2)
+        rsi = rsi_grid(self.prices.close, [14])[0, 1]
+        position, positions = 0.0, []
+        for value in rsi:
+            if value < 40:
+                position = 1.0
+            elif value > 70:
+                position = 0.0
+            positions.append(position)
+        held = np.r_[0.0, positions[:-1]]
+        expected = np.prod(1 + held * self.prices.returns[1]) - 1
+        row = results[(results['period'] == 14) & (results['lower'] == 40) & (results['upper'] == 70)
+                      & (results['stock'] == 'B')]
+        self.assertAlmostEqual(row['total_return'].item(), expected)
+
+    def test_macd_and_sentiment_sweeps(self):
+        macd = backtest_macd(self.prices, fasts=[8, 12, 30], slows=[26], signals=[5, 9])
+        self.assertEqual(len(macd), 2 * 2 * 2)
+        self.assertTrue((macd['exposure'].between(0, 1)).all())
+
+        sentiment = np.full(self.prices.close.shape, np.nan)
+        sentiment[:, 10] = 0.5
+        sentiment[:, 20] = -0.5
+        result = backtest_sentiment(self.prices, sentiment, thresholds=[0.05, 0.6])
+        expected = np.prod(1 + self.prices.returns[0, 11:21]) - 1
+        self.assertAlmostEqual(result['total_return'].iloc[0], expected)
+        self.assertEqual(result['total_return'].iloc[2], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import pandas as pd
+from scripts.benchmark import synthetic_news, synthetic_ohlcv, run_benchmarks, compare, check_speedups
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_synthetic_schemas(self):
+        news = synthetic_news(500)
+        self.assertEqual(list(news.columns), ['headline', 'url', 'publisher', 'date', 'stock'])
+        self.assertTrue(pd.to_datetime(news['date'], utc=True).notna().all())
+
+        bars = synthetic_ohlcv(25_000)
+        self.assertEqual(list(bars.columns), ['Date', 'Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume',
+                                              'Dividends', 'Stock Splits', 'stock'])
+        self.assertEqual(len(bars), 25_000)
+        self.assertEqual(bars['stock'].nunique(), 3)
+
+    def test_run_and_compare(self):
+        results = run_benchmarks(['300'], ['load_data', 'articles_by_time', 'plot_macd'])
+        self.assertEqual(set(results['results']), {'load_data[300]', 'articles_by_time[300]', 'plot_macd[300]'})
+        for result in results['results'].values():
+            self.assertEqual(result['rows'], 300)
+            self.assertGreater(result['seconds'], 0)
+            self.assertIn('peak_mb', result)
+
+        baseline = {'results': {'a[10k]': {'seconds': 1.0, 'peak_mb': 10.0},
+                                'b[10k]': {'seconds': 0.001, 'peak_mb': 10.0}}}
+        current = {'results': {'a[10k]': {'seconds': 1.5, 'peak_mb': 10.5},
+                               'b[10k]': {'seconds': 0.002, 'peak_mb': 10.0},
+                               'c[10k]': {'seconds': 9.0}}}
+        regressions = compare(current, baseline, tolerance=0.2)
+        self.assertEqual([(r['benchmark'], r['metric']) for r in regressions], [('a[10k]', 'seconds')])
+
+    def test_check_speedups(self):
+        results = {'results': {'analyze_sentiment[10k]': {'seconds': 1.0},
+                               'analyze_sentiment_table[10k]': {'seconds': 0.2},
+                               'analyze_sentiment_table[1M]': {'seconds': 2.0}}}
+        shortfalls = check_speedups(results)
+        self.assertEqual([(s['benchmark'], s['reference']) for s in shortfalls],
+                         [('analyze_sentiment_table[10k]', 'analyze_sentiment[10k]')])
+        self.assertAlmostEqual(shortfalls[0]['speedup'], 5.0)
+        results['results']['analyze_sentiment_table[10k]']['seconds'] = 0.05
+        self.assertEqual(check_speedups(results), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import shutil
+import tempfile
+import importlib.util
+import numpy as np
+import pandas as pd
+from scripts.columnar_store import write_store, load_store
+from scripts.stock_analysis import load_data
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is required for the columnar store')
+class TestColumnarStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.store_dir = tempfile.mkdtemp()
+        dates = pd.date_range(start='2021-12-20', periods=20, freq='D')
+        cls.data = pd.concat([
+            pd.DataFrame({'Date': dates, 'Close': np.arange(20, dtype=float), 'Volume': 100, 'stock': stock})
+            for stock in ['AAPL', 'MSFT']
+        ])
+        write_store(cls.data, cls.store_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.store_dir)
+
+    def test_round_trip_with_compact_dtypes(self):
+        df = load_store(self.store_dir)
+
+        self.assertEqual(df.shape, (40, 3))
+        self.assertEqual(df.index.name, 'Date')
+        self.assertEqual(df['Close'].dtype, np.float32)
+        self.assertIsInstance(df['stock'].dtype, pd.CategoricalDtype)
+
+    def test_filters_are_applied(self):
+        df = load_store(self.store_dir, columns=['Close'], symbols=['MSFT'], start='2022-01-01', end='2022-01-03')
+
+        self.assertEqual(list(df.columns), ['stock', 'Close'])
+        self.assertEqual(list(df['stock'].unique()), ['MSFT'])
+        self.assertEqual(len(df), 3)
+
+    def test_rewrite_replaces_partitions(self):
+        write_store(self.data[self.data['stock'] == 'AAPL'], self.store_dir)
+        self.assertEqual(len(load_store(self.store_dir)), 40)
+
+    def test_stock_analysis_load_data_reads_store(self):
+        df = load_data(self.store_dir, symbols=['AAPL'])
+        self.assertEqual(len(df), 20)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+from scripts.correlation import rolling_correlation, sentiment_return_correlation
+
+class TestCorrelation(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = rng.normal(size=(3, 200)) + 10
+        self.y = 0.5 * np.roll(self.x, 2, axis=1) + rng.normal(size=(3, 200))
+        self.x[rng.random(self.x.shape) < 0.3] = np.nan
+
+    def test_pearson_matches_pandas(self):
+        result = rolling_correlation(self.x, self.y, [-1, 0, 2], window=30, min_periods=10)
+        self.assertEqual(result.shape, (3, 3, 200))
+        self.assertEqual(result.dtype, np.float32)
+        for symbol in range(3):
+            for i, lag in enumerate([-1, 0, 2]):
+                x, y = pd.Series(self.x[symbol]).shift(lag), pd.Series(self.y[symbol])
+                expected = x.rolling(30, min_periods=1).corr(y)
+                pairs = (x.notna() & y.notna()).astype(float).rolling(30, min_periods=1).sum()
+                expected[pairs < 10] = np.nan
+                np.testing.assert_allclose(result[symbol, i], expected, atol=1e-5, equal_nan=True)
+        self.assertGreater(np.nanmean(result[:, 2]), 0.3)
+
+    def test_lags_beyond_the_history(self):
+        result = rolling_correlation(self.x, self.y, [-200, 250, 0], window=30, min_periods=10)
+        self.assertTrue(np.isnan(result[:, :2]).all())
+        self.assertFalse(np.isnan(result[:, 2]).all())
+
+    def test_spearman_full_window(self):
+        x, y = self.x[:, :50].copy(), self.y[:, :50]
+        x[np.isnan(x)] = 0.0
+        result = rolling_correlation(x, y, [0], window=50, method='spearman')
+        for symbol in range(3):
+            self.assertAlmostEqual(result[symbol, 0, -1], spearmanr(x[symbol], y[symbol])[0], places=5)
+        with self.assertRaises(ValueError):
+            rolling_correlation(x, y, [0], window=50, method='kendall')
+
+    def test_spearman_ranks_inside_every_window(self):
+        x = np.round(self.x, 1)  # ties
+        result = rolling_correlation(x, self.y, [0, 1], window=20, min_periods=8, method='spearman')
+        for symbol in range(3):
+            for i, lag in enumerate([0, 1]):
+                shifted = pd.Series(x[symbol]).shift(lag).to_numpy()
+                for end in [5, 12, 19, 60, 133, 199]:
+                    wx, wy = shifted[max(0, end - 19):end + 1], self.y[symbol, max(0, end - 19):end + 1]
+                    keep = ~(np.isnan(wx) | np.isnan(wy))
+                    if keep.sum() < 8:
+                        self.assertTrue(np.isnan(result[symbol, i, end]))
+                    else:
+                        self.assertAlmostEqual(result[symbol, i, end], spearmanr(wx[keep], wy[keep])[0], places=5)
+
+    def test_sentiment_return_correlation(self):
+        dates = pd.bdate_range('2024-01-01', periods=40)
+        prices = pd.DataFrame({'Date': np.tile(dates, 2), 'stock': np.repeat(['A', 'B'], 40),
+                               'Daily_Return': np.r_[np.sin(np.arange(40)), np.cos(np.arange(40))]})
+        sentiment = prices.rename(columns={'Daily_Return': 'compound'}).iloc[::2]
+        cube = sentiment_return_correlation(sentiment, prices.set_index('Date'), lags=[0, 1], window=10,
+                                            min_periods=3)
+        self.assertEqual(cube.values.shape, (2, 2, 40))
+        self.assertEqual(list(cube.symbols), ['A', 'B'])
+        np.testing.assert_allclose(cube.frame('A')[0].dropna(), 1.0, atol=1e-6)
+        self.assertEqual(cube.latest().shape, (2, 2))
+
+if __name__ == '__main__':
+    unittest.main()
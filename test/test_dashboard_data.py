@@ -0,0 +1,61 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from scripts.dashboard_data import DashboardData, SymbolIndex, cached_load, clear_cache
+
+class TestDashboardData(unittest.TestCase):
+
+    def setUp(self):
+        clear_cache()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.price_path = os.path.join(self.tmp_dir, 'stock_data.csv')
+        self.data = pd.DataFrame({
+            'Date': pd.date_range('2024-01-01', periods=6).repeat(2).astype(str),
+            'Close': range(12),
+            'stock': ['AAPL', 'MSFT'] * 6,
+        })
+        self.data.to_csv(self.price_path, index=False)
+        self.loads = []
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def counting_loader(self, path):
+        self.loads.append(path)
+        return pd.read_csv(path)
+
+    def test_cached_load_reuses_until_file_changes(self):
+        first = cached_load(self.price_path, self.counting_loader)
+        second = cached_load(self.price_path, self.counting_loader)
+        self.assertIs(first, second)
+        self.assertEqual(len(self.loads), 1)
+
+        self.data.head(4).to_csv(self.price_path, index=False)
+        later = time.time() + 5
+        os.utime(self.price_path, (later, later))
+        third = cached_load(self.price_path, self.counting_loader)
+        self.assertEqual(len(self.loads), 2)
+        self.assertEqual(len(third), 4)
+
+    def test_symbol_index_slices(self):
+        index = SymbolIndex(self.data)
+
+        self.assertEqual(index.symbols(), ['AAPL', 'MSFT'])
+        self.assertIn('MSFT', index)
+        pd.testing.assert_frame_equal(index['MSFT'], self.data[self.data['stock'] == 'MSFT'])
+
+    def test_sentiment_is_loaded_lazily(self):
+        data = DashboardData(self.price_path, os.path.join(self.tmp_dir, 'missing.csv'))
+        prices = data.prices()
+
+        self.assertEqual(len(prices['AAPL']), 6)
+        self.assertEqual(data.price_version(), (os.stat(self.price_path).st_mtime_ns, os.path.getsize(self.price_path)))
+        self.assertEqual(prices['AAPL'].index.name, 'Date')
+        with self.assertRaises(FileNotFoundError):
+            data.sentiment()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,7 @@ import unittest
 import os
 import pandas as pd
 import zipfile
-from scripts.data_processing import extract_zip, load_csv_from_zip, load_data
+from scripts.data_processing import extract_zip, load_csv_from_zip, load_data, iter_csv_from_zip, load_members
 
 class TestDataProcessing(unittest.TestCase):
     
@@ -14,6 +14,7 @@ class TestDataProcessing(unittest.TestCase):
         cls.test_zip = 'test_data.zip'
         cls.extract_dir = 'test_extract'
         cls.csv_filename = 'test_data.csv'
+        cls.date_cache = f'{cls.test_zip}.{cls.csv_filename}.dates.npz'
         
         # Create test directory
         os.makedirs(cls.extract_dir, exist_ok=True)
@@ -34,6 +35,8 @@ class TestDataProcessing(unittest.TestCase):
             os.remove(cls.test_zip)
         if os.path.exists(cls.csv_filename):
             os.remove(cls.csv_filename)
+        if os.path.exists(cls.date_cache):
+            os.remove(cls.date_cache)
         if os.path.exists(cls.extract_dir):
             for root, dirs, files in os.walk(cls.extract_dir, topdown=False):
                 for name in files:
@@ -63,5 +66,56 @@ class TestDataProcessing(unittest.TestCase):
         self.assertEqual(df.shape, (2, 2))  # 2 rows and 2 columns
         self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['date']))
 
+    def test_load_data_streams_member(self):
+        df = load_data(self.test_zip, self.csv_filename)
+
+        self.assertEqual(list(df['value']), [100, 200])
+
+    def test_extract_zip_skips_unchanged_archive(self):
+        extract_zip(self.test_zip, self.extract_dir)
+        extracted = os.path.join(self.extract_dir, self.csv_filename)
+        with open(extracted, 'w') as f:
+            f.write("index,date,value\n1,2024-01-01,999")
+
+        extract_zip(self.test_zip, self.extract_dir)
+        self.assertEqual(load_csv_from_zip(self.extract_dir, self.csv_filename).shape, (1, 2))
+
+        extract_zip(self.test_zip, self.extract_dir, force=True)
+        self.assertEqual(load_csv_from_zip(self.extract_dir, self.csv_filename).shape, (2, 2))
+
+    def test_extract_zip_rejects_escaping_members(self):
+        for name in ['../escaped.csv', 'nested/../../escaped.csv', os.path.abspath('escaped.csv')]:
+            malicious_zip = 'malicious.zip'
+            with zipfile.ZipFile(malicious_zip, 'w') as zipf:
+                zipf.writestr('safe.csv', self.test_csv_content)
+                zipf.writestr(name, self.test_csv_content)
+            try:
+                with self.assertRaises(ValueError):
+                    extract_zip(malicious_zip, self.extract_dir)
+            finally:
+                os.remove(malicious_zip)
+            self.assertFalse(os.path.exists('escaped.csv'))
+            self.assertFalse(os.path.exists(os.path.join(self.extract_dir, 'safe.csv')))
+
+    def test_load_data_caches_parsed_dates(self):
+        first = load_data(self.test_zip, self.csv_filename)
+        self.assertTrue(os.path.exists(self.date_cache))
+        second = load_data(self.test_zip, self.csv_filename)
+
+        self.assertEqual(second.attrs['date_parse_report'], {'date': {'cache': 2}})
+        pd.testing.assert_series_equal(first['date'], second['date'])
+
+    def test_iter_csv_from_zip(self):
+        chunks = list(iter_csv_from_zip(self.test_zip, self.csv_filename, chunksize=1))
+
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(all(pd.api.types.is_datetime64_any_dtype(chunk['date']) for chunk in chunks))
+
+    def test_load_members(self):
+        frames = load_members(self.test_zip, [self.csv_filename], max_workers=2)
+
+        self.assertEqual(list(frames), [self.csv_filename])
+        self.assertEqual(frames[self.csv_filename].shape, (2, 2))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+import os
+import unittest
+import tempfile
+import pandas as pd
+from scripts.date_parsing import FALLBACK, parse_dates, load_cached_dates, save_cached_dates
+
+class TestDateParsing(unittest.TestCase):
+
+    def setUp(self):
+        self.values = pd.Series([
+            '2020-06-05 10:30:54-04:00',
+            '2020-06-04 10:45:20-04:00',
+            '2011-04-27 00:00:00',
+            '2020-06-05T10:30:54+05:30',
+            'June 5, 2020',
+            None,
+        ], index=[10, 11, 12, 13, 14, 15], name='date')
+
+    def test_matches_mixed_parsing(self):
+        parsed, _ = parse_dates(self.values)
+        expected = pd.to_datetime(self.values, format='mixed', utc=True)
+
+        pd.testing.assert_series_equal(parsed, expected)
+
+    def test_report_counts_each_path(self):
+        _, report = parse_dates(self.values)
+
+        self.assertEqual(report['9999-99-99 99:99:99-99:99'], 2)
+        self.assertEqual(report['9999-99-99 99:99:99'], 1)
+        self.assertEqual(report['9999-99-99T99:99:99+99:99'], 1)
+        self.assertEqual(report[FALLBACK], 1)
+
+    def test_coerce_invalid_values(self):
+        parsed, report = parse_dates(pd.Series(['2020-13-45 00:00:00', 'not a date']), errors='coerce')
+
+        self.assertTrue(parsed.isna().all())
+        self.assertEqual(report[FALLBACK], 2)
+        with self.assertRaises(ValueError):
+            parse_dates(pd.Series(['not a date']))
+
+    def test_cache_round_trip(self):
+        parsed, _ = parse_dates(self.values)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = os.path.join(tmp, 'dates.npz')
+            save_cached_dates(cache_path, 'v1', {'date': parsed})
+
+            cached = load_cached_dates(cache_path, 'v1', len(parsed))
+            pd.testing.assert_series_equal(cached['date'], parsed.reset_index(drop=True))
+            self.assertEqual(load_cached_dates(cache_path, 'v2', len(parsed)), {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,15 @@
 import unittest
 import pandas as pd
+from scripts import descriptive_analysis
 from scripts.descriptive_analysis import (
     headline_length_stats,
     articles_per_publisher,
     articles_by_day_of_week,
     articles_by_time,
     extract_domains,
-    identify_unique_domains
+    identify_unique_domains,
+    descriptive_report,
+    publisher_domains
 )
 
 class TestDA(unittest.TestCase):
@@ -89,5 +92,40 @@ class TestDA(unittest.TestCase):
         self.assertIn('example.com', domain_counts['domain'].values)
         self.assertIn('domain.com', domain_counts['domain'].values)
 
+    def test_descriptive_report(self):
+        data = self.data.copy()
+        data['date'] = data['date'].dt.tz_localize('UTC').dt.tz_convert('America/New_York')
+        columns = list(data.columns)
+        report = descriptive_report(data)
+
+        self.assertEqual(list(data.columns), columns)
+        pd.testing.assert_series_equal(report['headline_length'],
+                                       data['headline'].apply(len).rename('headline_length').describe())
+        # Wall-clock days in New York: Thursday 06:00, Friday 10:30, Saturday 05:00
+        self.assertEqual(report['day_of_week'][['Thursday', 'Friday', 'Saturday']].tolist(), [1, 1, 1])
+        self.assertEqual(report['day_of_week'].sum(), 3)
+        self.assertEqual(report['minute_of_day'][6 * 60], 1)
+        self.assertEqual(report['minute_of_day'][10 * 60 + 30], 1)
+        self.assertEqual(report['publishers'].to_dict(), articles_per_publisher(data).to_dict())
+        pd.testing.assert_frame_equal(report['domains'], identify_unique_domains(data))
+
+    def test_publisher_domains(self):
+        publishers = pd.Series(['a@example.com', 'Reuters', None, 7, 'b@example.com', 'a@example.com'])
+        interned = publisher_domains(publishers)
+
+        self.assertIsInstance(interned['publisher'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(interned['domain'].dtype, pd.CategoricalDtype)
+        expected = [extract_domains(publisher) for publisher in publishers]
+        self.assertEqual([None if pd.isna(domain) else domain for domain in interned['domain']], expected)
+        pd.testing.assert_frame_equal(publisher_domains(interned['publisher']), interned)
+
+        counts = identify_unique_domains(interned)
+        self.assertEqual(dict(zip(counts['domain'], counts['count'])), {'example.com': 3})
+
+    def test_domain_cache_is_bounded(self):
+        for i in range(descriptive_analysis.DOMAIN_CACHE_SIZE + 5):
+            publisher_domains(pd.Series([f'analyst{i}@firm.com', 'Reuters']))
+        self.assertEqual(len(descriptive_analysis._DOMAIN_CACHE), descriptive_analysis.DOMAIN_CACHE_SIZE)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
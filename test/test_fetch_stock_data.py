@@ -0,0 +1,112 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from scripts.fetch_stock_data import fetch_historical_data, local_csv_source, missing_ranges
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw', 'yfinance_data')
+
+class TestFetchStockData(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.calls = []
+        csv_source = local_csv_source(DATA_DIR)
+
+        def recording_source(stock, start_date, end_date):
+            self.calls.append((stock, start_date, end_date))
+            return csv_source(stock, start_date, end_date)
+
+        self.source = recording_source
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_fetch_from_local_source(self):
+        df = fetch_historical_data(['AAPL', 'MSFT'], '2022-01-01', '2022-02-01', source=self.source)
+
+        self.assertEqual(list(df['stock'].unique()), ['AAPL', 'MSFT'])
+        self.assertEqual(df.index.min(), pd.Timestamp('2022-01-03'))
+        self.assertLess(df.index.max(), pd.Timestamp('2022-02-01'))
+
+    def test_cache_only_requests_missing_ranges(self):
+        fetch_historical_data(['AAPL'], '2022-01-01', '2022-02-01', source=self.source, cache_dir=self.cache_dir)
+        df = fetch_historical_data(['AAPL'], '2021-12-01', '2022-03-01', source=self.source, cache_dir=self.cache_dir)
+
+        self.assertEqual(self.calls, [('AAPL', '2022-01-01', '2022-02-01'),
+                                      ('AAPL', '2021-12-01', '2022-01-01'),
+                                      ('AAPL', '2022-02-01', '2022-03-01')])
+        expected = local_csv_source(DATA_DIR)('AAPL', '2021-12-01', '2022-03-01')
+        pd.testing.assert_frame_equal(df.drop(columns='stock'), expected)
+
+        fetch_historical_data(['AAPL'], '2022-01-10', '2022-01-20', source=self.source, cache_dir=self.cache_dir)
+        self.assertEqual(len(self.calls), 3)
+
+    def test_later_run_picks_up_new_bars(self):
+        def live_source(stock, start_date, end_date):
+            # Bars only exist up to (excluding) the current day
+            return self.source(stock, start_date, min(end_date, self.today))
+
+        self.today = '2022-01-15'
+        first = fetch_historical_data(['AAPL'], '2022-01-01', '2100-01-01', source=live_source,
+                                      cache_dir=self.cache_dir, today=self.today)
+        self.assertEqual(first.index.max(), pd.Timestamp('2022-01-14'))
+
+        self.today = '2022-02-01'
+        second = fetch_historical_data(['AAPL'], '2022-01-01', '2100-01-01', source=live_source,
+                                       cache_dir=self.cache_dir, today=self.today)
+        self.assertEqual(self.calls[-1], ('AAPL', '2022-01-15', '2022-02-01'))
+        expected = local_csv_source(DATA_DIR)('AAPL', '2022-01-01', '2022-02-01')
+        pd.testing.assert_frame_equal(second.drop(columns='stock'), expected)
+
+    def test_retries_failed_requests(self):
+        failures = []
+
+        def flaky_source(stock, start_date, end_date):
+            if not failures:
+                failures.append(stock)
+                raise ConnectionError('temporary failure')
+            return self.source(stock, start_date, end_date)
+
+        df = fetch_historical_data(['TSLA'], '2022-01-01', '2022-01-10', source=flaky_source, backoff=0)
+        self.assertEqual(failures, ['TSLA'])
+        self.assertFalse(df.empty)
+
+    def test_does_not_retry_permanent_errors(self):
+        calls = []
+
+        def bad_symbol_source(stock, start_date, end_date):
+            calls.append(stock)
+            raise ValueError(f'unknown symbol {stock}')
+
+        with self.assertRaises(ValueError):
+            fetch_historical_data(['XXXX'], '2022-01-01', '2022-01-10', source=bad_symbol_source, backoff=0)
+        with self.assertRaises(FileNotFoundError):
+            fetch_historical_data(['XXXX'], '2022-01-01', '2022-01-10', source=self.source, backoff=0)
+        self.assertEqual(calls, ['XXXX'])
+        self.assertEqual(len(self.calls), 1)
+
+    def test_concurrent_cache_writes(self):
+        fetch_historical_data(['AAPL'] * 8, '2022-01-01', '2022-02-01', source=self.source, cache_dir=self.cache_dir)
+        self.assertEqual(os.listdir(self.cache_dir), ['AAPL.pkl'])
+
+    def test_fetches_concurrently(self):
+        def slow_source(stock, start_date, end_date):
+            time.sleep(0.2)
+            return self.source(stock, start_date, end_date)
+
+        start = time.perf_counter()
+        fetch_historical_data(['AAPL', 'AMZN', 'GOOG', 'META', 'MSFT'], '2022-01-01', '2022-01-10',
+                              source=slow_source)
+        self.assertLess(time.perf_counter() - start, 0.8)
+
+    def test_missing_ranges(self):
+        self.assertEqual(missing_ranges('2022-01-01', '2022-02-01'),
+                         [(pd.Timestamp('2022-01-01'), pd.Timestamp('2022-02-01'))])
+        self.assertEqual(missing_ranges('2022-01-05', '2022-01-10',
+                                        pd.Timestamp('2022-01-01'), pd.Timestamp('2022-02-01')), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import os
+import sys
+import json
+import unittest
+import subprocess
+
+# Cold-start budget for importing the sentiment module on top of pandas/numpy.
+IMPORT_BUDGET_SECONDS = 0.5
+
+PROBE = """
+import json, sys, time
+import numpy, pandas
+start = time.perf_counter()
+import scripts.sentiment_analysis
+elapsed = time.perf_counter() - start
+heavy = [name for name in ('nltk', 'wordcloud', 'matplotlib') if name in sys.modules]
+print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))
+"""
+
+class TestImportTime(unittest.TestCase):
+
+    def test_sentiment_analysis_cold_start(self):
+        # A fresh interpreter, so nothing is already imported by other tests
+        repo_root = os.path.join(os.path.dirname(__file__), '..')
+        output = subprocess.run([sys.executable, '-c', PROBE], cwd=repo_root,
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+
+        self.assertEqual(result['heavy'], [])
+        self.assertLess(result['elapsed'], IMPORT_BUDGET_SECONDS)
+
+if __name__ == "__main__":
+    unittest.main()
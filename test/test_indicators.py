@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.indicators import INDICATOR_SPEC, IncrementalIndicators, compute_indicators
+
+class TestIndicators(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Two interleaved symbols so that any window leaking across symbols shows up
+        rng = np.random.default_rng(0)
+        dates = pd.date_range(start='2020-01-01', periods=80, freq='B')
+        frames = []
+        for stock, base in [('AAA', 10.0), ('BBB', 500.0)]:
+            close = base + np.cumsum(rng.normal(0, 1, len(dates)))
+            frames.append(pd.DataFrame({'Close': close, 'stock': stock}, index=dates))
+        cls.data = pd.concat(frames).sort_index(kind='stable')
+
+    def test_does_not_mutate_input(self):
+        columns = list(self.data.columns)
+        compute_indicators(self.data)
+        self.assertEqual(list(self.data.columns), columns)
+
+    def test_outputs_all_plotted_columns(self):
+        result = compute_indicators(self.data)
+        for column in ['SMA_20', 'EMA_20', 'RSI_14', 'MACD', 'MACD_Signal', 'MACD_Hist',
+                       'Daily_Return', 'Cumulative_Return']:
+            self.assertIn(column, result.columns)
+        self.assertTrue(result.index.equals(self.data.index))
+
+    def test_windows_restart_per_symbol(self):
+        result = compute_indicators(self.data)
+        grouped = self.data.groupby('stock')['Close']
+        expected_sma = grouped.transform(lambda s: s.rolling(20).mean())
+        np.testing.assert_allclose(result['SMA_20'], expected_sma)
+        np.testing.assert_allclose(result['Daily_Return'], grouped.pct_change())
+        for _, stock_data in result.groupby('stock'):
+            self.assertEqual(stock_data['SMA_20'].isna().sum(), 19)
+            self.assertEqual(stock_data['EMA_20'].isna().sum(), 19)
+            self.assertEqual(stock_data['RSI_14'].isna().sum(), 14)
+            self.assertEqual(stock_data['MACD'].isna().sum(), 33)
+
+    def test_rsi_bounds_and_macd_histogram(self):
+        result = compute_indicators(self.data).dropna()
+        self.assertTrue(result['RSI_14'].between(0, 100).all())
+        np.testing.assert_allclose(result['MACD_Hist'], result['MACD'] - result['MACD_Signal'])
+
+    def test_custom_spec(self):
+        spec = [{'kind': 'sma', 'source': 'Close', 'period': 5, 'outputs': ['SMA_5']}]
+        result = compute_indicators(self.data, spec=spec)
+        self.assertIn('SMA_5', result.columns)
+        self.assertNotIn('SMA_20', result.columns)
+        self.assertEqual(len(INDICATOR_SPEC), 6)
+
+    def test_incremental_matches_batch(self):
+        full = compute_indicators(self.data)
+        calculator = IncrementalIndicators()
+        # Split inside and after the warm-up periods, including single-bar appends
+        parts = [calculator.update(self.data.iloc[start:end])
+                 for start, end in [(0, 10), (10, 50), (50, 51), (51, 52), (52, 160)]]
+        result = pd.concat(parts)
+        for entry in INDICATOR_SPEC:
+            for column in entry['outputs']:
+                np.testing.assert_array_equal(result[column].to_numpy(), full[column].to_numpy())
+
+    def test_incremental_state_is_bounded(self):
+        calculator = IncrementalIndicators()
+        calculator.update(self.data)
+        self.assertEqual(calculator.counts, {'AAA': 80, 'BBB': 80})
+        self.assertEqual(len(calculator.state), 2 * calculator.window)
+
+if __name__ == "__main__":
+    unittest.main()
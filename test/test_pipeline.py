@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+import numpy as np
+import pandas as pd
+from scripts.benchmark import synthetic_ohlcv
+from scripts.pipeline import run_pipeline, downstream, main
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        raw = os.path.join(self.directory, 'raw')
+        os.makedirs(raw)
+        bars = synthetic_ohlcv(300).drop(columns='stock')
+        bars['Date'] = pd.bdate_range('2020-01-01', periods=len(bars))
+        for symbol in ['AAA', 'BBB']:
+            bars.to_csv(os.path.join(raw, f'{symbol}_historical_data.csv'), index=False)
+        self.config = {'raw_prices': raw, 'news_zip': os.path.join(self.directory, 'news.zip'),
+                       'news_file': 'news.csv', 'output_dir': os.path.join(self.directory, 'out'),
+                       'price_source': 'local'}
+        self.write_news(['Stocks rally on strong earnings', 'Shares fall after weak guidance'])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_news(self, headlines):
+        dates = pd.date_range('2020-01-01 09:00', periods=200, freq='17h').strftime('%Y-%m-%d %H:%M:%S-04:00')
+        news = pd.DataFrame({'headline': np.resize(headlines, len(dates)), 'url': 'https://example.com',
+                             'publisher': 'Publisher', 'date': dates, 'stock': np.resize(['AAA', 'BBB'], len(dates))})
+        with zipfile.ZipFile(self.config['news_zip'], 'w') as archive:
+            archive.writestr('news.csv', news.to_csv())
+
+    def test_runs_then_skips_unchanged_stages(self):
+        self.assertEqual(run_pipeline(self.config, jobs=1),
+                         {'fetch': 'ran', 'indicators': 'ran', 'news': 'ran', 'sentiment': 'ran', 'align': 'ran',
+                          'store': 'ran'})
+        daily = pd.read_csv(os.path.join(self.config['output_dir'], 'daily_sentiment.csv'))
+        self.assertEqual(list(daily.columns), ['Date', 'stock', 'neg', 'neu', 'pos', 'compound', 'articles'])
+        self.assertGreater(len(daily), 0)
+        self.assertEqual(set(run_pipeline(self.config, jobs=1).values()), {'skipped'})
+        # Outputs and caches stay in the output directory, nothing is written next to the inputs
+        self.assertEqual(sorted(os.listdir(self.directory)), ['news.zip', 'out', 'raw'])
+        self.assertEqual(len(os.listdir(self.config['raw_prices'])), 2)
+
+        # New headlines only rerun the news side; deleting an output reruns its stage
+        self.write_news(['Analysts upgrade the stock', 'Regulators open an investigation'])
+        os.remove(os.path.join(self.config['output_dir'], 'stock_data.csv'))
+        self.assertEqual(run_pipeline(self.config, jobs=2),
+                         {'fetch': 'skipped', 'indicators': 'ran', 'news': 'ran', 'sentiment': 'ran', 'align': 'ran',
+                          'store': 'ran'})
+
+    def test_stage_selection(self):
+        self.assertEqual(downstream(['indicators']), ['indicators', 'align', 'store'])
+        args = ['--raw-prices', self.config['raw_prices'], '--news-zip', self.config['news_zip'],
+                '--news-file', 'news.csv', '--output-dir', self.config['output_dir'], '--price-source', 'local',
+                '--jobs', '1']
+        self.assertEqual(main(args + ['--only', 'fetch', 'indicators']), 0)
+        self.assertFalse(os.path.exists(os.path.join(self.config['output_dir'], 'news.pkl')))
+        self.assertEqual(main(args), 0)
+        self.assertEqual(run_pipeline(self.config, start='indicators', jobs=1),
+                         {'indicators': 'skipped', 'align': 'skipped', 'store': 'skipped'})
+        self.assertEqual(run_pipeline(self.config, start='indicators', force=True, jobs=1),
+                         {'indicators': 'ran', 'align': 'ran', 'store': 'ran'})
+        self.assertEqual(run_pipeline(self.config, only=['fetch'], jobs=1), {'fetch': 'skipped'})
+
+    def test_price_source(self):
+        self.assertEqual(run_pipeline({**self.config, 'symbols': 'BBB'}, only=['fetch'], jobs=1), {'fetch': 'ran'})
+        prices = pd.read_csv(os.path.join(self.config['output_dir'], 'prices_raw.csv'))
+        self.assertEqual(prices['stock'].unique().tolist(), ['BBB'])
+        with self.assertRaises(ValueError):
+            run_pipeline({**self.config, 'price_source': 'ftp'}, only=['fetch'], jobs=1)
+
+    def test_later_day_refetches(self):
+        config = {**self.config, 'today': '2020-06-01'}
+        self.assertEqual(run_pipeline(config, only=['fetch'], jobs=1), {'fetch': 'ran'})
+        self.assertEqual(run_pipeline(config, only=['fetch'], jobs=1), {'fetch': 'skipped'})
+        prices = pd.read_csv(os.path.join(self.config['output_dir'], 'prices_raw.csv'), parse_dates=['Date'])
+        self.assertEqual(prices['Date'].max(), pd.Timestamp('2020-06-01'))
+
+        config['today'] = '2020-06-03'
+        self.assertEqual(run_pipeline(config, only=['fetch'], jobs=1), {'fetch': 'ran'})
+        prices = pd.read_csv(os.path.join(self.config['output_dir'], 'prices_raw.csv'), parse_dates=['Date'])
+        self.assertEqual(prices['Date'].max(), pd.Timestamp('2020-06-03'))
+
+if __name__ == '__main__':
+    unittest.main()
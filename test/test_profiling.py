@@ -0,0 +1,62 @@
+import os
+import json
+import tempfile
+import unittest
+import pandas as pd
+from scripts import profiling
+from scripts.descriptive_analysis import headline_length_stats
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        profiling.clear()
+
+    def tearDown(self):
+        profiling.enable(False)
+        profiling.clear()
+
+    def test_disabled_records_nothing(self):
+        profiling.enable(False)
+        data = pd.DataFrame({'headline': ['a', 'bb', 'ccc']})
+        self.assertEqual(headline_length_stats(data)['max'], 3)
+        with profiling.span('block'):
+            pass
+        self.assertEqual(profiling.events(), [])
+
+    def test_records_nested_calls(self):
+        profiling.enable(True, memory=True)
+        data = pd.DataFrame({'headline': ['a', 'bb', 'ccc']})
+        with profiling.span('outer') as outer:
+            headline_length_stats(data)
+            outer.rows = 10
+        inner, outer = profiling.events()
+        self.assertEqual((inner['name'], inner['rows'], inner['depth']),
+                         ('descriptive_analysis.headline_length_stats', 3, 1))
+        self.assertEqual((outer['name'], outer['rows'], outer['depth']), ('outer', 10, 0))
+        self.assertGreaterEqual(outer['seconds'], inner['seconds'])
+        self.assertIn('peak_alloc_mb', outer)
+        self.assertNotIn('peak_alloc_mb', inner)
+        self.assertGreater(inner['peak_rss_mb'], 0)
+
+        summary = profiling.summary()
+        self.assertEqual(summary.loc['outer', 'calls'], 1)
+        self.assertEqual(summary.loc['descriptive_analysis.headline_length_stats', 'rows'], 3)
+
+    def test_exports(self):
+        profiling.enable(True)
+        with profiling.span('block', rows=5):
+            pass
+        with tempfile.TemporaryDirectory() as directory:
+            profiling.export(os.path.join(directory, 'events.jsonl'))
+            profiling.export(os.path.join(directory, 'trace.json'))
+            with open(os.path.join(directory, 'events.jsonl')) as f:
+                lines = [json.loads(line) for line in f]
+            with open(os.path.join(directory, 'trace.json')) as f:
+                trace = json.load(f)
+        self.assertEqual([event['name'] for event in lines], ['block'])
+        event, = trace['traceEvents']
+        self.assertEqual((event['name'], event['ph'], event['args']['rows']), ('block', 'X', 5))
+        self.assertAlmostEqual(event['dur'], lines[0]['seconds'] * 1e6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,13 @@
 # tests/test_publication_analysis.py
 
 import unittest
+from unittest import mock
 import pandas as pd
+from scripts import publication_analysis
 from scripts.publication_analysis import analyze_annual_trends, analyze_quarterly_trends, plot_long_term_trends, decompose_time_series
+from scripts.publication_analysis import TrendAggregator, publication_trends, decompose_many
+import numpy as np
+import statsmodels.api as sm
 
 class TestPublicationAnalysis(unittest.TestCase):
 
@@ -40,5 +45,55 @@ class TestPublicationAnalysis(unittest.TestCase):
         except Exception as e:
             self.fail(f"plot_long_term_trends failed: {e}")
 
+    def test_chunked_trends_match_periods(self):
+        dates = pd.Series(pd.to_datetime(['1969-12-31 23:59', '2020-02-29 12:00', None, '2020-03-01 00:00',
+                                          '2021-12-31 23:59', '2024-08-05 09:00'] * 5))
+        chunks = [pd.DataFrame({'date': dates.iloc[start:start + 4]}) for start in range(0, len(dates), 4)]
+        trends = publication_trends(chunks)
+
+        for granularity, freq in [('day', 'D'), ('week', 'W'), ('month', 'M'), ('quarter', 'Q'), ('year', 'Y')]:
+            expected = dates.groupby(dates.dt.to_period(freq)).size().reset_index(name='no_of_articles')
+            expected = expected.rename(columns={'index': 'date'})
+            expected['date'] = expected['date'].dt.to_timestamp()
+            pd.testing.assert_frame_equal(trends[granularity], expected)
+
+        aggregator = TrendAggregator(['year'])
+        aggregator.update(self.data['date'])
+        pd.testing.assert_frame_equal(aggregator.trend('year'), analyze_annual_trends(self.data))
+
+    def test_decompose_many(self):
+        frames = [pd.DataFrame({'publisher': name, 'date': pd.date_range('2020-01-06', periods=periods, freq='D'),
+                                'no_of_articles': np.arange(periods) % 7 + offset})
+                  for name, periods, offset in [('a', 28, 0.0), ('b', 21, 5.0), ('short', 10, 0.0)]]
+        data = pd.concat(frames).iloc[::-1]
+        before = data.copy()
+        result = decompose_many(data, period=7, n_jobs=2)
+
+        pd.testing.assert_frame_equal(data, before)
+        self.assertEqual(result.attrs['skipped'], ['short'])
+        self.assertEqual(result['publisher'].unique().tolist(), ['b', 'a'])
+        for frame in frames[:2]:
+            expected = sm.tsa.seasonal_decompose(frame.set_index('date')['no_of_articles'], period=7)
+            part = result[result['publisher'] == frame['publisher'].iloc[0]]
+            np.testing.assert_array_equal(part['date'].to_numpy(), frame['date'].to_numpy())
+            np.testing.assert_allclose(part['seasonal'].to_numpy(), expected.seasonal.to_numpy())
+            np.testing.assert_allclose(part['trend'].to_numpy(), expected.trend.to_numpy())
+
+    def test_decomposition_cache_is_bounded(self):
+        data = pd.concat([pd.DataFrame({'publisher': f'p{i}', 'date': pd.date_range('2020-01-06', periods=21, freq='D'),
+                                        'no_of_articles': np.arange(21) % 7 + i * 10.0}) for i in range(4)])
+        with mock.patch.object(publication_analysis, 'DECOMPOSITION_CACHE_SIZE', 2):
+            publication_analysis._DECOMPOSITION_CACHE.clear()
+            result = decompose_many(data, period=7, n_jobs=1)
+            self.assertEqual(len(publication_analysis._DECOMPOSITION_CACHE), 2)
+        # Series evicted within the call are still returned
+        self.assertEqual(sorted(result['publisher'].unique()), ['p0', 'p1', 'p2', 'p3'])
+        self.assertFalse(result['seasonal'].isna().any())
+
+    def test_decompose_time_series_does_not_mutate(self):
+        data = self.data.copy()
+        decompose_time_series(data, 4)
+        self.assertIn('date', data.columns)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -2,7 +2,8 @@
 import unittest
 import pandas as pd
 from collections import Counter
-from scripts.sentiment_analysis import SentimentAnalyzer
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
+from scripts.sentiment_analysis import SentimentAnalyzer, partial_keyword_counts
 
 class TestSentimentAnalyzer(unittest.TestCase):
 
@@ -26,6 +27,31 @@ class TestSentimentAnalyzer(unittest.TestCase):
         self.assertEqual(result_df.shape[0], len(self.headlines))
         self.assertIn('compound', result_df.columns)
     
+    def test_analyze_sentiment_matches_vader(self):
+        sia = SentimentIntensityAnalyzer()
+        expected = pd.DataFrame([sia.polarity_scores(h) for h in self.headlines])
+        result_df = SentimentAnalyzer.analyze_sentiment(self.headlines, chunksize=2)
+        pd.testing.assert_frame_equal(result_df[expected.columns], expected)
+
+    def test_analyze_sentiment_in_process_pool(self):
+        serial = SentimentAnalyzer.analyze_sentiment(self.headlines)
+        parallel = SentimentAnalyzer.analyze_sentiment(self.headlines, n_jobs=2, chunksize=1)
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_partial_keyword_counts_reads_chunks_lazily(self):
+        read = []
+
+        def chunks():
+            for number in range(20):
+                read.append(number)
+                yield pd.Series([f"chunk {number} headline"])
+
+        counts = partial_keyword_counts(chunks(), n_jobs=2)
+        self.assertEqual(next(counts), Counter({'chunk': 1, 'headline': 1}))
+        # At most 2 * n_jobs chunks are submitted ahead of the one being consumed
+        self.assertLessEqual(len(read), 5)
+        self.assertEqual(len(list(counts)), 19)
+
     def test_categorize_sentiment(self):
         self.assertEqual(SentimentAnalyzer.categorize_sentiment(0.1), 'Positive')
         self.assertEqual(SentimentAnalyzer.categorize_sentiment(-0.1), 'Negative')
@@ -36,6 +62,19 @@ class TestSentimentAnalyzer(unittest.TestCase):
         self.assertGreater(len(common_keywords), 0)
         self.assertTrue(all(isinstance(word, str) and isinstance(freq, int) for word, freq in common_keywords))
     
+    def test_get_common_keywords_matches_preprocess_text(self):
+        headlines = pd.Series([
+            "Apple CANNOT stop: shares gonna rally 5% today!",
+            "Why investors wanna buy Tesla's EV stock",
+            "Apple's rally, again",
+            float('nan'),
+        ])
+        cleaned = headlines.dropna().apply(SentimentAnalyzer.preprocess_text)
+        expected = Counter(' '.join(cleaned).split()).most_common(10)
+
+        self.assertEqual(SentimentAnalyzer.get_common_keywords(headlines, top_n=10, chunksize=2), expected)
+        self.assertEqual(SentimentAnalyzer.get_common_keywords(headlines, top_n=10, chunksize=2, n_jobs=2), expected)
+
     def test_plot_wordcloud(self):
         word_freq = Counter({'test': 3, 'sentence': 2, 'word': 1})
         try:
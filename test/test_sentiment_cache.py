@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.sentiment_cache import SentimentCache, normalize_headline
+from scripts.sentiment_analysis import SentimentAnalyzer, lexicon_version
+
+class TestSentimentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'scores.sqlite')
+        self.headlines = pd.Series([
+            "Stocks rally as earnings beat expectations",
+            "Stocks  rally as earnings beat expectations ",
+            "Company faces lawsuit over data breach",
+            "Stocks rally as earnings beat expectations",
+        ])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_normalize_headline(self):
+        self.assertEqual(normalize_headline("  Big  GAINS today!\t"), "Big GAINS today!")
+
+    def test_lookup_and_store(self):
+        cache = SentimentCache(self.path, 'v1')
+        keys = cache.keys(['a', 'b'])
+        cache.store(keys[:1], np.array([[0.1, 0.2, 0.7, 0.5]]))
+
+        scores, found = cache.lookup(keys)
+        np.testing.assert_array_equal(found, [True, False])
+        np.testing.assert_allclose(scores[0], [0.1, 0.2, 0.7, 0.5])
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+        other_version = SentimentCache(self.path, 'v2')
+        self.assertFalse(other_version.lookup(other_version.keys(['a']))[1].any())
+
+    def test_analyze_sentiment_with_cache(self):
+        expected = SentimentAnalyzer.analyze_sentiment(self.headlines)
+
+        first = SentimentCache(self.path, lexicon_version())
+        pd.testing.assert_frame_equal(SentimentAnalyzer.analyze_sentiment(self.headlines, cache=first), expected)
+        # The duplicates collapse to two distinct headlines, both scored on the first run
+        self.assertEqual(first.stats()['misses'], 2)
+        first.close()
+
+        second = SentimentCache(self.path, lexicon_version())
+        pd.testing.assert_frame_equal(SentimentAnalyzer.analyze_sentiment(self.headlines, cache=second), expected)
+        self.assertEqual(second.hit_rate, 1.0)
+        second.close()
+
+    def test_cache_is_per_backend(self):
+        cache = SentimentCache(self.path, 'v1')
+        SentimentAnalyzer.analyze_sentiment(self.headlines, cache=cache, backend='table')
+        SentimentAnalyzer.analyze_sentiment(self.headlines, cache=cache, backend='vader')
+        self.assertEqual(cache.stats()['misses'], 4)
+        SentimentAnalyzer.analyze_sentiment(self.headlines, cache=cache, backend='table')
+        self.assertEqual(cache.stats()['hits'], 2)
+        cache.close()
+
+if __name__ == "__main__":
+    unittest.main()
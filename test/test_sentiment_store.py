@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+import importlib.util
+import numpy as np
+import pandas as pd
+from scripts.alignment import daily_sentiment
+from scripts.dashboard_data import DashboardData, clear_cache
+from scripts.sentiment_analysis import SentimentAnalyzer
+from scripts.sentiment_store import daily_aggregates, update_store, build_store, load_symbol
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is required for the sentiment store')
+class TestSentimentStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store_dir = tempfile.mkdtemp()
+        self.full_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        rows = 400
+        self.news = pd.DataFrame({
+            'date': pd.Timestamp('2024-01-01', tz='UTC') + pd.to_timedelta(rng.integers(0, 60 * 86_400, rows), unit='s'),
+            'stock': rng.choice(['A', 'B', 'C'], rows),
+            'neg': rng.random(rows), 'neu': rng.random(rows), 'pos': rng.random(rows),
+            'compound': rng.choice([-0.5, -0.05, 0.0, 0.04, 0.05, 0.5], rows),
+        })
+        dates = pd.bdate_range('2024-01-01', '2024-03-31')
+        self.prices = pd.DataFrame({'Date': np.tile(dates, 3), 'stock': np.repeat(['A', 'B', 'C'], len(dates))})
+
+    def tearDown(self):
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+        shutil.rmtree(self.full_dir, ignore_errors=True)
+        clear_cache()
+
+    def test_aggregates_match_sessions_and_categories(self):
+        daily = daily_aggregates(self.news, self.prices)
+        expected = daily_sentiment(self.news, self.prices)
+        np.testing.assert_array_equal(daily['articles'], expected['articles'])
+        np.testing.assert_allclose(daily[['neg', 'neu', 'pos', 'compound']], expected[['neg', 'neu', 'pos', 'compound']])
+
+        calendar = daily_aggregates(self.news)
+        self.assertEqual(calendar['articles'].sum(), len(self.news))
+        labels = self.news['compound'].apply(SentimentAnalyzer.categorize_sentiment)
+        self.assertEqual(calendar[['Positive', 'Neutral', 'Negative']].sum().to_dict(), labels.value_counts().to_dict())
+
+    def test_incremental_updates_equal_a_full_build(self):
+        first, second = self.news.iloc[:250], self.news.iloc[250:]
+        update_store(self.store_dir, daily_aggregates(first))
+        self.assertEqual(update_store(self.store_dir, daily_aggregates(second[second['stock'] != 'C'])), ['A', 'B'])
+        update_store(self.store_dir, daily_aggregates(second[second['stock'] == 'C']))
+
+        build_store(self.full_dir, daily_aggregates(self.news.iloc[:100]))
+        build_store(self.full_dir, daily_aggregates(self.news))
+        # Rebuilding swaps the store in place and leaves no temporary or old copy behind
+        prefix = os.path.basename(self.full_dir) + '.'
+        self.assertEqual([name for name in os.listdir(os.path.dirname(self.full_dir)) if name.startswith(prefix)], [])
+        for symbol in ['A', 'B', 'C']:
+            pd.testing.assert_frame_equal(load_symbol(self.store_dir, symbol), load_symbol(self.full_dir, symbol))
+        window = load_symbol(self.store_dir, 'A', start='2024-01-10', end='2024-01-19')
+        local_days = self.news['date'].dt.tz_convert('America/New_York').dt.strftime('%Y-%m-%d')
+        in_window = (self.news['stock'] == 'A') & local_days.between('2024-01-10', '2024-01-19')
+        self.assertEqual(window['articles'].sum(), in_window.sum())
+        self.assertEqual(len(load_symbol(self.store_dir, 'Z')), 0)
+
+    def test_plot_sentiment_reads_one_symbol(self):
+        build_store(self.store_dir, daily_aggregates(self.news, self.prices))
+        data = DashboardData(os.path.join(self.store_dir, 'prices.csv'), self.store_dir)
+        daily = data.sentiment('B')
+        self.assertIs(data.sentiment('B'), daily)
+        self.assertEqual(daily['articles'].sum(), (self.news['stock'] == 'B').sum())
+
+        fig = SentimentAnalyzer.plot_sentiment(daily, 'B')
+        self.assertEqual(len(fig.axes), 2)
+        self.assertEqual(len(SentimentAnalyzer.plot_sentiment(self.store_dir, 'Z').axes), 2)
+
+if __name__ == '__main__':
+    unittest.main()
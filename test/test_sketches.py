@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+import numpy as np
+import pandas as pd
+from scripts.sketches import CountMinSketch, StreamingTopK, merge_all
+from scripts.sentiment_analysis import SentimentAnalyzer
+from scripts.descriptive_analysis import articles_per_publisher
+
+class TestSketches(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        vocabulary = np.array([f'word{i}' for i in range(5000)], dtype=object)
+        weights = 1 / np.arange(1, len(vocabulary) + 1) ** 1.2
+        self.stream = vocabulary[rng.choice(len(vocabulary), 100_000, p=weights / weights.sum())]
+        self.exact = Counter(self.stream.tolist())
+
+    def test_count_min_never_undercounts(self):
+        sketch = CountMinSketch(epsilon=1e-3, delta=1e-3)
+        sketch.update(list(self.exact), list(self.exact.values()))
+        items = list(self.exact)
+        estimates = sketch.estimate(items)
+        truth = np.array([self.exact[item] for item in items])
+        self.assertTrue((estimates >= truth).all())
+        self.assertLessEqual((estimates - truth).max(), sketch.epsilon * sketch.total)
+
+    def test_top_matches_exact_counts(self):
+        topk = StreamingTopK(capacity=200)
+        for start in range(0, len(self.stream), 10_000):
+            topk.update(self.stream[start:start + 10_000])
+        top = topk.top(20)
+        # Near-ties at the cut-off may swap, but the clear heavy hitters are all found
+        self.assertLessEqual({item for item, _ in self.exact.most_common(15)}, {item for item, _ in top})
+        for item, estimate in top:
+            self.assertGreaterEqual(estimate, self.exact[item])
+            self.assertLessEqual(estimate - self.exact[item], topk.error_bound())
+
+    def test_merge_equals_single_pass(self):
+        whole = StreamingTopK(capacity=100)
+        whole.update(self.stream)
+        parts = []
+        for shard in np.array_split(self.stream, 4):
+            part = StreamingTopK(capacity=100)
+            part.update(shard)
+            parts.append(part)
+        merged = merge_all(parts)
+        np.testing.assert_array_equal(merged.sketch.table, whole.sketch.table)
+        self.assertEqual([count for _, count in merged.top(20)], [count for _, count in whole.top(20)])
+        with self.assertRaises(ValueError):
+            merged.merge(StreamingTopK(capacity=100, epsilon=1e-2))
+        with self.assertRaises(ValueError):
+            merge_all([])
+
+    def test_serialization_round_trip(self):
+        topk = StreamingTopK(capacity=50)
+        topk.update(self.stream[:20_000])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'keywords.sketch')
+            topk.save(path)
+            restored = StreamingTopK.load(path)
+        self.assertEqual(restored.top(), topk.top())
+        restored.update(self.stream[20_000:])
+        topk.update(self.stream[20_000:])
+        self.assertEqual(restored.top(10), topk.top(10))
+
+    def test_approximate_keywords_and_publishers(self):
+        headlines = pd.Series(["Stocks rally on strong earnings", "Earnings beat lifts stocks",
+                               "Stocks slip as earnings miss"] * 50)
+        exact = SentimentAnalyzer.get_common_keywords(headlines, top_n=3)
+        approximate = SentimentAnalyzer.get_common_keywords(headlines, top_n=3, chunksize=40, approximate=True)
+        self.assertEqual(approximate, exact)
+
+        data = pd.DataFrame({'publisher': ['Benzinga', 'Reuters', 'Benzinga', None, 'Zacks', 'Benzinga']})
+        pd.testing.assert_series_equal(articles_per_publisher(data, approximate=True),
+                                       articles_per_publisher(data))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+from scripts import stock_analysis
+from scripts.stock_analysis import load_data, minmax_indices, chart_png, plot_macd
+from scripts.indicators import compute_indicators
+
+class TestStockAnalysis(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame({'Date': pd.bdate_range('2000-01-03', periods=6000), 'stock': 'AAPL',
+                             'Close': 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 6000)))})
+        cls.data = compute_indicators(data).set_index('Date')
+
+    def test_load_data_filters_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'prices.csv')
+            two = pd.concat([self.data.iloc[:10], self.data.iloc[:10].assign(stock='MSFT')])
+            two.to_csv(path)
+            df = load_data(path, columns=['Close'], symbols=['MSFT'], start='2000-01-04', end='2000-01-06')
+            self.assertEqual(list(df.columns), ['stock', 'Close'])
+            self.assertEqual(list(df['stock'].unique()), ['MSFT'])
+            self.assertEqual(list(df.index), list(pd.bdate_range('2000-01-04', '2000-01-06')))
+
+            two.drop(columns='stock').to_csv(path)
+            self.assertEqual(len(load_data(path, start='2000-01-10')), 10)
+            with self.assertRaises(ValueError):
+                load_data(path, symbols=['MSFT'])
+
+    def test_minmax_indices(self):
+        values = self.data['MACD_Hist'].to_numpy()
+        keep = minmax_indices(values, 500)
+        self.assertLessEqual(len(keep), 500)
+        self.assertTrue((np.diff(keep) > 0).all())
+        self.assertEqual((keep[0], keep[-1]), (0, len(values) - 1))
+        self.assertEqual(np.nanmax(values[keep]), np.nanmax(values))
+        self.assertEqual(np.nanmin(values[keep]), np.nanmin(values))
+        np.testing.assert_array_equal(minmax_indices(values[:100], 500), np.arange(100))
+
+    def test_macd_histogram_is_one_collection(self):
+        fig = plot_macd('AAPL', self.data)
+        ax = fig.axes[0]
+        self.assertEqual(len(ax.patches), 0)
+        self.assertEqual(len(ax.collections), 1)
+        self.assertLessEqual(max(len(line.get_xdata()) for line in ax.lines[:2]), stock_analysis.MAX_POINTS)
+
+    def test_chart_cache(self):
+        stock_analysis._FIGURE_CACHE.clear()
+        image = chart_png('AAPL', 'RSI', self.data)
+        self.assertTrue(image.startswith(b'\x89PNG'))
+        self.assertIs(chart_png('AAPL', 'RSI', self.data), image)
+
+        changed = self.data.copy()
+        changed.iloc[-1, changed.columns.get_loc('RSI_14')] = 50.0
+        self.assertIsNot(chart_png('AAPL', 'RSI', changed), image)
+        self.assertEqual(len(stock_analysis._FIGURE_CACHE), 2)
+
+        # A caller-supplied version is the whole key: a hit does not look at the rows
+        versioned = chart_png('AAPL', 'RSI', self.data, version=(1, 2))
+        self.assertIs(chart_png('AAPL', 'RSI', None, version=(1, 2)), versioned)
+        mixed = pd.concat([self.data, self.data.assign(stock='MSFT')])
+        self.assertEqual(chart_png('AAPL', 'RSI', mixed, version=(1, 3)), versioned)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.sentiment_analysis import SentimentAnalyzer, get_analyzer, score_headlines, score_headlines_table
+from scripts.vader_table import strip_punctuation
+
+# Words that trigger VADER's rules: negations, boosters, 'least', 'but', 'never so',
+# 'kind of', idioms and punctuation emphasis.
+RULE_WORDS = ['not', "isn't", 'never', 'so', 'this', 'least', 'at', 'very', 'but', 'BUT', 'kind', 'of', 'sort',
+              'the', 'shit', 'bomb', 'bad', 'ass', 'yeah', 'right', 'cut', 'mustard', 'kiss', 'death', 'hand', 'to',
+              'mouth', 'just', 'enough', 'extremely', 'EXTREMELY', 'barely', 'kinda', 'without', 'GREAT', 'Never']
+MARKET_WORDS = ['stock', 'shares', 'earnings', 'upgrade', 'downgrade', 'reports', 'Q1', 'price', 'target', 'Apple']
+
+def sample_corpus(rows: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(0, 18, rows)
+    total = int(lengths.sum())
+    pools = [np.array(list(get_analyzer().lexicon), dtype=object), np.array(RULE_WORDS, dtype=object),
+             np.array(MARKET_WORDS, dtype=object)]
+    pool = rng.choice(3, total, p=[0.35, 0.35, 0.3])
+    words = np.empty(total, dtype=object)
+    for number, choices in enumerate(pools):
+        words[pool == number] = rng.choice(choices, int((pool == number).sum()))
+    style = rng.random(total)
+    upper = style < 0.06
+    words[upper] = [word.upper() for word in words[upper]]
+    after = (style >= 0.06) & (style < 0.12)
+    words[after] += rng.choice(np.array(['.', ',', '!', '?', '!!', '?!?', "'", ':', '$', '.,'], dtype=object),
+                               int(after.sum()))
+    before = (style >= 0.12) & (style < 0.16)
+    words[before] = rng.choice(np.array(['"', '(', '-', '...'], dtype=object), int(before.sum())) + words[before]
+    ends = np.cumsum(lengths)
+    return [' '.join(words[end - length:end]) for end, length in zip(ends, lengths)]
+
+class TestVaderTable(unittest.TestCase):
+
+    def test_strip_punctuation(self):
+        punctuation = frozenset(get_analyzer().constants.PUNC_LIST)
+        self.assertEqual(strip_punctuation('great!!', punctuation), 'great')
+        self.assertEqual(strip_punctuation('"great', punctuation), 'great')
+        self.assertEqual(strip_punctuation('great.,', punctuation), 'great.,')
+        self.assertEqual(strip_punctuation('$AAPL', punctuation), '$AAPL')
+        self.assertEqual(strip_punctuation('a!', punctuation), 'a!')
+
+    def test_matches_vader(self):
+        texts = sample_corpus(3000) + ['', '!', 'The stock is kind of bad', 'Not the bomb BUT GREAT!!!??',
+                                       'at least not bad', 'never so good', 'good good good']
+        expected = score_headlines(texts)
+        result = score_headlines_table(texts)
+        difference = np.abs(result - expected)
+        # Only the last rounded digit may differ (np.round vs round on halfway cases)
+        self.assertLessEqual(difference.max(), 1e-3 + 1e-9)
+        self.assertGreater((difference.max(axis=1) == 0).mean(), 0.99)
+
+    def test_analyze_sentiment_backend(self):
+        headlines = pd.Series(["The market is up today!", "Economic downturn expected next quarter.",
+                               "The market is up today!"], index=[5, 6, 7])
+        vader = SentimentAnalyzer.analyze_sentiment(headlines)
+        table = SentimentAnalyzer.analyze_sentiment(headlines, backend='table')
+        pd.testing.assert_frame_equal(vader, table)
+        with self.assertRaises(ValueError):
+            SentimentAnalyzer.analyze_sentiment(headlines, backend='textblob')
+
+if __name__ == '__main__':
+    unittest.main()